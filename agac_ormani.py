@@ -0,0 +1,265 @@
+"""
+Duzlestirilmis Agac Ormani
+Egitilmis RandomForestRegressor'in tum agaclari bitisik numpy dizilerine
+aktarilir (dugum basina ozellik, esik, sol, sag, deger, eksik deger yonu) ve tahmin, sklearn'un
+joblib/DataFrame dogrulama yukune girmeden numpy ile yapilir. Sonuclar
+sklearn ile aynidir: girdi float32'ye cevrilir, agac tahminleri agac
+sirasinda toplanip agac sayisina bolunur (sklearn'un tek thread'li sirasi).
+
+Tek satir ve kucuk toplularda sklearn'den cok daha hizlidir; binlerce satirda
+sklearn'un Cython gezintisi one gecer (bkz. ml_model.KUCUK_TOPLU).
+
+Diziler .npy olarak kaydedilip mmap ile acilabilir; ayni makinedeki
+process'ler tek kopyayi paylasir (sklearn agaclari yuklerken dugumleri kopyalar).
+
+Tahmin araliklari (aralik) ayni gezintiden cikar:
+    - agac:   agac tahminlerinin nicelikleri (her zaman kullanilabilir)
+    - yaprak: quantile regression forest (Meinshausen 2006); egitim satirlarinin
+              hangi yapraga dustugu egitimde bir kez hesaplanip saklanir
+              (yaprak_dagilimi_ekle), tahminde satirin yapraklarindaki egitim
+              fiyatlarinin agirlikli nicelikleri alinir
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+# Kayitli orman bicimi degisirse artirilir
+ORMAN_SURUMU = 1
+
+# Kayitli dizinin dosyalari
+ORMAN_DIZILERI = ('ozellik', 'esik', 'sol', 'sag', 'deger', 'nan_sola', 'kokler')
+
+# Istege bagli yaprak dagilimi dizileri (yoksa araliklar agac tahminlerinden)
+YAPRAK_DIZILERI = ('yaprak_bas', 'yaprak_sira', 'hedef')
+
+# Tek seferde gezilen satir sayisi (ara diziler agac x blok boyutunda)
+ORMAN_BLOK = 4096
+
+# Yaprak nicelikleri icin satir x egitim satiri agirlik tablosunun eleman siniri
+NICELIK_BLOK = 1 << 20
+
+
+class DuzOrman:
+    """
+    Tum agaclarin dugumleri tek dizide; agac t'nin koku kokler[t]
+    Yapraklarin cocuklari kendilerini gosterir, boylece her agac en fazla
+    derinlik adimda (fazla adimlar yaprakta kalir) toplu olarak gezilir.
+    """
+    
+    def __init__(self, diziler):
+        self._diziler = diziler
+        self.ozellik = diziler['ozellik']
+        self.esik = diziler['esik']
+        self.sol = diziler['sol']
+        self.sag = diziler['sag']
+        self.deger = diziler['deger']
+        self.nan_sola = diziler['nan_sola']
+        self.kokler = diziler['kokler']
+        self.derinlik = self._derinlik_bul()
+        
+        # Dugum d'nin egitim satirlari: hedef[yaprak_sira[yaprak_bas[d]:yaprak_bas[d + 1]]]
+        # (hedef: sirali egitim hedefleri, yaprak_sira: hedef icindeki sira)
+        self.yaprak_bas = diziler.get('yaprak_bas')
+        self.yaprak_sira = diziler.get('yaprak_sira')
+        self.hedef = diziler.get('hedef')
+    
+    @classmethod
+    def rf_den(cls, model):
+        """Egitilmis RandomForestRegressor'dan (tek cikti) duz orman"""
+        parcalar = {ad: [] for ad in ('ozellik', 'esik', 'sol', 'sag', 'deger', 'nan_sola')}
+        kokler = []
+        ofset = 0
+        for agac in (e.tree_ for e in model.estimators_):
+            if agac.n_outputs != 1:
+                raise ValueError("Duz orman tek ciktili regresyon agaclarini destekler")
+            
+            n = agac.node_count
+            dugumler = np.arange(n)
+            yaprak = agac.children_left < 0
+            parcalar['ozellik'].append(np.where(yaprak, 0, agac.feature))
+            parcalar['esik'].append(np.asarray(agac.threshold, dtype=np.float64))
+            parcalar['sol'].append(np.where(yaprak, dugumler, agac.children_left) + ofset)
+            parcalar['sag'].append(np.where(yaprak, dugumler, agac.children_right) + ofset)
+            parcalar['deger'].append(np.asarray(agac.value, dtype=np.float64).reshape(n))
+            # NaN girdinin gittigi cocuk (eski sklearn'de eksik deger destegi yok: saga)
+            parcalar['nan_sola'].append(np.asarray(getattr(agac, 'missing_go_to_left', np.zeros(n)), dtype=bool))
+            kokler.append(ofset)
+            ofset += n
+        
+        diziler = {
+            'ozellik': np.concatenate(parcalar['ozellik']).astype(np.int32),
+            'esik': np.concatenate(parcalar['esik']),
+            'sol': np.concatenate(parcalar['sol']).astype(np.int32),
+            'sag': np.concatenate(parcalar['sag']).astype(np.int32),
+            'deger': np.concatenate(parcalar['deger']),
+            'nan_sola': np.concatenate(parcalar['nan_sola']),
+            'kokler': np.array(kokler, dtype=np.int32)
+        }
+        return cls(diziler)
+    
+    def _derinlik_bul(self):
+        """En derin yaprak icin gereken adim sayisi"""
+        dugum = np.asarray(self.kokler).copy()
+        adim = 0
+        while True:
+            sonraki = np.maximum(self.sol[dugum], self.sag[dugum])
+            if np.array_equal(sonraki, dugum):
+                return adim
+            # Ic dugumler iki cocuga da ayrilir; en derini bulmak icin hepsini izle
+            dugum = np.unique(np.concatenate([self.sol[dugum], self.sag[dugum]]))
+            adim += 1
+    
+    def __len__(self):
+        return len(self.kokler)
+    
+    def dugum_sayisi(self):
+        return len(self.sol)
+    
+    @property
+    def aralik_yontemi(self):
+        """Varsayilan aralik yontemi: yaprak dagilimi varsa 'yaprak', yoksa 'agac'"""
+        return 'agac' if self.hedef is None else 'yaprak'
+    
+    def yaprak_dagilimi_ekle(self, X, y):
+        """
+        Egitim satirlarinin yapraklarini kaydet (quantile forest araliklari icin)
+        Meinshausen'deki gibi her agacta tum egitim satirlari kullanilir (bootstrap degil).
+        """
+        y = np.asarray(y, dtype=np.float64)
+        sira = np.empty(len(y), dtype=np.int32)
+        sira[np.argsort(y, kind='stable')] = np.arange(len(y))
+        
+        yapraklar = self.yapraklar(X).ravel()
+        duzen = np.argsort(yapraklar, kind='stable')
+        self._diziler.update(
+            yaprak_bas=np.concatenate([[0], np.cumsum(np.bincount(yapraklar, minlength=self.dugum_sayisi()))]),
+            yaprak_sira=np.tile(sira, len(self))[duzen],
+            hedef=np.sort(y)
+        )
+        self.yaprak_bas = self._diziler['yaprak_bas']
+        self.yaprak_sira = self._diziler['yaprak_sira']
+        self.hedef = self._diziler['hedef']
+    
+    def yapraklar(self, X):
+        """(agac, N) her satirin her agactaki yapragi (dugum indeksi)"""
+        X = np.asarray(X, dtype=np.float32)
+        satir = np.arange(len(X))
+        eksik = np.isnan(X).any()
+        
+        # Tum agaclar ve satirlar birlikte, seviye seviye iner
+        dugum = np.repeat(np.asarray(self.kokler)[:, None], len(X), axis=1)
+        for _ in range(self.derinlik):
+            x = X[satir, self.ozellik[dugum]]
+            sola = x <= self.esik[dugum]
+            if eksik:
+                sola |= np.isnan(x) & self.nan_sola[dugum]
+            dugum = np.where(sola, self.sol[dugum], self.sag[dugum])
+        return dugum
+    
+    def agac_tahminleri(self, X):
+        """(agac, N) her agacin tahmini"""
+        return self.deger[self.yapraklar(X)]
+    
+    @staticmethod
+    def _ortalama(agaclar):
+        """Agac tahminlerinin ortalamasi (sklearn ile ayni toplama sirasi)"""
+        toplam = np.zeros(agaclar.shape[1])
+        for t in range(len(agaclar)):
+            toplam += agaclar[t]
+        toplam /= len(agaclar)
+        return toplam
+    
+    def tahmin(self, X):
+        """(N,) orman tahmini (sklearn ile ayni toplama sirasi)"""
+        X = np.asarray(X, dtype=np.float32)
+        sonuc = np.empty(len(X))
+        for bas in range(0, len(X), ORMAN_BLOK):
+            sonuc[bas:bas + ORMAN_BLOK] = self._ortalama(self.agac_tahminleri(X[bas:bas + ORMAN_BLOK]))
+        return sonuc
+    
+    def aralik(self, X, nicelikler=(0.1, 0.9), yontem=None):
+        """
+        Tek gezintide (tahmin, (nicelik, N) aralik sinirlari)
+        Tahmin tahmin() ile aynidir; yontem verilmezse aralik_yontemi.
+        """
+        yontem = yontem or self.aralik_yontemi
+        if yontem not in ('agac', 'yaprak'):
+            raise ValueError(f"Bilinmeyen aralik yontemi: {yontem}")
+        if yontem == 'yaprak' and self.hedef is None:
+            raise ValueError("Ormanda yaprak dagilimi yok (yaprak_dagilimi_ekle)")
+        
+        X = np.asarray(X, dtype=np.float32)
+        sonuc = np.empty(len(X))
+        sinirlar = np.empty((len(nicelikler), len(X)))
+        for bas in range(0, len(X), ORMAN_BLOK):
+            yapraklar = self.yapraklar(X[bas:bas + ORMAN_BLOK])
+            agaclar = self.deger[yapraklar]
+            sonuc[bas:bas + ORMAN_BLOK] = self._ortalama(agaclar)
+            if yontem == 'agac':
+                sinirlar[:, bas:bas + ORMAN_BLOK] = np.quantile(agaclar, nicelikler, axis=0)
+            else:
+                sinirlar[:, bas:bas + ORMAN_BLOK] = self._yaprak_nicelikleri(yapraklar, nicelikler)
+        return sonuc, sinirlar
+    
+    def _yaprak_nicelikleri(self, yapraklar, nicelikler):
+        """
+        Quantile forest nicelikleri: agac t'de yapragi l olan satir icin l'nin her egitim
+        satiri 1 / (agac * |l|) agirlik alir; nicelik q, agirlikli dagilim fonksiyonunun
+        q'ya ulastigi en kucuk egitim hedefi. Agirliklar hedef sirasina gore toplanir
+        (siralama yok), satirlar tablo NICELIK_BLOK'u asmayacak parcalarla islenir.
+        """
+        T, N = yapraklar.shape
+        m = len(self.hedef)
+        sinirlar = np.empty((len(nicelikler), N))
+        parca = max(1, NICELIK_BLOK // m)
+        for bas in range(0, N, parca):
+            yaprak = yapraklar[:, bas:bas + parca]
+            n = yaprak.shape[1]
+            adet = (self.yaprak_bas[yaprak + 1] - self.yaprak_bas[yaprak]).ravel()
+            
+            # (agac, satir) ciftlerinin egitim satirlari uc uca: yaprak_sira indeksleri
+            baslar = np.repeat(self.yaprak_bas[yaprak].ravel() - np.cumsum(adet) + adet, adet)
+            sira = self.yaprak_sira[baslar + np.arange(len(baslar))]
+            satir = np.repeat(np.tile(np.arange(n), T), adet)
+            agirlik = np.repeat(1.0 / np.maximum(adet, 1), adet)
+            
+            dagilim = np.bincount(satir * m + sira, weights=agirlik, minlength=n * m).reshape(n, m).cumsum(axis=1)
+            dagilim /= dagilim[:, -1:]
+            for i, q in enumerate(nicelikler):
+                # Toplama sirasindan gelen yuvarlama q'yu kacirmasin
+                k = np.count_nonzero(dagilim < q - 1e-9, axis=1)
+                sinirlar[i, bas:bas + n] = self.hedef[np.minimum(k, m - 1)]
+        return sinirlar
+    
+    def kaydet(self, dizin):
+        """Dizileri .npy olarak atomik yaz"""
+        ust = os.path.dirname(os.path.abspath(dizin))
+        os.makedirs(ust, exist_ok=True)
+        gecici = tempfile.mkdtemp(dir=ust, prefix='.yaziliyor-')
+        try:
+            for ad in ORMAN_DIZILERI + tuple(ad for ad in YAPRAK_DIZILERI if ad in self._diziler):
+                np.save(os.path.join(gecici, ad + '.npy'), np.asarray(self._diziler[ad]))
+            try:
+                os.replace(gecici, dizin)
+            except OSError:
+                # Baska bir process ayni ormani once yazdi
+                shutil.rmtree(gecici, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(gecici, ignore_errors=True)
+            raise
+    
+    @staticmethod
+    def kayitli_mi(dizin):
+        """Dizinde tam bir kayitli orman var mi?"""
+        return all(os.path.isfile(os.path.join(dizin, ad + '.npy')) for ad in ORMAN_DIZILERI)
+    
+    @classmethod
+    def ac(cls, dizin, mmap=True):
+        """Kayitli ormani ac (mmap ile: process'ler arasinda tek kopya); yaprak dagilimi varsa o da"""
+        adlar = ORMAN_DIZILERI + tuple(ad for ad in YAPRAK_DIZILERI
+                                       if os.path.isfile(os.path.join(dizin, ad + '.npy')))
+        return cls({ad: np.load(os.path.join(dizin, ad + '.npy'), mmap_mode='r' if mmap else None)
+                    for ad in adlar})
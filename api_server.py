@@ -3,14 +3,28 @@ Emlak Fiyat Tahmini API
 FastAPI ile RESTful API servisi
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Header
+from fastapi.responses import JSONResponse, PlainTextResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
+import os
+import hmac
+import shutil
+import time
+import threading
+import numpy as np
 import pandas as pd
 import uvicorn
-from fuzzy_model import EmlakFuzzyModel
-from ml_model import EmlakMLModel
+from veri_isleme import GIRISLER
+from model_paketi import ModelPaketi, fuzzy_yukle, ml_yukle, paket_yukle, paket_karsilastir
+from ml_model import ARALIK_NICELIKLERI
+from istatistik_taslagi import GRUPLAMALAR
+from tahmin_havuzu import TahminHavuzu, HavuzDolu
+from tahmin_onbellegi import TahminOnbellegi
+from is_kuyrugu import IsKuyrugu, IS_DIZINI, ISCI_SAYISI as IS_ISCI_SAYISI
+from metrikler import KAYIT, Sayac, Histogram, IstekMetrikMiddleware, endpoint_olc
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -30,10 +44,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global model instancelari
-fuzzy_model = None
-ml_model = None
-df = None
+# Metrikler (/metrics, Prometheus metin formati)
+ISTEK_SURESI = Histogram('emlak_istek_suresi_saniye', 'Istegin middleware icindeki toplam suresi', ['yol'])
+ISTEK_SAYISI = Sayac('emlak_istek_toplam', 'Istek sayisi', ['yol', 'durum'])
+ASAMA_SURESI = Histogram('emlak_asama_suresi_saniye',
+                         'Asama sureleri (dogrulama, fuzzy, ml, benzer, serilestirme, toplu_*)', ['asama'])
+YENIDEN_YUKLEME = Sayac('emlak_yeniden_yukleme_toplam', 'Model yeniden yukleme denemeleri', ['sonuc'])
+
+app.add_middleware(IstekMetrikMiddleware, sure=ISTEK_SURESI, sayac=ISTEK_SAYISI,
+                   serilestirme=lambda sure: ASAMA_SURESI.gozlemle(sure, asama='serilestirme'))
+
+# Endpoint girisinde govde okuma + pydantic dogrulama suresini kaydeder
+olcumlu = endpoint_olc(lambda sure: ASAMA_SURESI.gozlemle(sure, asama='dogrulama'))
+
+# Opsiyonel fuzzy tahmin tablosu (python fuzzy_tablo.py ile olusturulur)
+FUZZY_TABLO_YOLU = os.environ.get('FUZZY_TABLO', 'sehir_file/fuzzy_tablo.npz')
+
+# Fuzzy centroid yontemi: analitik (kesin) veya ornekli (skfuzzy ile ayni)
+FUZZY_DURULASTIRMA = os.environ.get('FUZZY_DURULASTIRMA', 'analitik')
+
+# Fuzzy kural tabani (uyelik fonksiyonlari ve kurallar; python fuzzy_ayarla.py ile ayarlanabilir)
+FUZZY_KURALLAR = os.environ.get('FUZZY_KURALLAR', 'fuzzy_kurallar.json')
+
+# Veri dosyasi (islenmis kolonlar ve benzer ev indeksi bundan turetilir)
+VERI_YOLU = os.environ.get('EMLAK_VERI', 'sehir_file/emlakverileri.csv')
+
+# Toplu tahminde tek istekteki maksimum kayit sayisi
+TOPLU_MAKS_BOYUT = int(os.environ.get('TOPLU_MAKS_BOYUT', '10000'))
+
+# Asenkron iste (/isler) tek istekteki maksimum kayit sayisi ve yuklenen dosyanin maksimum boyutu (bayt)
+IS_MAKS_BOYUT = int(os.environ.get('IS_MAKS_BOYUT', '1000000'))
+IS_MAKS_BAYT = int(os.environ.get('IS_MAKS_BAYT', str(1 << 30)))
+
+# Yüklenen dosyanın diske yazılma adımı (bayt): event loop'u bekletmemek için yazmalar thread'de
+IS_YAZMA_TAMPONU = 1 << 20
+
+# Yonetim endpoint'leri (/admin/*) icin X-Admin-Token degeri; tanimli degilse kapalidir
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Aktif model paketi: veri kolonlari (mmap), fuzzy ve ML modeli.
+# Istekler paketi bir kez okur; yeniden yuklemede referans tek atamayla degisir.
+paket = None
+_paket_kilidi = threading.Lock()
+
+# Acilista arka planda, birbirinden bagimsiz yuklenen parcalar ve asamalari
+ACILIS_ASAMALARI = {'fuzzy': ('veri', 'istatistikler', 'fuzzy'), 'ml': ('ml',)}
+
+# Parca -> {'durum': yukleniyor/hazir/hata, 'asama', 'sure_sn', 'hata'} (/health)
+acilis_yuklemesi = {}
+_yukleyiciler = []
+
+# Bir onceki paket (/admin/reload/geri-al icin)
+onceki_paket = None
+
+# Son yeniden yuklemenin durumu (/admin/reload); her degisiklikte yeni sozluk atanir
+yeniden_yukleme = {'durum': 'bosta'}
+_yukleme_kilidi = threading.Lock()
+
+# CPU-yogun tahminler event loop disinda bu havuzda calisir
+havuz = None
+
+# Tekrarlanan sorgular icin tahmin onbellegi (anahtar: parca, model surumu, ozellikler)
+onbellek = TahminOnbellegi()
+
+# Buyuk skorlama isleri icin kalici kuyruk (SQLite + is dizinleri) ve API icindeki iscileri
+is_kuyrugu = None
 
 
 # Request/Response modelleri
@@ -68,6 +143,14 @@ class BenzerEv(BaseModel):
     yas: int
 
 
+class FiyatAraligi(BaseModel):
+    """ML tahmininin fiyat aralığı (ormanın ağaçlarından)"""
+    alt: float
+    ust: float
+    kapsam: float = Field(..., description="Aralığın hedeflenen kapsama oranı (0.8 = %80)")
+    yontem: str = Field(..., description="yaprak: quantile forest, agac: ağaç tahminlerinin nicelikleri")
+
+
 class TahminSonucu(BaseModel):
     """Tahmin sonucu response modeli"""
     fuzzy_tahmin: float
@@ -76,9 +159,74 @@ class TahminSonucu(BaseModel):
     fark: float
     fark_yuzde: float
     m2_basina_fiyat: float
+    ml_aralik: Optional[FiyatAraligi] = None
     benzer_evler: Optional[List[BenzerEv]] = []
 
 
+class TopluTahminIstegi(BaseModel):
+    """
+    Toplu tahmin girdisi: kayıt listesi VEYA kolon dizileri
+
+    - kayitlar: [{"metrekare": 120, "oda_sayisi": 3, ...}, ...]
+    - kolonlar: {"metrekare": [120, 90, ...], "oda_sayisi": [3, 2, ...], ...}
+    """
+    kayitlar: Optional[List[Any]] = None
+    kolonlar: Optional[Dict[str, List[Any]]] = None
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "kolonlar": {
+                    "metrekare": [120, 85],
+                    "oda_sayisi": [3, 2],
+                    "bina_yasi": [5, 20],
+                    "bulundugu_kat": [3, 1],
+                    "bina_kat_sayisi": [8, 4],
+                    "isitma_tipi": [5, 1]
+                }
+            }
+        }
+
+
+class KalemHatasi(BaseModel):
+    """Toplu tahminde tek kaydın doğrulama hatası"""
+    indeks: int
+    alan: str
+    mesaj: str
+
+
+class TopluTahminSonucu(BaseModel):
+    """Toplu tahmin sonucu (diziler girdi sırasında, hatalı kayıtlar null)"""
+    fuzzy_tahmin: List[Optional[float]]
+    ml_tahmin: List[Optional[float]]
+    ml_alt: List[Optional[float]]
+    ml_ust: List[Optional[float]]
+    ortalama_tahmin: List[Optional[float]]
+    fark: List[Optional[float]]
+    fark_yuzde: List[Optional[float]]
+    m2_basina_fiyat: List[Optional[float]]
+    basarili: int
+    hatali: int
+    hatalar: List[KalemHatasi] = []
+
+
+class IsDurumu(BaseModel):
+    """Asenkron skorlama işinin durumu (sonuc: tamamlanınca indirme adresi)"""
+    is_id: str
+    tur: str
+    durum: str
+    olusturma: Optional[str] = None
+    baslama: Optional[str] = None
+    bitis: Optional[str] = None
+    toplam_satir: Optional[int] = None
+    islenen_satir: int = 0
+    ilerleme: Optional[float] = None
+    hata: Optional[str] = None
+    hatali: int = 0
+    hatalar: List[KalemHatasi] = []
+    sonuc: Optional[str] = None
+
+
 class ModelIstatistik(BaseModel):
     """Model istatistikleri"""
     veri_sayisi: int
@@ -86,6 +234,10 @@ class ModelIstatistik(BaseModel):
     medyan_m2: float
     fiyat_min: float
     fiyat_max: float
+    ortalama_fiyat: Optional[float] = None
+    fiyat_p25: Optional[float] = None
+    fiyat_p75: Optional[float] = None
+    medyan_m2_fiyat: Optional[float] = None
 
 
 class HealthCheck(BaseModel):
@@ -94,35 +246,175 @@ class HealthCheck(BaseModel):
     fuzzy_model_ready: bool
     ml_model_ready: bool
     data_loaded: bool
+    ml_model_versiyon: Optional[str] = None
+    tahmin_havuzu: Optional[Dict[str, int]] = None
+    yeniden_yukleme: Optional[str] = None
+    ilerleme: Optional[float] = None
+    yukleme: Optional[Dict[str, Dict[str, Any]]] = None
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Uygulama başlatıldığında modelleri yükle"""
-    global fuzzy_model, ml_model, df
+    """Uygulama başlatıldığında modelleri arka planda yüklemeye başla (sunucu hemen istek kabul eder)"""
+    global havuz, paket, is_kuyrugu
     
     print("🚀 API başlatılıyor...")
-    print("📊 Veri yükleniyor...")
+    havuz = TahminHavuzu()
+    print(f"⚙️  Tahmin havuzu: {havuz.isci_sayisi} işçi, kuyruk limiti {havuz.kuyruk_limiti}")
+    
+    # İşçiler modeller hazır olana kadar bekler; yarım kalmış işler kaldığı parçadan devam eder
+    is_kuyrugu = IsKuyrugu(IS_DIZINI)
+    is_kuyrugu.baslat(_is_modelleri, IS_ISCI_SAYISI)
+    print(f"🗂️  İş kuyruğu: {IS_DIZINI} ({IS_ISCI_SAYISI} işçi)")
+    
+    # Fuzzy (veri kolonları + istatistikler) ve ML (düz orman + benzer ev indeksi) ayrı
+    # thread'lerde yüklenir; hazır olan model diğerini beklemeden hizmete girer
+    paket = ModelPaketi(None, None, None, VERI_YOLU)
+    acilis_yuklemesi.clear()
+    _yukleyiciler.clear()
+    for parca in ACILIS_ASAMALARI:
+        acilis_yuklemesi[parca] = {'durum': 'yukleniyor', 'asama': ACILIS_ASAMALARI[parca][0]}
+        t = threading.Thread(target=_parca_yukle, args=(parca,), name=f'{parca}-yukleme', daemon=True)
+        _yukleyiciler.append(t)
+        t.start()
+    print("📊 Modeller arka planda yükleniyor (durum: /health)")
+
+
+def _parca_yukle(parca):
+    """Açılışta bir modeli yükle ve hazır olunca aktif pakete ekle (arka plan thread'i)"""
+    global paket
+    bas = time.perf_counter()
+    
+    def ilerleme(asama):
+        acilis_yuklemesi[parca] = {'durum': 'yukleniyor', 'asama': asama}
     
     try:
-        # Veriyi yükle
-        df = pd.read_csv('sehir_file/emlakverileri.csv')
-        
-        # Fuzzy model
-        print("🔮 Fuzzy model oluşturuluyor...")
-        fuzzy_model = EmlakFuzzyModel(df=df)
-        
-        # ML model
-        print("🤖 ML model eğitiliyor...")
-        ml_model = EmlakMLModel()
-        ml_model.veriyi_yukle_ve_isle('sehir_file/emlakverileri.csv')
-        ml_model.model_egit()
-        
-        print("✅ Tüm modeller hazır!")
+        if parca == 'fuzzy':
+            veri, istatistik, fuzzy = fuzzy_yukle(VERI_YOLU, FUZZY_DURULASTIRMA, FUZZY_TABLO_YOLU, ilerleme,
+                                                  FUZZY_KURALLAR)
+            parcalar = {'veri': veri, 'istatistik': istatistik, 'fuzzy': fuzzy}
+        else:
+            parcalar = {'ml': ml_yukle(VERI_YOLU, ilerleme)}
         
+        with _paket_kilidi:
+            paket = paket.ile(**parcalar)
+        sure = time.perf_counter() - bas
+        acilis_yuklemesi[parca] = {'durum': 'hazir', 'sure_sn': round(sure, 2)}
+        print(f"✅ {parca} modeli hazır ({sure:.1f} sn)")
     except Exception as e:
-        print(f"❌ Model yükleme hatası: {e}")
-        raise
+        acilis_yuklemesi[parca] = {'durum': 'hata', 'hata': str(e), 'sure_sn': round(time.perf_counter() - bas, 2)}
+        print(f"❌ {parca} modeli yüklenemedi: {e}")
+
+
+def _is_modelleri():
+    """İş kuyruğu işçileri için aktif paketin modelleri (hazır değilse None, işler bekler)"""
+    p = paket
+    return (p.fuzzy, p.ml) if p is not None and p.hazir else None
+
+
+def acilis_ilerlemesi():
+    """Açılış yüklemesinde tamamlanan aşamaların oranı (0-1)"""
+    toplam = sum(len(a) for a in ACILIS_ASAMALARI.values())
+    biten = 0
+    for parca, asamalar in ACILIS_ASAMALARI.items():
+        durum = acilis_yuklemesi.get(parca, {})
+        if durum.get('durum') == 'hazir':
+            biten += len(asamalar)
+        elif durum.get('asama') in asamalar:
+            biten += asamalar.index(durum['asama'])
+    return biten / toplam
+
+
+def acilis_suruyor():
+    """Açılış yüklemesi devam ediyor mu?"""
+    return any(d['durum'] == 'yukleniyor' for d in acilis_yuklemesi.values())
+
+
+def yuklemeyi_bekle(zaman_asimi=None):
+    """Açılış yüklemesinin bitmesini bekle (betikler ve ölçümler için); tüm modeller hazırsa True"""
+    for t in list(_yukleyiciler):
+        t.join(zaman_asimi)
+    return paket is not None and paket.hazir
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Uygulama kapanırken tahmin havuzunu ve iş kuyruğu işçilerini kapat (çalışan işler kuyruğa döner)"""
+    if havuz:
+        havuz.kapat()
+    if is_kuyrugu:
+        is_kuyrugu.durdur()
+
+
+@app.exception_handler(HavuzDolu)
+async def havuz_dolu_handler(request: Request, exc: HavuzDolu):
+    """Kuyruk taşınca isteği bekletmek yerine hemen 503 dön"""
+    return JSONResponse(status_code=503, content={"detail": "Sunucu meşgul, lütfen tekrar deneyin"},
+                        headers={"Retry-After": "1"})
+
+
+def paketi_degistir(yeni):
+    """Yeni paketi aktif yap ve eski sürümlere ait önbelleği boşalt (devam eden istekler eski paketi kullanır)"""
+    global paket, onceki_paket
+    with _paket_kilidi:
+        onceki_paket, paket = paket, yeni
+    onbellek.temizle()
+
+
+def _hazir_paket(*parcalar, mesaj="Modeller henüz yüklenmedi"):
+    """Aktif paketi al; istenen modeller ('fuzzy', 'ml') henüz yüklenmediyse 503"""
+    p = paket
+    if p is None or any(getattr(p, parca) is None for parca in parcalar):
+        raise HTTPException(status_code=503, detail=mesaj, headers={"Retry-After": "1"})
+    return p
+
+
+def _tahmin_hesapla(p, oz_dict, parcalar):
+    """İstenen parçaları ('fuzzy', 'ml', 'benzer') p paketiyle hesapla (havuz işçisinde çalışır)"""
+    hesaplayicilar = {
+        'fuzzy': lambda: p.fuzzy.predict(oz_dict),
+        'ml': lambda: p.ml.predict_aralik(oz_dict),
+        'benzer': lambda: p.ml.benzer_evler_bul(oz_dict, n=5)
+    }
+    
+    sonuc = {}
+    for parca in parcalar:
+        with ASAMA_SURESI.zamanla(asama=parca):
+            sonuc[parca] = hesaplayicilar[parca]()
+    return sonuc
+
+
+def _fiyat_araligi(p, alt, ust):
+    """ML aralık sınırlarından yanıt modeli"""
+    return FiyatAraligi(alt=round(alt, 2), ust=round(ust, 2),
+                        kapsam=round(ARALIK_NICELIKLERI[1] - ARALIK_NICELIKLERI[0], 2),
+                        yontem=p.ml.orman.aralik_yontemi)
+
+
+async def _tahminler(p, oz_dict, parcalar):
+    """
+    Önbellekte olanları oradan al, eksikleri tek havuz işinde hesaplayıp önbelleğe yaz
+    Anahtarda paketin nesli vardır: paket değişirken süren isteğin eski paketle hesapladığı
+    sonuç yeni pakete karışmaz (paket artık aktif değilse hiç yazılmaz).
+    """
+    ozellik = tuple(oz_dict[g] for g in GIRISLER)
+    anahtarlar = {parca: (parca, p.nesil, p.surumler.get(parca), ozellik) for parca in parcalar}
+    
+    sonuc = {}
+    for parca, anahtar in anahtarlar.items():
+        deger = onbellek.al(anahtar)
+        if deger is not None:
+            sonuc[parca] = deger
+    
+    eksik = [parca for parca in parcalar if parca not in sonuc]
+    if eksik:
+        hesaplanan = await havuz.calistir(_tahmin_hesapla, p, oz_dict, eksik)
+        if p is paket:
+            for parca, deger in hesaplanan.items():
+                onbellek.koy(anahtarlar[parca], deger)
+        sonuc.update(hesaplanan)
+    
+    return sonuc
 
 
 @app.get("/", tags=["Genel"])
@@ -137,7 +429,14 @@ async def root():
             "predict": "/predict",
             "predict_fuzzy": "/predict/fuzzy",
             "predict_ml": "/predict/ml",
-            "stats": "/stats"
+            "predict_batch": "/predict/batch",
+            "stats": "/stats",
+            "stats_segmentler": "/stats/segmentler",
+            "stats_onbellek": "/stats/onbellek",
+            "isler": "/isler",
+            "isler_dosya": "/isler/dosya",
+            "metrics": "/metrics",
+            "admin_reload": "/admin/reload"
         }
     }
 
@@ -145,37 +444,45 @@ async def root():
 @app.get("/health", response_model=HealthCheck, tags=["Genel"])
 async def health_check():
     """Sistem sağlık kontrolü"""
+    p = paket
+    if p is not None and p.hazir:
+        status = "healthy"
+    else:
+        status = "loading" if acilis_suruyor() else "unhealthy"
+    
     return HealthCheck(
-        status="healthy" if (fuzzy_model and ml_model and df is not None) else "unhealthy",
-        fuzzy_model_ready=fuzzy_model is not None,
-        ml_model_ready=ml_model is not None,
-        data_loaded=df is not None
+        status=status,
+        fuzzy_model_ready=p is not None and p.fuzzy is not None,
+        ml_model_ready=p is not None and p.ml is not None,
+        data_loaded=p is not None and p.veri is not None,
+        ml_model_versiyon=p.ml.versiyon if p is not None and p.ml is not None else None,
+        tahmin_havuzu=havuz.durum() if havuz else None,
+        yeniden_yukleme=yeniden_yukleme['durum'],
+        ilerleme=round(acilis_ilerlemesi(), 2),
+        yukleme=acilis_yuklemesi
     )
 
 
 @app.post("/predict", response_model=TahminSonucu, tags=["Tahmin"])
+@olcumlu
 async def predict_combined(ozellikler: EmlakOzellikleri):
     """
     Her iki modelle tahmin yap (Fuzzy + ML)
     
     Bu endpoint hem Fuzzy Logic hem de Machine Learning modelini kullanarak
-    fiyat tahmini yapar ve karşılaştırmalı sonuç döner.
+    fiyat tahmini yapar ve karşılaştırmalı sonuç döner. `ml_aralik`, ML
+    tahmininin %80 fiyat aralığıdır (tahminle aynı orman gezintisinden).
     """
-    if not fuzzy_model or not ml_model:
-        raise HTTPException(status_code=503, detail="Modeller henüz yüklenmedi")
+    p = _hazir_paket('fuzzy', 'ml')
     
     try:
         # Özellikleri dict'e çevir
         oz_dict = ozellikler.dict()
         
-        # Fuzzy tahmin
-        fuzzy_tahmin = fuzzy_model.predict(oz_dict)
-        
-        # ML tahmin
-        ml_tahmin = ml_model.predict(oz_dict)
-        
-        # Benzer evler
-        benzer_evler = ml_model.benzer_evler_bul(oz_dict, n=5)
+        # Fuzzy tahmin, ML tahmin ve benzer evler (önbellekten veya havuzda)
+        sonuc = await _tahminler(p, oz_dict, ('fuzzy', 'ml', 'benzer'))
+        fuzzy_tahmin, benzer_evler = sonuc['fuzzy'], sonuc['benzer']
+        ml_tahmin, ml_alt, ml_ust = sonuc['ml']
         benzer_evler_list = [BenzerEv(**ev) for ev in benzer_evler]
         
         # Hesaplamalar
@@ -191,24 +498,27 @@ async def predict_combined(ozellikler: EmlakOzellikleri):
             fark=round(fark, 2),
             fark_yuzde=round(fark_yuzde, 2),
             m2_basina_fiyat=round(m2_fiyat, 2),
+            ml_aralik=_fiyat_araligi(p, ml_alt, ml_ust),
             benzer_evler=benzer_evler_list
         )
         
+    except HavuzDolu:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Tahmin hatası: {str(e)}")
 
 
 @app.post("/predict/fuzzy", tags=["Tahmin"])
+@olcumlu
 async def predict_fuzzy_only(ozellikler: EmlakOzellikleri):
     """
     Sadece Fuzzy Logic modeli ile tahmin yap
     """
-    if not fuzzy_model:
-        raise HTTPException(status_code=503, detail="Fuzzy model henüz yüklenmedi")
+    p = _hazir_paket('fuzzy', mesaj="Fuzzy model henüz yüklenmedi")
     
     try:
         oz_dict = ozellikler.dict()
-        tahmin = fuzzy_model.predict(oz_dict)
+        tahmin = (await _tahminler(p, oz_dict, ('fuzzy',)))['fuzzy']
         
         return {
             "model": "Fuzzy Logic",
@@ -217,54 +527,497 @@ async def predict_fuzzy_only(ozellikler: EmlakOzellikleri):
             "ozellikler": oz_dict
         }
         
+    except HavuzDolu:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Fuzzy tahmin hatası: {str(e)}")
 
 
 @app.post("/predict/ml", tags=["Tahmin"])
+@olcumlu
 async def predict_ml_only(ozellikler: EmlakOzellikleri):
     """
     Sadece Machine Learning modeli ile tahmin yap
     """
-    if not ml_model:
-        raise HTTPException(status_code=503, detail="ML model henüz yüklenmedi")
+    p = _hazir_paket('ml', mesaj="ML model henüz yüklenmedi")
     
     try:
         oz_dict = ozellikler.dict()
-        tahmin = ml_model.predict(oz_dict)
-        benzer_evler = ml_model.benzer_evler_bul(oz_dict, n=5)
+        sonuc = await _tahminler(p, oz_dict, ('ml', 'benzer'))
+        (tahmin, alt, ust), benzer_evler = sonuc['ml'], sonuc['benzer']
         
         return {
             "model": "Random Forest (ML)",
             "tahmin": round(tahmin, 2),
+            "aralik": _fiyat_araligi(p, alt, ust),
             "m2_basina_fiyat": round(tahmin / ozellikler.metrekare, 2),
             "ozellikler": oz_dict,
             "benzer_evler": benzer_evler
         }
         
+    except HavuzDolu:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"ML tahmin hatası: {str(e)}")
 
 
+def _toplu_kolonlara_cevir(istek):
+    """Kayıt listesini kolon dizilerine çevir (kayıt dict değilse hata listesine)"""
+    if (istek.kayitlar is None) == (istek.kolonlar is None):
+        raise HTTPException(status_code=422, detail="'kayitlar' veya 'kolonlar' alanlarından tam olarak biri verilmeli")
+
+    if istek.kolonlar is not None:
+        uzunluklar = {len(v) for v in istek.kolonlar.values()}
+        if len(uzunluklar) > 1:
+            raise HTTPException(status_code=422, detail="Tüm kolon dizileri aynı uzunlukta olmalı")
+        n = uzunluklar.pop() if uzunluklar else 0
+        return istek.kolonlar, n, []
+
+    n = len(istek.kayitlar)
+    hatalar = [KalemHatasi(indeks=i, alan="__kayit__", mesaj="Kayıt bir JSON nesnesi olmalı")
+               for i, k in enumerate(istek.kayitlar) if not isinstance(k, dict)]
+    kolonlar = {
+        alan: [k.get(alan) if isinstance(k, dict) else None for k in istek.kayitlar]
+        for alan in GIRISLER
+    }
+    return kolonlar, n, hatalar
+
+
+def _toplu_dogrula(kolonlar, n):
+    """
+    Kolon dizilerini vektörel doğrula (EmlakOzellikleri sınırlarıyla)
+    (N, 6) float dizi ve kalem bazlı hatalar döner.
+    """
+    X = np.full((n, len(GIRISLER)), np.nan)
+    hatalar = []
+
+    for j, alan in enumerate(GIRISLER):
+        bilgi = EmlakOzellikleri.__fields__[alan].field_info
+        degerler = kolonlar.get(alan)
+        if degerler is None:
+            hatalar.extend(KalemHatasi(indeks=i, alan=alan, mesaj="Alan gerekli") for i in range(n))
+            continue
+
+        seri = pd.Series(degerler, dtype=object)
+        sayi = pd.to_numeric(seri.where(~seri.map(lambda v: isinstance(v, bool))), errors='coerce').to_numpy(dtype=float)
+        tam_sayi_degil = np.isnan(sayi) | (sayi != np.round(sayi))
+        aralik_disi = ~tam_sayi_degil & ((sayi < bilgi.ge) | (sayi > bilgi.le))
+
+        for i in np.flatnonzero(tam_sayi_degil):
+            mesaj = "Alan gerekli" if degerler[i] is None else "Tam sayı olmalı"
+            hatalar.append(KalemHatasi(indeks=int(i), alan=alan, mesaj=mesaj))
+        for i in np.flatnonzero(aralik_disi):
+            hatalar.append(KalemHatasi(indeks=int(i), alan=alan, mesaj=f"{bilgi.ge} ile {bilgi.le} arasında olmalı"))
+
+        X[:, j] = sayi
+
+    return X, hatalar
+
+
+def _toplu_tahmin(p, X):
+    """Geçerli kayıtlar için iki modelin vektörel tahmini (havuz işçisinde çalışır)"""
+    with ASAMA_SURESI.zamanla(asama='toplu_fuzzy'):
+        fuzzy_tahmin = p.fuzzy.predict_batch(X)
+    with ASAMA_SURESI.zamanla(asama='toplu_ml'):
+        ml_tahmin, (ml_alt, ml_ust) = p.ml.predict_batch_aralik(X)
+    return fuzzy_tahmin, ml_tahmin, ml_alt, ml_ust
+
+
+def _liste(dizi):
+    """NaN -> None, 2 basamağa yuvarlanmış liste"""
+    return [None if np.isnan(v) else v for v in np.round(dizi, 2).tolist()]
+
+
+@app.post("/predict/batch", response_model=TopluTahminSonucu, tags=["Tahmin"])
+@olcumlu
+async def predict_batch(istek: TopluTahminIstegi):
+    """
+    Toplu tahmin (Fuzzy + ML)
+
+    Kayıt listesi veya kolon dizileri kabul eder. Her model geçerli kayıtlar için
+    tek bir vektörel çağrı ile çalışır; sonuçlar girdi sırasında döner. Hatalı
+    kayıtlar isteği düşürmez: değerleri null olur ve `hatalar` listesinde raporlanır.
+    `ml_alt`/`ml_ust` ML tahmininin %80 fiyat aralığıdır. Benzer evler toplu yanıtta yer almaz.
+    """
+    p = _hazir_paket('fuzzy', 'ml')
+
+    kolonlar, n, hatalar = _toplu_kolonlara_cevir(istek)
+    if n > TOPLU_MAKS_BOYUT:
+        raise HTTPException(status_code=413, detail=f"En fazla {TOPLU_MAKS_BOYUT} kayıt gönderilebilir (gelen: {n})")
+
+    with ASAMA_SURESI.zamanla(asama='toplu_dogrulama'):
+        X, alan_hatalari = _toplu_dogrula(kolonlar, n)
+    kayit_hatali = {h.indeks for h in hatalar}
+    hatalar.extend(h for h in alan_hatalari if h.indeks not in kayit_hatali)
+
+    gecerli = np.ones(n, dtype=bool)
+    gecerli[[h.indeks for h in hatalar]] = False
+
+    fuzzy_tahmin = np.full(n, np.nan)
+    ml_tahmin = np.full(n, np.nan)
+    ml_alt = np.full(n, np.nan)
+    ml_ust = np.full(n, np.nan)
+
+    try:
+        if gecerli.any():
+            (fuzzy_tahmin[gecerli], ml_tahmin[gecerli],
+             ml_alt[gecerli], ml_ust[gecerli]) = await havuz.calistir(_toplu_tahmin, p, X[gecerli])
+    except HavuzDolu:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Toplu tahmin hatası: {str(e)}")
+
+    # Hesaplamalar (/predict ile aynı)
+    ortalama = (fuzzy_tahmin + ml_tahmin) / 2
+    fark = np.abs(fuzzy_tahmin - ml_tahmin)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fark_yuzde = np.where(fuzzy_tahmin > 0, fark / fuzzy_tahmin * 100, np.where(np.isnan(fuzzy_tahmin), np.nan, 0))
+        m2_fiyat = ortalama / X[:, 0]
+
+    return TopluTahminSonucu(
+        fuzzy_tahmin=_liste(fuzzy_tahmin),
+        ml_tahmin=_liste(ml_tahmin),
+        ml_alt=_liste(ml_alt),
+        ml_ust=_liste(ml_ust),
+        ortalama_tahmin=_liste(ortalama),
+        fark=_liste(fark),
+        fark_yuzde=_liste(fark_yuzde),
+        m2_basina_fiyat=_liste(m2_fiyat),
+        basarili=int(gecerli.sum()),
+        hatali=int(n - gecerli.sum()),
+        hatalar=sorted(hatalar, key=lambda h: h.indeks)
+    )
+
+
+def _is_durumu(durum):
+    """Kuyruk durum sözlüğünden yanıt (tamamlanan işe indirme adresi eklenir)"""
+    sonuc = f"/isler/{durum['is_id']}/sonuc" if durum['durum'] == 'tamamlandi' else None
+    return IsDurumu(**durum, sonuc=sonuc)
+
+
+def _is_kaydet(kolonlar, n, hatalar):
+    """Kayıtları doğrula, hatalıları boş (NaN) bırakıp işi kuyruğa ekle (havuz işçisinde çalışır)"""
+    X, alan_hatalari = _toplu_dogrula(kolonlar, n)
+    kayit_hatali = {h.indeks for h in hatalar}
+    hatalar.extend(h for h in alan_hatalari if h.indeks not in kayit_hatali)
+    X[[h.indeks for h in hatalar]] = np.nan
+    return is_kuyrugu.kayit_gonder(X, [h.dict() for h in sorted(hatalar, key=lambda h: h.indeks)])
+
+
+@app.post("/isler", response_model=IsDurumu, status_code=202, tags=["İşler"])
+@olcumlu
+async def is_gonder(istek: TopluTahminIstegi):
+    """
+    Asenkron toplu tahmin işi (girdi /predict/batch ile aynı)
+
+    Kayıtlar doğrulanıp diske yazılır ve hemen iş kimliği döner; tahminler arka planda
+    parça parça yapılır (modeller henüz yüklenmediyse iş bekler). Durum `GET /isler/{is_id}`,
+    sonuç CSV'si `GET /isler/{is_id}/sonuc` ile alınır. Hatalı kayıtların satırı boş kalır
+    ve `hatalar` listesinde raporlanır. En fazla `IS_MAKS_BOYUT` kayıt kabul edilir.
+    """
+    kolonlar, n, hatalar = _toplu_kolonlara_cevir(istek)
+    if n == 0:
+        raise HTTPException(status_code=422, detail="En az bir kayıt gönderilmeli")
+    if n > IS_MAKS_BOYUT:
+        raise HTTPException(status_code=413, detail=f"En fazla {IS_MAKS_BOYUT} kayıt gönderilebilir (gelen: {n})")
+    
+    return _is_durumu(await havuz.calistir(_is_kaydet, kolonlar, n, hatalar))
+
+
+@app.post("/isler/dosya", response_model=IsDurumu, status_code=202, tags=["İşler"])
+async def is_dosya_gonder(request: Request, bicim: str = 'csv'):
+    """
+    Ham ilan dosyasıyla asenkron skorlama işi (çıktı toplu_skorla.py ile aynı kolonlar)
+
+    İstek gövdesi dosyanın kendisidir (`bicim`: csv veya parquet; emlakverileri.csv kolonları), ör.
+    `curl --data-binary @ilanlar.csv "http://localhost:8000/isler/dosya?bicim=csv"`.
+    Gövde belleğe alınmadan diske yazılır; en fazla `IS_MAKS_BAYT` bayt kabul edilir.
+    """
+    if bicim not in ('csv', 'parquet'):
+        raise HTTPException(status_code=422, detail="bicim 'csv' veya 'parquet' olmalı")
+    
+    # Gövde multipart form değil ham dosya: ayrıştırma ve geçici dosyaya kopyalama olmadan
+    # doğrudan iş dizinine akar, bayt sınırı da okurken uygulanır. Yarıda kalan gönderimin
+    # dizini kaydı olmadığından IsKuyrugu.temizle ile silinir.
+    is_id = is_kuyrugu.yeni_is()
+    ad = f'girdi.{bicim}'
+    try:
+        boyut = 0
+        tampon = bytearray()
+        with open(os.path.join(is_kuyrugu.is_dizini(is_id), ad), 'wb') as f:
+            async for parca in request.stream():
+                boyut += len(parca)
+                if boyut > IS_MAKS_BAYT:
+                    raise HTTPException(status_code=413, detail=f"Dosya en fazla {IS_MAKS_BAYT} bayt olabilir")
+                tampon += parca
+                if len(tampon) >= IS_YAZMA_TAMPONU:
+                    await run_in_threadpool(f.write, bytes(tampon))
+                    tampon.clear()
+            if tampon:
+                await run_in_threadpool(f.write, bytes(tampon))
+        if boyut == 0:
+            raise HTTPException(status_code=422, detail="Dosya boş")
+        return _is_durumu(await havuz.calistir(is_kuyrugu.dosya_gonder, is_id, ad))
+    except ValueError as e:
+        shutil.rmtree(is_kuyrugu.is_dizini(is_id), ignore_errors=True)
+        raise HTTPException(status_code=422, detail=f"Dosya okunamadı: {str(e)}")
+    except BaseException:
+        shutil.rmtree(is_kuyrugu.is_dizini(is_id), ignore_errors=True)
+        raise
+
+
+@app.get("/isler/{is_id}", response_model=IsDurumu, tags=["İşler"])
+async def is_sorgula(is_id: str):
+    """
+    İşin durumu ve ilerlemesi (durum: bekliyor, calisiyor, tamamlandi, hata, iptal)
+    """
+    durum = is_kuyrugu.durum(is_id)
+    if durum is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return _is_durumu(durum)
+
+
+@app.get("/isler/{is_id}/sonuc", tags=["İşler"])
+async def is_sonucu(is_id: str):
+    """
+    Tamamlanan işin sonuç CSV'si (girdi sırasında)
+    """
+    durum = is_kuyrugu.durum(is_id)
+    if durum is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    if durum['durum'] != 'tamamlandi':
+        raise HTTPException(status_code=409, detail=f"İş henüz tamamlanmadı (durum: {durum['durum']})")
+    return FileResponse(is_kuyrugu.sonuc_yolu(is_id), media_type="text/csv", filename=f"{is_id}.csv")
+
+
+@app.delete("/isler/{is_id}", tags=["İşler"])
+async def is_sil(is_id: str):
+    """
+    İşi iptal et veya sil: bekleyen/biten iş dosyalarıyla silinir, çalışan iş parça sonunda durur
+    """
+    onceki = is_kuyrugu.sil(is_id)
+    if onceki is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return {"is_id": is_id, "durum": "iptal" if onceki == 'calisiyor' else "silindi"}
+
+
 @app.get("/stats", response_model=ModelIstatistik, tags=["İstatistik"])
 async def get_statistics():
     """
     Veri seti istatistiklerini getir
+
+    Verinin yanına kaydedilen istatistik özetinden okunur (nicelikler %0,1 göreli hata payı içinde).
     """
-    if not fuzzy_model or not fuzzy_model.istatistikler:
-        raise HTTPException(status_code=503, detail="İstatistikler henüz hazır değil")
+    p = _hazir_paket('istatistik', mesaj="İstatistikler henüz hazır değil")
     
-    stats = fuzzy_model.istatistikler
+    stats = p.istatistik.istatistikler()
     
     return ModelIstatistik(
         veri_sayisi=stats['veri_sayisi'],
         medyan_fiyat=round(stats['fiyat_median'], 2),
         medyan_m2=round(stats['metrekare_median'], 2),
         fiyat_min=round(stats['fiyat_min'], 2),
-        fiyat_max=round(stats['fiyat_max'], 2)
+        fiyat_max=round(stats['fiyat_max'], 2),
+        ortalama_fiyat=round(stats['fiyat_mean'], 2),
+        fiyat_p25=round(stats['fiyat_p25'], 2),
+        fiyat_p75=round(stats['fiyat_p75'], 2),
+        medyan_m2_fiyat=round(stats['fiyat_per_m2_median'], 2)
     )
 
 
+@app.get("/stats/segmentler", tags=["İstatistik"])
+async def get_segment_istatistikleri(grup: Optional[str] = None, oda_sayisi: Optional[int] = None,
+                                     isitma_tipi: Optional[int] = None, en_az: int = 1):
+    """
+    Segment bazında fiyat, metrekare ve m² fiyatı istatistikleri
+
+    - `grup`: kırılım, `oda_sayisi`, `isitma_tipi` veya `oda_sayisi,isitma_tipi`
+      (verilmezse filtrelerden, filtre de yoksa `oda_sayisi`)
+    - `oda_sayisi`, `isitma_tipi`: yalnızca bu değerdeki segmentler
+    - `en_az`: en az bu kadar kaydı olan segmentler
+
+    Örnek: `/stats/segmentler?grup=oda_sayisi,isitma_tipi&oda_sayisi=3` 3 odalı evlerde
+    ısıtma tipine göre m² fiyatları. Nicelikler %1 göreli hata payı içindedir.
+    """
+    p = _hazir_paket('istatistik', mesaj="İstatistikler henüz hazır değil")
+    
+    filtre = {ad: deger for ad, deger in (('oda_sayisi', oda_sayisi), ('isitma_tipi', isitma_tipi))
+              if deger is not None}
+    boyutlar = tuple(b.strip() for b in grup.split(',')) if grup else tuple(filtre) or ('oda_sayisi',)
+    if boyutlar not in GRUPLAMALAR:
+        raise HTTPException(status_code=422, detail="Geçersiz grup, geçerli değerler: " +
+                            ", ".join(','.join(g) for g in GRUPLAMALAR))
+    if not set(filtre) <= set(boyutlar):
+        raise HTTPException(status_code=422, detail="Filtreler gruptaki alanlardan olmalı")
+    
+    segmentler = p.istatistik.segmentler(boyutlar, filtre, en_az)
+    return {
+        "grup": list(boyutlar),
+        "goreli_hata": p.istatistik.grup_goreli_hata,
+        "segmentler": [{k: v if isinstance(v, int) else None if np.isnan(v) else round(v, 2)
+                        for k, v in s.items()} for s in segmentler]
+    }
+
+
+@app.get("/stats/onbellek", tags=["İstatistik"])
+async def get_onbellek_istatistikleri():
+    """
+    Tahmin önbelleği isabet/ıska sayaçları (boyutlandırma için)
+    """
+    p = paket
+    return {**onbellek.istatistik(), "model_surumleri": p.surumler if p is not None else {}}
+
+
+@KAYIT.toplayici_ekle
+def _anlik_metrikler():
+    """Okuma anındaki model, önbellek ve kuyruk değerleri"""
+    p = paket
+    metrikler = [
+        ('emlak_model_hazir', 'gauge', 'Model yuklu mu (1/0)',
+         [({'model': parca}, int(p is not None and getattr(p, parca) is not None)) for parca in ('fuzzy', 'ml')]),
+        ('emlak_yeniden_yukleme_calisiyor', 'gauge', 'Arka planda yeniden yukleme suruyor mu (1/0)',
+         [({}, int(yeniden_yukleme['durum'] == 'yukleniyor'))])
+    ]
+    
+    if p is not None and p.fuzzy is not None:
+        metrikler.append(('emlak_fuzzy_fallback_toplam', 'counter',
+                          'Hic kural atesmedigi icin m2 medyani fallback ile yapilan fuzzy tahmin sayisi '
+                          '(aktif paket yuklendiginden beri)',
+                          [({}, p.fuzzy.fallback_sayisi)]))
+        metrikler.append(('emlak_fuzzy_tahmin_toplam', 'counter',
+                          'Fuzzy motorunun degerlendirdigi tahmin sayisi (aktif paket yuklendiginden beri)',
+                          [({}, p.fuzzy.tahmin_sayisi)]))
+        metrikler.append(('emlak_fuzzy_atesleyen_kural_toplam', 'counter',
+                          'Bu tahminlerde atesleyen toplam kural sayisi; tahmin basina ortalama = '
+                          'emlak_fuzzy_atesleyen_kural_toplam / emlak_fuzzy_tahmin_toplam',
+                          [({}, p.fuzzy.atesleyen_kural_sayisi)]))
+    
+    o = onbellek.istatistik()
+    metrikler += [
+        ('emlak_onbellek_kayit', 'gauge', 'Tahmin onbellegindeki kayit sayisi', [({}, o['kayit_sayisi'])]),
+        ('emlak_onbellek_kapasite', 'gauge', 'Tahmin onbellegi kapasitesi', [({}, o['kapasite'])]),
+        ('emlak_onbellek_isabet_toplam', 'counter', 'Onbellek isabetleri', [({}, o['isabet'])]),
+        ('emlak_onbellek_iska_toplam', 'counter', 'Onbellek iskalari', [({}, o['iska'])]),
+        ('emlak_onbellek_tahliye_toplam', 'counter', 'LRU ile atilan kayitlar', [({}, o['tahliye'])]),
+    ]
+    
+    if havuz is not None:
+        h = havuz.durum()
+        metrikler += [
+            ('emlak_havuz_calisan', 'gauge', 'Calisan tahmin isi', [({}, h['calisan'])]),
+            ('emlak_havuz_bekleyen', 'gauge', 'Kuyrukta bekleyen tahmin isi', [({}, h['bekleyen'])]),
+            ('emlak_havuz_kapasite', 'gauge', 'Isci sayisi + kuyruk limiti',
+             [({}, h['isci_sayisi'] + h['kuyruk_limiti'])]),
+            ('emlak_havuz_reddedilen_toplam', 'counter', 'Kuyruk dolu oldugu icin 503 donen istekler',
+             [({}, h['reddedilen'])]),
+        ]
+    
+    if is_kuyrugu is not None:
+        metrikler.append(('emlak_is_kuyrugu', 'gauge', 'Durumuna gore asenkron skorlama isi sayisi',
+                          [({'durum': d}, sayi) for d, sayi in is_kuyrugu.sayilar().items()]))
+    
+    return metrikler
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["İstatistik"])
+async def metrics():
+    """
+    Prometheus metin formatında metrikler
+    """
+    return PlainTextResponse(KAYIT.metin(), media_type="text/plain; version=0.0.4")
+
+
+def _yonetici_dogrula(token):
+    """X-Admin-Token başlığını ADMIN_TOKEN ile karşılaştır (tanımlı değilse yönetim kapalı)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Yönetim endpoint'leri kapalı (ADMIN_TOKEN tanımlı değil)")
+    if not token or not hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        raise HTTPException(status_code=401, detail="Geçersiz yönetici anahtarı")
+
+
+def _yeniden_yukle(zorla):
+    """
+    Yeni paketi kur, eskisiyle karşılaştır ve uygunsa yerine koy (arka plan thread'inde)
+    Metrikler geriliyorsa yeni paket devreye alınmaz, eski paket hizmet vermeye devam eder.
+    """
+    global yeniden_yukleme
+    bas = time.perf_counter()
+    try:
+        print("🔄 Modeller yeniden yükleniyor...")
+        yeni = paket_yukle(VERI_YOLU, FUZZY_DURULASTIRMA, FUZZY_TABLO_YOLU, FUZZY_KURALLAR)
+        # Açılışta yüklenemeyen model varsa yeni paket yalnızca kendi tahminleriyle doğrulanır
+        eski = paket if paket.hazir else None
+        sorunlar, metrikler = paket_karsilastir(eski, yeni)
+        durum = {'sorunlar': sorunlar, 'metrikler': metrikler, 'sure_sn': round(time.perf_counter() - bas, 2)}
+        
+        if sorunlar and not zorla:
+            print(f"↩️  Yeni modeller devreye alınmadı: {'; '.join(sorunlar)}")
+            durum.update(durum='geri_alindi', aktif=paket.ozet())
+        else:
+            paketi_degistir(yeni)
+            print(f"✅ Yeni modeller devrede (ML sürümü {yeni.ml.versiyon})")
+            durum.update(durum='tamamlandi', aktif=yeni.ozet())
+    except Exception as e:
+        print(f"❌ Yeniden yükleme hatası: {e}")
+        durum = {'durum': 'hata', 'hata': str(e), 'sure_sn': round(time.perf_counter() - bas, 2)}
+    
+    YENIDEN_YUKLEME.artir(sonuc=durum['durum'])
+    yeniden_yukleme = {**durum, 'zorla': zorla, 'bitis': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    _yukleme_kilidi.release()
+
+
+@app.post("/admin/reload", status_code=202, tags=["Yönetim"])
+async def admin_reload(zorla: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """
+    Modelleri yeniden başlatmadan yeniden yükle
+
+    Veri dosyasının ve model kaydının güncel halinden yeni paket arka planda kurulur.
+    Doğrulama örneğinde tahminler geçerliyse ve MAPE değerleri `YENIDEN_YUKLEME_TOLERANSI`
+    (varsayılan %10) kadardan fazla kötüleşmediyse tek adımda devreye alınır; aksi halde
+    eski modeller kalır. `zorla=true` karşılaştırma sonucunu yok sayar. Süren istekler
+    başladıkları paketle tamamlanır. Durum `GET /admin/reload` ile izlenir.
+    """
+    global yeniden_yukleme
+    _yonetici_dogrula(x_admin_token)
+    if paket is None or acilis_suruyor():
+        raise HTTPException(status_code=503, detail="Modeller henüz yüklenmedi", headers={"Retry-After": "1"})
+    if not _yukleme_kilidi.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Yeniden yükleme zaten sürüyor")
+    
+    yeniden_yukleme = {'durum': 'yukleniyor', 'zorla': zorla, 'baslangic': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    threading.Thread(target=_yeniden_yukle, args=(zorla,), name='yeniden-yukleme', daemon=True).start()
+    return yeniden_yukleme
+
+
+@app.get("/admin/reload", tags=["Yönetim"])
+async def admin_reload_durumu(x_admin_token: Optional[str] = Header(None)):
+    """
+    Son yeniden yüklemenin durumu (bosta, yukleniyor, tamamlandi, geri_alindi, hata) ve aktif paket
+    """
+    _yonetici_dogrula(x_admin_token)
+    p = paket
+    return {**yeniden_yukleme, 'aktif': p.ozet() if p else None,
+            'onceki': onceki_paket.ozet() if onceki_paket else None}
+
+
+@app.post("/admin/reload/geri-al", tags=["Yönetim"])
+async def admin_reload_geri_al(x_admin_token: Optional[str] = Header(None)):
+    """
+    Bir önceki model paketine geri dön (devreye alınan yeni modeller sorunluysa)
+    """
+    _yonetici_dogrula(x_admin_token)
+    if not _yukleme_kilidi.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Yeniden yükleme sürüyor")
+    try:
+        if onceki_paket is None:
+            raise HTTPException(status_code=409, detail="Geri dönülecek önceki paket yok")
+        paketi_degistir(onceki_paket)
+        print(f"↩️  Önceki modellere dönüldü (ML sürümü {paket.ml.versiyon})")
+    finally:
+        _yukleme_kilidi.release()
+    return {'durum': 'geri_donuldu', 'aktif': paket.ozet()}
+
+
 @app.get("/isitma-tipleri", tags=["Yardımcı"])
 async def get_isitma_tipleri():
     """
@@ -0,0 +1,195 @@
+"""
+Artimli Guncelleme
+Yeni ilanlari (delta CSV) ana veri dosyasina, her seyi bastan hesaplamadan ekler:
+    - islenmis kolon onbellegi: sadece yeni satirlar ayristirilir, kolonlar uc uca eklenir
+    - istatistik ozeti: yeni satirlarin (segmentli) nicelik taslaklari eskisiyle birlestirilir
+    - benzer ev indeksi: yeni kayitlar sirali dizilere yerlerine eklenir
+    - ML modeli: mevcut ormana yeni veriyle warm start agaclar eklenir
+      (--yontem buyut) ya da model tum veriyle yeniden egitilir (--yontem yeniden)
+
+Yeni veriye ait her sey hazir olana kadar ana CSV degismez; yeni model surumu
+kaydedilir ve birlesik CSV tek adimda (os.replace) yerine konur. Calisan API'ler
+eski surumle hizmet vermeye devam eder, yeniden acilan worker'lar yeni veriyi ve
+modeli bulur. Egitim sirasinda model kaydi kilitlidir.
+
+Kullanim:
+    python artimli_guncelle.py yeni_ilanlar.csv
+    python artimli_guncelle.py yeni_ilanlar.csv --yontem yeniden
+    python artimli_guncelle.py yeni_ilanlar.csv --veri sehir_file/emlakverileri.csv --ek-agac 20
+
+Delta dosyasi ana CSV ile ayni kolonlara (baslik satiri dahil) sahip olmalidir.
+"""
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from veri_isleme import (veri_yukle, veriyi_isle, dosya_hash, onbellek_dizini, onbellek_ekle,
+                         onbellek_kolonlari, VARSAYILAN_CSV, SAYISAL_KOLONLAR)
+from ml_model import EmlakMLModel, temiz_kayitlar, EK_AGAC
+from benzer_indeks import BenzerEvIndeksi, INDEKS_SURUMU
+from istatistik_taslagi import IstatistikOzeti, istatistik_ozeti, TASLAK_DOSYASI, OZET_KOLONLARI
+from model_kayit import ModelKayit
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# ML modeli guncelleme yontemleri
+YONTEMLER = ('buyut', 'yeniden')
+
+# Arka plan guncellemeleri tek tek calisir
+_ARKA_PLAN = None
+
+
+def _birlesik_csv_yaz(csv_path, delta_csv, delta, kolonlar):
+    """
+    Ana CSV + delta satirlarini gecici dosyaya yaz, (gecici yol, sha256) dondur
+    Basliklar ayniysa delta satirlari bayt bayt eklenir, degilse kolon sirasina gore yazilir.
+    """
+    with open(delta_csv, 'rb') as f:
+        baslik, _, govde = f.read().partition(b'\n')
+    if baslik.rstrip(b'\r').decode('utf-8-sig').split(',') != kolonlar:
+        govde = delta[kolonlar].to_csv(header=False, index=False).encode('utf-8')
+    
+    gecici = f"{csv_path}.{os.getpid()}.ekleniyor"
+    h = hashlib.sha256()
+    son = b'\n'
+    with open(csv_path, 'rb') as kaynak, open(gecici, 'wb') as hedef:
+        for blok in iter(lambda: kaynak.read(1 << 20), b''):
+            hedef.write(blok)
+            h.update(blok)
+            son = blok[-1:]
+        # Ana dosya satir sonuyla bitmiyorsa once satir sonu
+        for parca in ([b'\n'] if son != b'\n' else []) + [govde]:
+            hedef.write(parca)
+            h.update(parca)
+    return gecici, h.hexdigest()
+
+
+def _eski_indeks(csv_path, eski_dizin):
+    """Eski verinin benzer ev indeksi (kayitli degilse bir kez kurulur)"""
+    indeks_dizini = os.path.join(eski_dizin, f'benzer-v{INDEKS_SURUMU}')
+    if BenzerEvIndeksi.kayitli_mi(indeks_dizini):
+        return BenzerEvIndeksi.ac(indeks_dizini)
+    return BenzerEvIndeksi(temiz_kayitlar(veri_yukle(csv_path)))
+
+
+def _eski_ozet(eski_dizin):
+    """Eski verinin istatistik ozeti (kayitli degilse kolonlardan tek geciste)"""
+    return istatistik_ozeti(eski_dizin, onbellek_kolonlari(eski_dizin, OZET_KOLONLARI))
+
+
+def artimli_guncelle(delta_csv, csv_path=VARSAYILAN_CSV, yontem='buyut', ek_agac=EK_AGAC, kayit_dizini=None):
+    """Delta satirlarini ekle, turetilmis verileri ve modeli guncelle; ozet sozluk dondur"""
+    if yontem not in YONTEMLER:
+        raise ValueError(f"Bilinmeyen yontem: {yontem} (gecerli: {', '.join(YONTEMLER)})")
+    
+    bas = time.perf_counter()
+    kayit = ModelKayit(kayit_dizini) if kayit_dizini else ModelKayit()
+    
+    # Ayni anda tek guncelleme; egitim bitene kadar diger process'ler modeli egitmez, bekler
+    with kayit.kilit():
+        eski_hash = dosya_hash(csv_path)
+        eski_dizin = onbellek_dizini(csv_path, eski_hash)
+        if not os.path.isfile(os.path.join(eski_dizin, 'meta.json')):
+            veri_yukle(csv_path)
+        
+        kolonlar = list(pd.read_csv(csv_path, nrows=0).columns)
+        delta = pd.read_csv(delta_csv)
+        eksik = [k for k in kolonlar if k not in delta.columns]
+        if eksik:
+            raise ValueError("Delta dosyasinda eksik kolonlar: " + ", ".join(eksik))
+        delta = delta[kolonlar]
+        islenmis = veriyi_isle(delta.copy())
+        print(f"Yeni satir: {len(islenmis):,}")
+        
+        gecici_csv, yeni_hash = _birlesik_csv_yaz(csv_path, delta_csv, delta, kolonlar)
+        yeni_dizin = onbellek_dizini(csv_path, yeni_hash)
+        try:
+            # Kolon onbellegi, istatistik ozeti ve benzer ev indeksi (yeni veri icin)
+            onbellek_ekle(eski_dizin, islenmis, yeni_dizin)
+            ozet = _eski_ozet(eski_dizin).birlestir(IstatistikOzeti.veriden(islenmis))
+            ozet.kaydet(os.path.join(yeni_dizin, TASLAK_DOSYASI))
+            yeni_temiz = temiz_kayitlar(islenmis)
+            _eski_indeks(csv_path, eski_dizin).ekle(yeni_temiz).kaydet(
+                os.path.join(yeni_dizin, f'benzer-v{INDEKS_SURUMU}'))
+            print("Veri onbellegi, istatistikler ve benzer ev indeksi guncellendi")
+            
+            # ML modeli: eski kayitlar yeni verinin basindadir
+            sayisal = onbellek_kolonlari(yeni_dizin, SAYISAL_KOLONLAR)
+            ml = EmlakMLModel()
+            ml.csv_path = csv_path
+            ml.df_processed = temiz_kayitlar(pd.DataFrame({k: np.asarray(v) for k, v in sayisal.items()}))
+            eski_satir = len(ml.df_processed) - len(yeni_temiz)
+            
+            artefakt = kayit.yukle(eski_hash, mmap=False) if yontem == 'buyut' else None
+            if artefakt is not None:
+                ml.model, meta = artefakt
+                ml.metrikler = meta['metrikler']
+                ml.model_buyut(eski_satir, ek_agac)
+                bilgi = {'yontem': 'buyut', 'temel_versiyon': meta['versiyon'], 'ek_agac': ek_agac}
+            else:
+                if yontem == 'buyut':
+                    print("Eski veriyle uyumlu kayitli model yok, yeniden egitiliyor")
+                ml.model_egit()
+                bilgi = {'yontem': 'yeniden'}
+            bilgi.update(yeni_satir=len(islenmis), onceki_veri_hash=eski_hash)
+            ml.versiyon = kayit.kaydet(ml.model, yeni_hash, ml.metrikler, ml.orman, {'artimli': bilgi})
+            
+            # Her sey hazir: yeni veriyi yayinla
+            os.replace(gecici_csv, csv_path)
+        except Exception:
+            if os.path.exists(gecici_csv):
+                os.remove(gecici_csv)
+            raise
+    
+    return {
+        'versiyon': ml.versiyon,
+        'veri_hash': yeni_hash,
+        'yeni_satir': len(islenmis),
+        'toplam_satir': len(sayisal['Fiyat_Numeric']),
+        'agac_sayisi': len(ml.model.estimators_),
+        'istatistikler': ozet.istatistikler(),
+        'metrikler': ml.metrikler,
+        'sure_sn': time.perf_counter() - bas,
+        **bilgi
+    }
+
+
+def arka_planda_guncelle(*args, **kwargs):
+    """artimli_guncelle'yi arka plan thread'inde calistir (Future dondurur, guncellemeler sirali)"""
+    global _ARKA_PLAN
+    if _ARKA_PLAN is None:
+        _ARKA_PLAN = ThreadPoolExecutor(max_workers=1, thread_name_prefix='artimli')
+    return _ARKA_PLAN.submit(artimli_guncelle, *args, **kwargs)
+
+
+def main():
+    """Delta dosyasini ekle ve ozeti yazdir"""
+    parser = argparse.ArgumentParser(description="Yeni ilanlari artimli olarak ekle")
+    parser.add_argument('delta', help="Yeni ilanlar (ana CSV ile ayni kolonlar)")
+    parser.add_argument('--veri', default=VARSAYILAN_CSV, help="Ana veri dosyasi")
+    parser.add_argument('--yontem', choices=YONTEMLER, default='buyut',
+                        help="buyut: warm start ek agaclar, yeniden: tum veriyle yeniden egitim")
+    parser.add_argument('--ek-agac', type=int, default=EK_AGAC, help="buyut yonteminde eklenecek agac sayisi")
+    parser.add_argument('--kayit-dizini', default=None, help="Model kayit dizini")
+    args = parser.parse_args()
+    
+    if args.ek_agac <= 0:
+        parser.error("--ek-agac pozitif olmali")
+    
+    ozet = artimli_guncelle(args.delta, args.veri, args.yontem, args.ek_agac, args.kayit_dizini)
+    
+    print(f"\nYeni model surumu: {ozet['versiyon']} ({ozet['yontem']}, {ozet['agac_sayisi']} agac)")
+    print(f"Toplam satir: {ozet['toplam_satir']:,} (+{ozet['yeni_satir']:,})")
+    print(f"Medyan fiyat: {ozet['istatistikler']['fiyat_median']:,.0f} TL")
+    print(f"Sure: {ozet['sure_sn']:.1f} sn")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
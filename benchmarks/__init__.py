@@ -0,0 +1,3 @@
+"""
+Performans olcum paketi (python -m benchmarks.calistir)
+"""
@@ -0,0 +1,325 @@
+"""
+Performans Olcumleri
+Ayristirma, istatistik, egitim, tekli/toplu tahmin (duz orman ve sklearn, aralikli), benzer ev aramasi ve
+API uctan uca /predict surelerini sentetik veri boyutlarinda olcer; sonucu
+JSON olarak yazar ve kayitli bir temel (baseline) ile karsilastirir.
+
+Kullanim (proje kokunden):
+    python -m benchmarks.calistir
+    python -m benchmarks.calistir --boyutlar 2k 100k 1m --cikti benchmarks/sonuclar.json
+    python -m benchmarks.calistir --karsilastir benchmarks/baseline.json --esik 0.25
+    python -m benchmarks.calistir --boyutlar 1m --paralel 1 2 4 8
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import contextlib
+import subprocess
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import sklearn
+import httpx
+from veri_isleme import veri_yukle, veriyi_isle, giris_matrisi, GIRISLER
+from fuzzy_model import EmlakFuzzyModel
+from ml_model import EmlakMLModel, OZELLIKLER, KUCUK_TOPLU
+from toplu_skorla import paralel_tahmin
+from benchmarks.sentetik import sentetik_csv, boyut_coz
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Varsayilan ayarlar
+VARSAYILAN_BOYUTLAR = ['2k', '100k', '1m']
+VARSAYILAN_CIKTI = 'benchmarks/sonuclar.json'
+VARSAYILAN_TEMEL = 'benchmarks/baseline.json'
+EGITIM_LIMITI = 100_000   # Daha buyuk veride RF bu kadar satirla egitilir
+TEK_CAGRI_SAYISI = 1000   # Tekli olcumlerde cagri sayisi
+
+
+@contextlib.contextmanager
+def sessiz():
+    """Model kodunun print ciktisini bastir"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def olc(fn, tekrar=3):
+    """fn'in tekrarlar icindeki medyan suresi (sn)"""
+    sureler = []
+    for _ in range(tekrar):
+        bas = time.perf_counter()
+        fn()
+        sureler.append(time.perf_counter() - bas)
+    return float(np.median(sureler))
+
+
+def toplam_sonuc(sure, satir):
+    """Tum veri uzerinde calisan olcum"""
+    return {'sn': sure, 'satir': satir, 'satir_sn': satir / sure if sure > 0 else None}
+
+
+def tekli_sonuc(sure, cagri):
+    """Tek kayit cagrilarinin ortalamasi"""
+    return {'sn': sure / cagri, 'cagri': cagri}
+
+
+def boyut_olc(boyut, tekrar, egitim_limiti):
+    """Bir veri boyutu icin tum model olcumleri"""
+    csv = sentetik_csv(boyut)
+    sonuc = {}
+    
+    # Ayristirma: ham CSV okuma + string -> sayi donusumu (onbelleksiz)
+    ham = pd.read_csv(csv)
+    n = len(ham)
+    sonuc['csv_okuma'] = toplam_sonuc(olc(lambda: pd.read_csv(csv), tekrar), n)
+    sonuc['veri_isle'] = toplam_sonuc(olc(lambda: veriyi_isle(ham.copy()), tekrar), n)
+    
+    # Onbellekten yukleme (ilk cagri onbellegi yazar)
+    df = veri_yukle(csv)
+    sonuc['veri_yukle_onbellek'] = toplam_sonuc(olc(lambda: veri_yukle(csv), tekrar), n)
+    
+    with sessiz():
+        fuzzy = EmlakFuzzyModel(df=df)
+        sonuc['hesapla_istatistikler'] = toplam_sonuc(olc(fuzzy._hesapla_istatistikler, tekrar), n)
+    
+    X = giris_matrisi(df)
+    ornek = [dict(zip(GIRISLER, map(int, satir))) for satir in X[:TEK_CAGRI_SAYISI]]
+    
+    sonuc['fuzzy_predict_tek'] = tekli_sonuc(olc(lambda: [fuzzy.predict(o) for o in ornek], tekrar), len(ornek))
+    sonuc['fuzzy_predict_toplu'] = toplam_sonuc(olc(lambda: fuzzy.predict_batch(X), tekrar), n)
+    
+    # ML: benzer ev indeksi tum veride, egitim en fazla egitim_limiti satirla
+    with sessiz():
+        ml = EmlakMLModel()
+        ml.veriyi_yukle_ve_isle(csv, df=df)
+        if len(ml.df_processed) > egitim_limiti:
+            ml.df_processed = ml.df_processed.sample(egitim_limiti, random_state=42)
+        egitim_satir = len(ml.df_processed)
+        bas = time.perf_counter()
+        ml.model_egit()
+        sonuc['model_egit'] = toplam_sonuc(time.perf_counter() - bas, egitim_satir)
+    
+    sonuc['ml_predict_tek'] = tekli_sonuc(olc(lambda: [ml.predict(o) for o in ornek[:200]], tekrar),
+                                          len(ornek[:200]))
+    
+    # Duzlestirilmis orman ve sklearn yolu: tek satir ve kucuk toplu (ayni sonuc)
+    tek_satirlar = [pd.DataFrame(X[i:i + 1], columns=OZELLIKLER) for i in range(min(200, n))]
+    sonuc['ml_predict_tek_sklearn'] = tekli_sonuc(
+        olc(lambda: [ml.model.predict(x) for x in tek_satirlar], tekrar), len(tek_satirlar))
+    kucuk = X[:KUCUK_TOPLU]
+    sonuc['ml_predict_kucuk_toplu'] = toplam_sonuc(olc(lambda: ml.orman.tahmin(kucuk), tekrar), len(kucuk))
+    sonuc['ml_predict_kucuk_toplu_sklearn'] = toplam_sonuc(
+        olc(lambda: ml.model.predict(pd.DataFrame(kucuk, columns=OZELLIKLER)), tekrar), len(kucuk))
+    sonuc['ml_predict_toplu'] = toplam_sonuc(olc(lambda: ml.predict_batch(X), tekrar), n)
+    sonuc['ml_predict_aralik_tek'] = tekli_sonuc(olc(lambda: [ml.predict_aralik(o) for o in ornek[:200]], tekrar),
+                                                 len(ornek[:200]))
+    sonuc['ml_predict_aralik_toplu'] = toplam_sonuc(olc(lambda: ml.predict_batch_aralik(X), tekrar), n)
+    sonuc['benzer_evler_bul'] = tekli_sonuc(olc(lambda: [ml.benzer_evler_bul(o) for o in ornek], tekrar),
+                                            len(ornek))
+    return sonuc
+
+
+def paralel_olc(boyut, isci_listesi):
+    """Process havuzuyla toplu tahmin: isci sayisina gore olcekleme (isci baslatma dahil)"""
+    X = giris_matrisi(veri_yukle(sentetik_csv(boyut)))
+    sonuc = {}
+    for isci in isci_listesi:
+        with sessiz():
+            bas = time.perf_counter()
+            paralel_tahmin(X, isci=isci)
+            sure = time.perf_counter() - bas
+        sonuc[f'paralel_tahmin_{isci}_isci'] = toplam_sonuc(sure, len(X))
+    return sonuc
+
+
+async def api_olc(n_istek=300, eszamanli=8, seed=0):
+    """Uctan uca /predict (in-process ASGI istemcisi, varsayilan veri)"""
+    import api_server
+    
+    with sessiz():
+        await api_server.app.router.startup()
+        # Modeller arka planda yuklenir; olcum hazir modellerle yapilir
+        if not api_server.yuklemeyi_bekle():
+            raise RuntimeError("API modelleri yuklenemedi")
+    
+    rng = np.random.default_rng(seed)
+    sinirlar = {alan: (bilgi.field_info.ge, bilgi.field_info.le)
+                for alan, bilgi in api_server.EmlakOzellikleri.__fields__.items()}
+    istekler = [{alan: int(rng.integers(alt, ust + 1)) for alan, (alt, ust) in sinirlar.items()}
+                for _ in range(n_istek)]
+    
+    sonuc = {}
+    try:
+        transport = httpx.ASGITransport(app=api_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as istemci:
+            
+            async def gonder(ozellikler):
+                bas = time.perf_counter()
+                yanit = await istemci.post('/predict', json=ozellikler)
+                yanit.raise_for_status()
+                return time.perf_counter() - bas
+            
+            # Sirali, onbellek bos (her istek farkli)
+            api_server.onbellek.temizle()
+            gecikmeler = [await gonder(o) for o in istekler]
+            sonuc['predict_sirali'] = {'sn': float(np.median(gecikmeler)),
+                                       'p99_sn': float(np.percentile(gecikmeler, 99)), 'cagri': n_istek}
+            
+            # Ayni istekler tekrar: onbellekten
+            gecikmeler = [await gonder(o) for o in istekler]
+            sonuc['predict_onbellekli'] = {'sn': float(np.median(gecikmeler)),
+                                           'p99_sn': float(np.percentile(gecikmeler, 99)), 'cagri': n_istek}
+            
+            # Eszamanli istemciler, onbellek bos
+            api_server.onbellek.temizle()
+            sira = iter(istekler)
+            
+            async def isci():
+                return [await gonder(o) for o in sira]
+            
+            bas = time.perf_counter()
+            gecikmeler = sum(await asyncio.gather(*(isci() for _ in range(eszamanli))), [])
+            sure = time.perf_counter() - bas
+            sonuc['predict_eszamanli'] = {'sn': sure / n_istek, 'istek_sn': n_istek / sure,
+                                          'p99_sn': float(np.percentile(gecikmeler, 99)),
+                                          'eszamanli': eszamanli, 'cagri': n_istek}
+    finally:
+        await api_server.app.router.shutdown()
+    
+    return sonuc
+
+
+def meta_bilgisi():
+    """Sonuclarin alindigi ortam"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'tarih': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu': os.cpu_count()
+    }
+
+
+def karsilastir(sonuclar, temel, esik):
+    """
+    Temel ile karsilastir, yavaslayan olcum sayisini dondur
+    Temel farkli cekirdek sayili makinede alindiysa uyarir (paralel ve API sureleri
+    cekirdek sayisina baglidir); temelde olmayan olcumler listelenir ama sayilmaz.
+    """
+    print(f"\n{'='*78}")
+    print(f" TEMEL ILE KARSILASTIRMA (esik: %{100 * esik:.0f})")
+    print(f"{'='*78}")
+    
+    temel_meta = temel.get('meta', {})
+    temel_cpu, cpu = temel_meta.get('cpu'), sonuclar['meta']['cpu']
+    if temel_cpu != cpu:
+        print(f"UYARI: temel {temel_cpu or '?'} cekirdekli makinede alinmis ({temel_meta.get('commit')}), "
+              f"bu makinede {cpu} cekirdek var; sureler dogrudan karsilastirilamaz.")
+    print(f"{'Olcum':<44} {'Temel':>10} {'Yeni':>10} {'Oran':>6}  Durum")
+    
+    yavaslayan = 0
+    temelsiz = 0
+    for grup, olcumler in sonuclar['sonuclar'].items():
+        for ad, deger in olcumler.items():
+            eski = temel.get('sonuclar', {}).get(grup, {}).get(ad)
+            if not eski or not eski.get('sn'):
+                temelsiz += 1
+                print(f"{grup + '/' + ad:<44} {'-':>10} {sure_yazi(deger['sn']):>10} {'-':>6}  temelde yok")
+                continue
+            
+            oran = deger['sn'] / eski['sn']
+            if oran > 1 + esik:
+                durum = "YAVASLADI"
+                yavaslayan += 1
+            elif oran < 1 / (1 + esik):
+                durum = "hizlandi"
+            else:
+                durum = "ok"
+            print(f"{grup + '/' + ad:<44} {sure_yazi(eski['sn']):>10} {sure_yazi(deger['sn']):>10} "
+                  f"{oran:>6.2f}  {durum}")
+    
+    print(f"{'='*78}")
+    if temelsiz:
+        print(f"{temelsiz} olcum temelde yok; temeli --cikti {VARSAYILAN_TEMEL} ile guncelleyin.")
+    return yavaslayan
+
+
+def sure_yazi(sn):
+    """Okunabilir sure"""
+    if sn < 1e-3:
+        return f"{sn * 1e6:.1f} us"
+    if sn < 1:
+        return f"{sn * 1e3:.1f} ms"
+    return f"{sn:.2f} s"
+
+
+def main():
+    """Olcumleri calistir, kaydet ve istenirse temel ile karsilastir"""
+    parser = argparse.ArgumentParser(description="Performans olcumleri")
+    parser.add_argument('--boyutlar', nargs='+', default=VARSAYILAN_BOYUTLAR,
+                        help="Sentetik veri boyutlari (2k, 100k, 1m veya satir sayisi)")
+    parser.add_argument('--tekrar', type=int, default=3, help="Olcum tekrari (medyan alinir)")
+    parser.add_argument('--egitim-limiti', type=int, default=EGITIM_LIMITI,
+                        help="Egitimde kullanilacak en fazla satir")
+    parser.add_argument('--api-yok', action='store_true', help="API olcumlerini atla")
+    parser.add_argument('--paralel', nargs='+', type=int, metavar='ISCI',
+                        help="Son boyutta bu isci sayilariyla paralel tahmin olcegi")
+    parser.add_argument('--cikti', default=VARSAYILAN_CIKTI, help="Sonuc JSON dosyasi")
+    parser.add_argument('--karsilastir', metavar='TEMEL_JSON', help="Temel sonuc dosyasi")
+    parser.add_argument('--esik', type=float, default=0.25, help="Yavaslama esigi (0.25 = %%25)")
+    args = parser.parse_args()
+    
+    sonuclar = {'meta': meta_bilgisi(), 'sonuclar': {}}
+    
+    for boyut in args.boyutlar:
+        print(f"Olculuyor: {boyut} ({boyut_coz(boyut):,} satir)...")
+        sonuclar['sonuclar'][boyut] = boyut_olc(boyut, args.tekrar, args.egitim_limiti)
+    
+    if args.paralel:
+        boyut = args.boyutlar[-1]
+        print(f"Olculuyor: paralel tahmin ({boyut}, isci: {args.paralel})...")
+        sonuclar['sonuclar'][f'{boyut}_paralel'] = paralel_olc(boyut, args.paralel)
+    
+    if not args.api_yok:
+        print("Olculuyor: API /predict...")
+        sonuclar['sonuclar']['api'] = asyncio.run(api_olc())
+    
+    # Ozet tablo
+    print(f"\n{'='*78}")
+    print(" SONUCLAR")
+    print(f"{'='*78}")
+    for grup, olcumler in sonuclar['sonuclar'].items():
+        for ad, deger in olcumler.items():
+            ek = f"  ({deger['satir_sn']:,.0f} satir/sn)" if deger.get('satir_sn') else ""
+            print(f"{grup + '/' + ad:<44} {sure_yazi(deger['sn']):>10}{ek}")
+    
+    with open(args.cikti, 'w', encoding='utf-8') as f:
+        json.dump(sonuclar, f, indent=2, ensure_ascii=False)
+    print(f"\nKaydedildi: {args.cikti}")
+    
+    if args.karsilastir:
+        with open(args.karsilastir, encoding='utf-8') as f:
+            temel = json.load(f)
+        if karsilastir(sonuclar, temel, args.esik):
+            return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
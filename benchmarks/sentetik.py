@@ -0,0 +1,65 @@
+"""
+Sentetik Veri
+emlakverileri.csv'yi ham (string) formatini koruyarak istenen satir
+sayisina buyutur: satirlar yerine koyarak orneklenir, metrekare ve fiyat
+hafifce oynatilir, URL/ilan no tekil yapilir.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+
+# Kaynak veri ve uretilen CSV'lerin dizini
+KAYNAK_CSV = 'sehir_file/emlakverileri.csv'
+VERI_DIZINI = 'benchmarks/veri'
+
+# Kisa boyut adlari
+BOYUTLAR = {'2k': 2_000, '100k': 100_000, '1m': 1_000_000}
+
+
+def boyut_coz(ad):
+    """'100k' / '1m' / '5000' -> satir sayisi"""
+    ad = ad.lower()
+    if ad in BOYUTLAR:
+        return BOYUTLAR[ad]
+    if ad.endswith('k'):
+        return int(float(ad[:-1]) * 1_000)
+    if ad.endswith('m'):
+        return int(float(ad[:-1]) * 1_000_000)
+    return int(ad)
+
+
+def sentetik_olustur(n, seed=42, kaynak=KAYNAK_CSV):
+    """Ham kaynak satirlardan n satirlik sentetik DataFrame"""
+    ham = pd.read_csv(kaynak)
+    rng = np.random.default_rng(seed)
+    df = ham.iloc[rng.integers(0, len(ham), n)].reset_index(drop=True)
+    
+    # Metrekareyi +-5 m2 oynat, fiyati ayni m2 fiyatiyla olcekle
+    m2 = pd.to_numeric(df['Brüt m2'].str.replace(' m2', '', regex=False), errors='coerce')
+    fiyat = pd.to_numeric(df['Fiyat'].str.replace('.', '', regex=False).str.replace(' TL', '', regex=False),
+                          errors='coerce')
+    yeni_m2 = (m2 + rng.integers(-5, 6, n)).clip(lower=20)
+    yeni_fiyat = (fiyat * yeni_m2 / m2 / 1000).round() * 1000
+    
+    gecerli = yeni_m2.notna() & yeni_fiyat.notna()
+    df.loc[gecerli, 'Brüt m2'] = [f"{int(v)} m2" for v in yeni_m2[gecerli]]
+    df.loc[gecerli, 'Fiyat'] = [f"{int(v):,} TL".replace(',', '.') for v in yeni_fiyat[gecerli]]
+    
+    ek = pd.Series(np.arange(n).astype(str))
+    df['URL'] = df['URL'] + '-s' + ek
+    df['İlan No'] = df['İlan No'] + '-s' + ek
+    return df
+
+
+def sentetik_csv(boyut, seed=42, dizin=VERI_DIZINI):
+    """Sentetik CSV'nin yolu (yoksa uretilir)"""
+    n = boyut_coz(boyut)
+    yol = os.path.join(dizin, f'sentetik_{n}.csv')
+    if not os.path.exists(yol):
+        os.makedirs(dizin, exist_ok=True)
+        gecici = yol + '.tmp'
+        sentetik_olustur(n, seed).to_csv(gecici, index=False)
+        os.replace(gecici, yol)
+    return yol
@@ -0,0 +1,204 @@
+"""
+Benzer Ev Indeksi
+(Metrekare, Oda) uzerinde onceden kurulmus arama yapisi. Her oda sayisi
+icin metrekareye gore sirali dizi tutulur; m2 penceresi ve en yakin
+komsular ikili arama ile bulunur, istek basina tam tarama yapilmaz.
+
+Indeks .npy dosyalarina kaydedilip mmap ile acilabilir; boylece ayni
+makinedeki API worker'lari tek kopyayi sayfa paylasimli kullanir.
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+# Benzer sayilacak en buyuk metrekare farki
+M2_PENCERESI = 20
+
+# Kayitli indeks bicimi degisirse artirilir
+INDEKS_SURUMU = 1
+
+# Kayitli dizinin dosyalari
+INDEKS_DIZILERI = ('m2', 'oda', 'fiyat', 'yas', 'url_veri', 'url_ofset', 'sira', 'sirali_m2',
+                   'grup_odalari', 'grup_sinirlari', 'grup_sira', 'grup_m2')
+
+
+class BenzerEvIndeksi:
+    """
+    Oda sayisina gore gruplanmis, metrekareye gore sirali indeks
+    Ayni oda sayisinda pencere icinde ev yoksa tum odalarda aranir.
+    """
+    
+    def __init__(self, df, pencere=M2_PENCERESI):
+        m2 = df['Metrekare_Numeric'].to_numpy(dtype=float)
+        oda = df['Oda_Numeric'].to_numpy()
+        
+        # URL'ler UTF-8 bayt + ofset olarak tutulur, sadece yanitta cozulur
+        baytlar = [str(u).encode('utf-8') for u in df['URL'].tolist()]
+        url_ofset = np.zeros(len(baytlar) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in baytlar], out=url_ofset[1:])
+        
+        # Tum kayitlar m2'ye gore sirali; oda gruplari bu siranin oda'ya gore
+        # kararli siralanmis hali (grup_sinirlari ile dilimlenir)
+        sira = np.argsort(m2, kind='stable')
+        grup_sira = sira[np.argsort(oda[sira], kind='stable')]
+        grup_odalari, grup_baslangic = np.unique(oda[grup_sira], return_index=True)
+        
+        self._kur(pencere, {
+            'm2': m2,
+            'oda': oda,
+            'fiyat': df['Fiyat_Numeric'].to_numpy(dtype=float),
+            'yas': df['Bina_Yasi_Numeric'].to_numpy(),
+            'url_veri': np.frombuffer(b''.join(baytlar), dtype=np.uint8),
+            'url_ofset': url_ofset,
+            'sira': sira,
+            'sirali_m2': m2[sira],
+            'grup_odalari': grup_odalari,
+            'grup_sinirlari': np.append(grup_baslangic, len(grup_sira)),
+            'grup_sira': grup_sira,
+            'grup_m2': m2[grup_sira]
+        })
+    
+    def _kur(self, pencere, diziler):
+        """Dizilerden arama yapisini kur (diziler kopyalanmaz, mmap olabilir)"""
+        self.pencere = pencere
+        self._diziler = diziler
+        self._m2 = diziler['m2']
+        self._oda = diziler['oda']
+        self._fiyat = diziler['fiyat']
+        self._yas = diziler['yas']
+        self._url_veri = diziler['url_veri']
+        self._url_ofset = diziler['url_ofset']
+        
+        # Tum kayitlar ve her oda sayisi icin (sirali m2, satir pozisyonu); dilimler kopya degil
+        self._tumu = (diziler['sirali_m2'], diziler['sira'])
+        self._odalar = {}
+        sinirlar = diziler['grup_sinirlari'].tolist()
+        for i, o in enumerate(diziler['grup_odalari'].tolist()):
+            dilim = slice(sinirlar[i], sinirlar[i + 1])
+            self._odalar[o] = (diziler['grup_m2'][dilim], diziler['grup_sira'][dilim])
+    
+    def ekle(self, df):
+        """
+        Yeni kayitlari (df) sirali dizilere ekle, yeni indeks dondur
+        Mevcut siralama korunur: yeni satirlar ikili aramayla bulunan yerlerine
+        eklenir, tum veri yeniden siralanmaz. Sonuc, eski ve yeni kayitlarin
+        birlesiminden sifirdan kurulan indeksle aynidir.
+        """
+        d = self._diziler
+        n = len(self)
+        yeni_m2 = df['Metrekare_Numeric'].to_numpy(dtype=float)
+        yeni_oda = df['Oda_Numeric'].to_numpy()
+        yeni_pozisyon = np.arange(n, n + len(df))
+        m2 = np.concatenate([d['m2'], yeni_m2])
+        oda = np.concatenate([d['oda'], yeni_oda])
+        
+        baytlar = [str(u).encode('utf-8') for u in df['URL'].tolist()]
+        url_ofset = np.zeros(len(baytlar) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in baytlar], out=url_ofset[1:])
+        
+        # Esit m2'de yeni kayitlar eskilerin sonuna gelir (kararli siralama ile ayni)
+        yeni_sira = yeni_pozisyon[np.argsort(yeni_m2, kind='stable')]
+        sira = np.insert(d['sira'], np.searchsorted(d['sirali_m2'], m2[yeni_sira], side='right'), yeni_sira)
+        
+        # Oda gruplarinda: grubun dilimi icinde ara, olmayan oda icin grubun gelecegi sinir
+        yeni_grup_sira = yeni_sira[np.argsort(oda[yeni_sira], kind='stable')]
+        sinirlar = d['grup_sinirlari']
+        yerler = np.empty(len(yeni_grup_sira), dtype=np.int64)
+        for o in np.unique(oda[yeni_grup_sira]):
+            secili = oda[yeni_grup_sira] == o
+            g = np.searchsorted(d['grup_odalari'], o)
+            if g < len(d['grup_odalari']) and d['grup_odalari'][g] == o:
+                bas, son = sinirlar[g], sinirlar[g + 1]
+                yerler[secili] = bas + np.searchsorted(d['grup_m2'][bas:son], m2[yeni_grup_sira[secili]],
+                                                       side='right')
+            else:
+                yerler[secili] = sinirlar[g]
+        grup_sira = np.insert(d['grup_sira'], yerler, yeni_grup_sira)
+        grup_odalari, grup_baslangic = np.unique(oda[grup_sira], return_index=True)
+        
+        indeks = BenzerEvIndeksi.__new__(BenzerEvIndeksi)
+        indeks._kur(self.pencere, {
+            'm2': m2,
+            'oda': oda,
+            'fiyat': np.concatenate([d['fiyat'], df['Fiyat_Numeric'].to_numpy(dtype=float)]),
+            'yas': np.concatenate([d['yas'], df['Bina_Yasi_Numeric'].to_numpy()]),
+            'url_veri': np.concatenate([d['url_veri'], np.frombuffer(b''.join(baytlar), dtype=np.uint8)]),
+            'url_ofset': np.concatenate([d['url_ofset'], url_ofset[1:] + d['url_ofset'][-1]]),
+            'sira': sira,
+            'sirali_m2': m2[sira],
+            'grup_odalari': grup_odalari,
+            'grup_sinirlari': np.append(grup_baslangic, len(grup_sira)),
+            'grup_sira': grup_sira,
+            'grup_m2': m2[grup_sira]
+        })
+        return indeks
+    
+    def kaydet(self, dizin):
+        """Indeksi .npy dosyalari olarak atomik yaz"""
+        os.makedirs(os.path.dirname(os.path.abspath(dizin)), exist_ok=True)
+        gecici = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(dizin)), prefix='.yaziliyor-')
+        try:
+            for ad in INDEKS_DIZILERI:
+                np.save(os.path.join(gecici, ad + '.npy'), np.asarray(self._diziler[ad]))
+            try:
+                os.replace(gecici, dizin)
+            except OSError:
+                # Baska bir process ayni indeksi once yazdi
+                shutil.rmtree(gecici, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(gecici, ignore_errors=True)
+            raise
+    
+    @staticmethod
+    def kayitli_mi(dizin):
+        """Dizinde tam bir kayitli indeks var mi?"""
+        return all(os.path.isfile(os.path.join(dizin, ad + '.npy')) for ad in INDEKS_DIZILERI)
+    
+    @classmethod
+    def ac(cls, dizin, pencere=M2_PENCERESI, mmap=True):
+        """Kayitli indeksi ac (mmap ile: process'ler arasinda tek kopya)"""
+        indeks = cls.__new__(cls)
+        indeks._kur(pencere, {ad: np.load(os.path.join(dizin, ad + '.npy'), mmap_mode='r' if mmap else None)
+                              for ad in INDEKS_DIZILERI})
+        return indeks
+    
+    def _url(self, i):
+        """i. kaydin URL'si (bayt dizisinden cozulur)"""
+        return bytes(self._url_veri[self._url_ofset[i]:self._url_ofset[i + 1]]).decode('utf-8')
+    
+    def __len__(self):
+        return len(self._m2)
+    
+    def _en_yakinlar(self, grup, hedef, n):
+        """Sirali grupta pencere icindeki en yakin n satirin pozisyonlari"""
+        m2_sirali, pozisyonlar = grup
+        sol = np.searchsorted(m2_sirali, hedef - self.pencere, side='left')
+        sag = np.searchsorted(m2_sirali, hedef + self.pencere, side='right')
+        orta = np.searchsorted(m2_sirali, hedef)
+        
+        # En yakin n kayit hedefin iki yanindaki n'er aday icindedir
+        aday = np.arange(max(sol, orta - n), min(sag, orta + n))
+        uzaklik = np.abs(m2_sirali[aday] - hedef)
+        return pozisyonlar[aday[np.argsort(uzaklik, kind='stable')[:n]]]
+    
+    def bul(self, metrekare, oda_sayisi, n=5):
+        """Metrekarece en yakin n ev (once ayni oda sayisinda)"""
+        secilen = []
+        grup = self._odalar.get(oda_sayisi)
+        if grup is not None:
+            secilen = self._en_yakinlar(grup, metrekare, n)
+        
+        if len(secilen) == 0:
+            # Sadece m2'ye gore ara
+            secilen = self._en_yakinlar(self._tumu, metrekare, n)
+        
+        return [{
+            'url': self._url(i),
+            'fiyat': self._fiyat[i].item(),
+            'metrekare': self._m2[i].item(),
+            'oda': self._oda[i].item(),
+            'yas': self._yas[i].item()
+        } for i in secilen]
@@ -0,0 +1,845 @@
+"""
+Model Dogrulama
+Hizli (toplu/vektorel) yollarin referans sonuclarla tutarliligini kontrol eder
+Kullanim: python dogrula.py  (hata varsa cikis kodu 1)
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+import subprocess
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from veri_isleme import veri_yukle, onbellek_dizini
+from fuzzy_model import EmlakFuzzyModel, GIRISLER, GIRIS_SINIRLARI, veri_istatistikleri
+from ml_model import EmlakMLModel, OZELLIKLER, ARALIK_NICELIKLERI, temiz_kayitlar, test_satirlari
+from kural_tabani import kural_tabani_yukle, KuralMatrisi
+from benzer_indeks import BenzerEvIndeksi, INDEKS_DIZILERI, INDEKS_SURUMU
+from agac_ormani import DuzOrman
+from istatistik_taslagi import (IstatistikOzeti, kayitli_istatistikler, GORELI_HATA, GRUP_GORELI_HATA,
+                                GRUPLAMALAR, TASLAK_DOSYASI)
+from veri_isleme import GIRIS_KOLONLARI
+from model_kayit import ModelKayit
+from artimli_guncelle import artimli_guncelle
+from is_kuyrugu import IsKuyrugu, YETIM_SURESI, kayit_parcasi_skorla
+from toplu_skorla import parca_skorla, skorla
+from tahmin_onbellegi import TahminOnbellegi
+import fuzzy_ayarla
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Goreli tolerans
+TOLERANS = 1e-9
+
+# API kontrollerinde kullanilan ornek ilan
+API_ORNEGI = {'metrekare': 120, 'oda_sayisi': 3, 'bina_yasi': 5, 'bulundugu_kat': 3,
+              'bina_kat_sayisi': 8, 'isitma_tipi': 5}
+
+# Hic kuralin atesmedigi (m2 medyani fallback'ine dusen) ilan
+FALLBACK_ORNEGI = {'metrekare': 60, 'oda_sayisi': 2, 'bina_yasi': 5, 'bulundugu_kat': 3,
+                   'bina_kat_sayisi': 5, 'isitma_tipi': 5}
+
+# Prometheus text exposition satirlari
+_METRIK_BASLIK = re.compile(r'# (HELP [a-zA-Z_:][\w:]* .*|TYPE ([a-zA-Z_:][\w:]*) (counter|gauge|histogram))')
+_METRIK_ORNEK = re.compile(r'([a-zA-Z_:][\w:]*)(\{(?:[a-zA-Z_]\w*="(?:[^"\\\n]|\\.)*",?)*\})? (\S+)')
+
+# Artimli guncellemede taslak istatistikleri ile kesin istatistikler arasi tolerans
+TASLAK_TOLERANSI = 2 * GORELI_HATA
+
+# Segment taslaklari icin tolerans
+SEGMENT_TOLERANSI = 2 * GRUP_GORELI_HATA
+
+# Analitik ve ornekli centroid farki icin tolerans (ornekli yontem kenar
+# kesisimlerini evren adimi kadar kaydirabilir)
+DURULASTIRMA_TOLERANSI = 1e-3
+
+
+def rastgele_girdiler(n=500, seed=42):
+    """Sinirlarin biraz disina da tasan rastgele tam sayi girdiler"""
+    rng = np.random.default_rng(seed)
+    kolonlar = []
+    for g in GIRISLER:
+        alt, ust = GIRIS_SINIRLARI[g]
+        kolonlar.append(rng.integers(alt - 2, ust + 3, n))
+    return np.column_stack(kolonlar)
+
+
+def fuzzy_toplu_dogrula(model, df):
+    """predict_batch sonuclari skfuzzy referansi ile ayni mi?"""
+    X = np.vstack([
+        df[['Metrekare_Numeric', 'Oda_Numeric', 'Bina_Yasi_Numeric', 'Bulundugu_Kat_Numeric',
+            'Kat_Sayisi_Numeric', 'Isitma_Numeric']].to_numpy().astype(int),
+        rastgele_girdiler()
+    ])
+    
+    toplu = model.predict_batch(X)
+    skaler = np.array([model.predict_referans(dict(zip(GIRISLER, map(int, satir)))) for satir in X], dtype=float)
+    
+    fark = np.abs(toplu - skaler) / np.abs(skaler)
+    return fark.max()
+
+
+def fuzzy_eszamanli_dogrula(model, n_thread=8):
+    """Thread'lerden ayni anda cagrilan predict, referans ile ayni mi?"""
+    girdiler = [dict(zip(GIRISLER, map(int, satir))) for satir in rastgele_girdiler(seed=7)]
+    
+    with ThreadPoolExecutor(max_workers=n_thread) as havuz:
+        eszamanli = np.array(list(havuz.map(model.predict, girdiler)), dtype=float)
+    referans = np.array([model.predict_referans(g) for g in girdiler], dtype=float)
+    
+    fark = np.abs(eszamanli - referans) / np.abs(referans)
+    return fark.max()
+
+
+def fuzzy_veya_kurali_dogrula(df, n_kural=8, seed=11):
+    """VEYA baglacli kurallar (derlenmis matris) skfuzzy referansi ile ayni mi?"""
+    tanim = kural_tabani_yukle()
+    rng = np.random.default_rng(seed)
+    for i in rng.choice(len(tanim['kurallar']), n_kural, replace=False):
+        tanim['kurallar'][i]['baglac'] = 'veya'
+    
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(tanim, f)
+    try:
+        model = EmlakFuzzyModel(df=df, kural_dosyasi=f.name, durulastirma='ornekli')
+    finally:
+        os.remove(f.name)
+    
+    X = rastgele_girdiler(seed=5)
+    toplu = model.predict_batch(X)
+    tekli = np.array([model.predict(dict(zip(GIRISLER, map(int, satir)))) for satir in X], dtype=float)
+    referans = np.array([model.predict_referans(dict(zip(GIRISLER, map(int, satir)))) for satir in X],
+                        dtype=float)
+    
+    fark = np.abs(np.concatenate([toplu, tekli]) - np.tile(referans, 2)) / np.abs(np.tile(referans, 2))
+    return fark.max()
+
+
+def seyrek_aktivasyon_dogrula(model, df, n_kural=8, seed=13):
+    """
+    Ters indeksle secilen kurallarin kesim seviyeleri ve atesleyen kural sayilari
+    tum kurallarin yogun hesabiyla ayni mi? (asil kural tabani ve VEYA'li kopyasi)
+    """
+    tanim = kural_tabani_yukle()
+    rng = np.random.default_rng(seed)
+    for i in rng.choice(len(tanim['kurallar']), n_kural, replace=False):
+        tanim['kurallar'][i]['baglac'] = 'veya'
+    veya_motoru = KuralMatrisi(tanim, GIRISLER)
+    
+    X = np.vstack([
+        df[[GIRIS_KOLONLARI[g] for g in GIRISLER]].dropna().to_numpy(dtype=float),
+        rastgele_girdiler(seed=13),
+        rng.uniform([GIRIS_SINIRLARI[g][0] - 2 for g in GIRISLER], [GIRIS_SINIRLARI[g][1] + 2 for g in GIRISLER],
+                    (2000, len(GIRISLER)))
+    ])
+    kirpik = model._toplu_kirp(X)
+    
+    fark = 0.0
+    for motor in (model.motor, veya_motoru):
+        kesimler, kural_sayisi = motor.seyrek_kesimler(kirpik)
+        atesleyen = np.count_nonzero(motor.atesleme(motor.uyelikler(kirpik)) > 0, axis=1)
+        if not np.array_equal(kural_sayisi, atesleyen):
+            return float('inf')
+        fark = max(fark, np.abs(kesimler - motor.yogun_kesimler(kirpik)).max())
+    return fark
+
+
+def fuzzy_ayar_dogrula(df, populasyon=8, nesil=3):
+    """
+    Kisa bir ayarlamanin sonucu kisitlara uyuyor mu ve kural dosyasi olarak yuklenen
+    model ayarlayicinin degerlendirdigi MAE'yi veriyor mu?
+    """
+    temiz = temiz_kayitlar(df)
+    X = temiz[OZELLIKLER].to_numpy(dtype=float)
+    y = temiz['Fiyat_Numeric'].to_numpy(dtype=float)
+    istatistikler = veri_istatistikleri(y, X[:, 0])
+    model = EmlakFuzzyModel(istatistikler=istatistikler)
+    kirpik, fallback = model._toplu_kirp(X), model._toplu_fallback(X)
+    
+    ayarli, mae, _ = fuzzy_ayarla.ayarla(kural_tabani_yukle(), kirpik, y, fallback, populasyon, nesil)
+    for degisken in list(ayarli['girisler'].values()) + [ayarli['cikti']]:
+        abc = np.array(list(degisken['terimler'].values()))
+        if (np.diff(abc, axis=1) < 0).any() or (np.diff(abc, axis=0) < 0).any() or (abc[1:, 0] > abc[:-1, 2]).any():
+            return float('inf')
+    
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(ayarli, f)
+    try:
+        yuklenen = EmlakFuzzyModel(kural_dosyasi=f.name, istatistikler=istatistikler)
+    finally:
+        os.remove(f.name)
+    return abs(np.mean(np.abs(yuklenen.predict_batch(X) - y)) - mae) / mae
+
+
+def analitik_centroid_dogrula(model, n_satir=200, n_nokta=2_000_001, seed=9):
+    """Analitik centroid, yogun sayisal integral ile ayni mi?"""
+    rng = np.random.default_rng(seed)
+    kesimler = rng.random((n_satir, len(model._toplu_cikti_mf))) * (rng.random((n_satir, 1)) < 0.9)
+    kesimler[rng.random(kesimler.shape) < 0.4] = 0
+    analitik, _ = model.motor.analitik_centroid(kesimler)
+    
+    x = np.linspace(model._toplu_evren[0], model._toplu_evren[-1], n_nokta)
+    uyelikler = [model.motor._cikti_uyelik(x, t) for t in range(len(model._toplu_cikti_mf))]
+    fark = 0.0
+    for satir, deger in zip(kesimler, analitik):
+        y = np.max([np.minimum(h, mf) for h, mf in zip(satir, uyelikler)], axis=0)
+        if y.any():
+            beklenen = np.trapezoid(y * x, x) / np.trapezoid(y, x)
+            fark = max(fark, abs(deger - beklenen) / beklenen)
+    return fark
+
+
+def durulastirma_regresyon_dogrula(model, df):
+    """Analitik centroid tahminleri ornekli (skfuzzy) tahminlerden sapmiyor mu?"""
+    X = np.vstack([df[['Metrekare_Numeric', 'Oda_Numeric', 'Bina_Yasi_Numeric', 'Bulundugu_Kat_Numeric',
+                       'Kat_Sayisi_Numeric', 'Isitma_Numeric']].to_numpy().astype(int),
+                   rastgele_girdiler(seed=13)])
+    analitik = EmlakFuzzyModel(df=df, durulastirma='analitik')
+    
+    ornekli = model.predict_batch(X)
+    fark = np.abs(analitik.predict_batch(X) - ornekli) / np.abs(ornekli)
+    return fark.max()
+
+
+def benzer_indeks_dogrula(ml_model, n_sorgu=300, n=5, seed=3):
+    """Indeks sonuclari tam tarama + siralama ile ayni mi? (farkli sorgu orani)"""
+    veri = ml_model.df_processed
+    m2 = veri['Metrekare_Numeric'].to_numpy(dtype=float)
+    oda = veri['Oda_Numeric'].to_numpy()
+    rng = np.random.default_rng(seed)
+    
+    farkli = 0
+    for _ in range(n_sorgu):
+        hedef_m2, hedef_oda = int(rng.integers(30, 361)), int(rng.integers(0, 12))
+        
+        # Referans: pencere icinde ayni oda, yoksa tum odalar; m2 farkina gore sirali
+        pencerede = np.abs(m2 - hedef_m2) <= 20
+        aday = np.flatnonzero(pencerede & (oda == hedef_oda))
+        ayni_oda = len(aday) > 0
+        if not ayni_oda:
+            aday = np.flatnonzero(pencerede)
+        beklenen = sorted(np.abs(m2[aday] - hedef_m2).tolist())[:n]
+        
+        bulunan = ml_model.benzer_evler_bul({'metrekare': hedef_m2, 'oda_sayisi': hedef_oda}, n=n)
+        if [abs(ev['metrekare'] - hedef_m2) for ev in bulunan] != beklenen or \
+                (ayni_oda and any(ev['oda'] != hedef_oda for ev in bulunan)):
+            farkli += 1
+    
+    return farkli / n_sorgu
+
+
+def benzer_indeks_kayit_dogrula(ml_model, n_sorgu=300, seed=4):
+    """Diske yazilip mmap ile acilan indeks bellektekiyle ayni sonucu veriyor mu? (farkli sorgu orani)"""
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as dizin:
+        ml_model.benzer_indeks.kaydet(os.path.join(dizin, 'benzer'))
+        acilan = BenzerEvIndeksi.ac(os.path.join(dizin, 'benzer'))
+        
+        farkli = 0
+        for _ in range(n_sorgu):
+            m2, oda = int(rng.integers(30, 361)), int(rng.integers(0, 12))
+            if acilan.bul(m2, oda) != ml_model.benzer_indeks.bul(m2, oda):
+                farkli += 1
+        del acilan
+    return farkli / n_sorgu
+
+
+def duz_orman_dogrula(ml_model, df):
+    """Duzlestirilmis orman (bellek ici ve mmap) sklearn ile birebir ayni mi?"""
+    ml_model.model_egit()
+    X = np.vstack([df[OZELLIKLER].dropna().to_numpy(dtype=float),
+                   rastgele_girdiler(seed=17),
+                   np.random.default_rng(17).uniform(-5, 400, (500, len(OZELLIKLER)))])
+    X[np.random.default_rng(18).random(X.shape) < 0.02] = np.nan
+    beklenen = ml_model.model.predict(pd.DataFrame(X, columns=OZELLIKLER))
+    
+    with tempfile.TemporaryDirectory() as dizin:
+        ml_model.orman.kaydet(os.path.join(dizin, 'orman'))
+        acilan = DuzOrman.ac(os.path.join(dizin, 'orman'))
+        tahminler = [ml_model.orman.tahmin(X), acilan.tahmin(X),
+                     np.array([ml_model.predict(dict(zip(GIRISLER, satir))) for satir in X[:200]])]
+        del acilan
+    
+    return max(np.max(np.abs(t - beklenen[:len(t)]) / np.abs(beklenen[:len(t)])) for t in tahminler)
+
+
+def orman_aralik_dogrula(ml_model, df, n_sorgu=300):
+    """
+    Orman araliklari: yaprak yontemi sklearn apply ile kurulan quantile forest
+    referansiyla, agac yontemi agac tahminlerinin nicelikleriyle ayni mi? Aralikla
+    donen tahmin duz orman tahminiyle, kaydedilip acilan orman bellek icindekiyle ayni mi?
+    """
+    from sklearn.model_selection import train_test_split
+    ml_model.model_egit()
+    orman = ml_model.orman
+    X_train, _, y_train, _ = train_test_split(ml_model.df_processed[OZELLIKLER], ml_model.df_processed['Fiyat_Numeric'],
+                                              test_size=0.2, random_state=42)
+    y_train = y_train.to_numpy()
+    X = np.vstack([df[OZELLIKLER].dropna().to_numpy(dtype=float)[:n_sorgu], rastgele_girdiler(n_sorgu, seed=19)])
+    
+    # Referans: her sorgu icin agirliklar tek tek, sirali kumulatif toplamdan nicelik
+    egitim_yapragi = ml_model.model.apply(X_train)
+    sorgu_yapragi = ml_model.model.apply(pd.DataFrame(X, columns=OZELLIKLER))
+    duzen = np.argsort(y_train, kind='stable')
+    referans = np.empty((len(ARALIK_NICELIKLERI), len(X)))
+    for i in range(len(X)):
+        agirlik = np.zeros(len(y_train))
+        for t in range(egitim_yapragi.shape[1]):
+            ayni = egitim_yapragi[:, t] == sorgu_yapragi[i, t]
+            agirlik[ayni] += 1 / ayni.sum()
+        dagilim = np.cumsum(agirlik[duzen])
+        for j, q in enumerate(ARALIK_NICELIKLERI):
+            referans[j, i] = y_train[duzen][np.count_nonzero(dagilim / dagilim[-1] < q - 1e-9)]
+    
+    tahmin, yaprak = orman.aralik(X, ARALIK_NICELIKLERI, yontem='yaprak')
+    _, agac = orman.aralik(X, ARALIK_NICELIKLERI, yontem='agac')
+    with tempfile.TemporaryDirectory() as dizin:
+        orman.kaydet(os.path.join(dizin, 'orman'))
+        acilan = DuzOrman.ac(os.path.join(dizin, 'orman'))
+        acilan_yaprak = acilan.aralik(X, ARALIK_NICELIKLERI)[1]
+        del acilan
+    
+    farklar = [(yaprak, referans), (acilan_yaprak, yaprak),
+               (agac, np.quantile(orman.agac_tahminleri(X), ARALIK_NICELIKLERI, axis=0)),
+               (tahmin, orman.tahmin(X))]
+    return max(np.max(np.abs(a - b) / np.abs(b)) for a, b in farklar)
+
+
+def is_kuyrugu_dogrula(fuzzy_model, ml_model, csv_path, n_satir=500, parca_boyutu=150):
+    """
+    Is kuyrugu: ilk parcadan sonra durdurulan (kuyruga birakilan) kayit isi ve ilk parcadan
+    sonra sahibi olmus gibi birakilan isler (dosya isi: ayni pid'le yeniden baslayan process,
+    kayit isi: olu pid) yeni kuyrukla kaldigi yerden tamamlaninca sonuclari dogrudan toplu
+    skorlamayla ayni mi? Temizlik kaydi olmayan eski dizini silip yenisini birakiyor mu?
+    """
+    X = np.vstack([temiz_kayitlar(veri_yukle(csv_path))[OZELLIKLER].to_numpy(dtype=float)[:n_satir],
+                   rastgele_girdiler(n_satir // 2, seed=23)]).astype(float)
+    sinir_disi = np.zeros(len(X), dtype=bool)
+    for j, g in enumerate(GIRISLER):
+        sinir_disi |= (X[:, j] < GIRIS_SINIRLARI[g][0]) | (X[:, j] > GIRIS_SINIRLARI[g][1])
+    X[sinir_disi] = np.nan
+    with open(csv_path, 'rb') as f:
+        ham = b'\n'.join(f.read().split(b'\n')[:n_satir + 1]) + b'\n'
+    
+    class DurduranModel:
+        """Ilk parcayi skorlarken kuyrugu durduran fuzzy model"""
+        def predict_batch(self, X):
+            kuyruk._dur.set()
+            return fuzzy_model.predict_batch(X)
+    
+    olu = subprocess.Popen([sys.executable, '-c', ''])
+    olu.wait()
+    with tempfile.TemporaryDirectory() as dizin:
+        kuyruk = IsKuyrugu(dizin, parca_boyutu)
+        dosya = kuyruk.yeni_is()
+        with open(os.path.join(kuyruk.is_dizini(dosya), 'girdi.csv'), 'wb') as f:
+            f.write(ham)
+        kuyruk.dosya_gonder(dosya, 'girdi.csv')
+        kayit = kuyruk.kayit_gonder(X)['is_id']
+        
+        # Dosya isi: ilk parcadan sonra isleyen process olmus, yerine ayni pid'le yenisi
+        # baslamis gibi (onceki belirtecle) 'calisiyor' kalir
+        kuyruk.isle(kuyruk.al(), DurduranModel(), ml_model)
+        with sqlite3.connect(os.path.join(dizin, 'isler.db')) as db:
+            db.execute("UPDATE isler SET durum = 'calisiyor', sahip = ? WHERE id = ?",
+                       (f"{kuyruk.makine}:{os.getpid()}:onceki", dosya))
+        # Kayit isi: ilk parcadan sonra durdurulan isci isi kuyruga birakir, sonra
+        # isi alan process olmus gibi 'calisiyor' kalir
+        kuyruk._dur.clear()
+        kuyruk.isle(kuyruk.al(), DurduranModel(), ml_model)
+        birakilan = kuyruk.durum(kayit)
+        with sqlite3.connect(os.path.join(dizin, 'isler.db')) as db:
+            db.execute("UPDATE isler SET durum = 'calisiyor', sahip = ? WHERE id = ?",
+                       (f"{kuyruk.makine}:{olu.pid}:olu", kayit))
+        
+        yeni = IsKuyrugu(dizin, parca_boyutu)
+        kurtarilan = yeni.sahipsizleri_kurtar()
+        kurtarilan_durum = yeni.durum(dosya)
+        while (satir := yeni.al()) is not None:
+            yeni.isle(satir, fuzzy_model, ml_model)
+        durumlar = [yeni.durum(i)['durum'] for i in (kayit, dosya)]
+        sonuclar = []
+        for is_id in (kayit, dosya):
+            with open(yeni.sonuc_yolu(is_id), encoding='utf-8') as f:
+                sonuclar.append(f.read())
+        
+        # Gonderimi yarida kalmis (kaydi olmayan) dizinler: eskisi silinir, yenisi kalir
+        eski_yetim, yeni_yetim = yeni.yeni_is(), yeni.yeni_is()
+        eski_zaman = time.time() - 2 * YETIM_SURESI
+        with open(os.path.join(yeni.is_dizini(eski_yetim), 'girdi.csv'), 'wb') as f:
+            f.write(ham)
+        for yol in (os.path.join(yeni.is_dizini(eski_yetim), 'girdi.csv'), yeni.is_dizini(eski_yetim)):
+            os.utime(yol, (eski_zaman, eski_zaman))
+        silinen = yeni.temizle()
+        kalan = [os.path.isdir(yeni.is_dizini(i)) for i in (eski_yetim, yeni_yetim, kayit, dosya)]
+    
+    referanslar = [kayit_parcasi_skorla(X, fuzzy_model, ml_model).to_csv(index=False),
+                   parca_skorla(pd.read_csv(io.BytesIO(ham)), fuzzy_model, ml_model).to_csv(index=False)]
+    ayni = [a == b for a, b in zip(sonuclar, referanslar)]
+    if not (birakilan['durum'] == 'bekliyor' and birakilan['islenen_satir'] == parca_boyutu and
+            kurtarilan == 2 and kurtarilan_durum['durum'] == 'bekliyor' and
+            kurtarilan_durum['islenen_satir'] == parca_boyutu and durumlar == ['tamamlandi'] * 2 and all(ayni)
+            and silinen == 1 and kalan == [False, True, True, True]):
+        print(f"  birakilan: {birakilan['durum']}/{birakilan['islenen_satir']}, kurtarilan: {kurtarilan}, "
+              f"durumlar: {durumlar}, ayni sonuc: {ayni}, temizlik: {silinen} silindi, kalan dizinler: {kalan}")
+        return float('inf')
+    return 0.0
+
+
+# Bozulan ham alanlar: satir -> (kolon, deger, okunamayan giris); bos deger CSV'de eksik hucre olur
+BOZUK_SATIRLAR = {10: ('Oda Sayısı', '', 'oda_sayisi'), 260: ('Oda Sayısı', 'Stüdyo', 'oda_sayisi'),
+                  400: ('Kat Sayısı', '', 'bina_kat_sayisi'), 510: ('Brüt m2', 'belirtilmemiş', 'metrekare')}
+
+
+def _bozuk_csv(csv_path, yol, n_satir):
+    """csv_path'in ilk n_satir kaydindan BOZUK_SATIRLAR bozulmus CSV yaz, (bozuk, temiz) ham veriyi dondur"""
+    temiz = pd.read_csv(csv_path, nrows=n_satir, dtype=str)
+    bozuk = temiz.copy()
+    for satir, (kolon, deger, _) in BOZUK_SATIRLAR.items():
+        bozuk.loc[satir, kolon] = deger
+    bozuk.to_csv(yol, index=False)
+    return bozuk, temiz
+
+
+def bozuk_satir_dogrula(fuzzy_model, ml_model, csv_path, n_satir=600, parca_boyutu=250):
+    """
+    Toplu skorlama: girisi bos veya okunamayan satirlar (bos oda/kat sayisi, "Stüdyo", metin
+    metrekare) parcayi durdurmadan NaN tahmin aliyor, diger satirlar temiz dosyayla ayni mi?
+    """
+    with tempfile.TemporaryDirectory() as dizin:
+        girdi, cikti = os.path.join(dizin, 'girdi.csv'), os.path.join(dizin, 'cikti.csv')
+        _, temiz = _bozuk_csv(csv_path, girdi, n_satir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            satir, _ = skorla(girdi, cikti, fuzzy_model, ml_model, parca_boyutu)
+        sonuc = pd.read_csv(cikti)
+    
+    referans = parca_skorla(temiz, fuzzy_model, ml_model)
+    bozuk = np.isin(np.arange(n_satir), list(BOZUK_SATIRLAR))
+    tahminler = ['fuzzy_tahmin', 'ml_tahmin', 'ortalama_tahmin']
+    if not (satir == n_satir and len(sonuc) == n_satir and sonuc.loc[bozuk, tahminler].isna().all().all()
+            and sonuc.loc[~bozuk, tahminler].notna().all().all()):
+        print(f"  satir: {satir}, bozuk satir tahminleri: {sonuc.loc[bozuk, tahminler].to_numpy().tolist()}")
+        return float('inf')
+    
+    gelen, beklenen = sonuc.loc[~bozuk, tahminler].to_numpy(), referans.loc[~bozuk, tahminler].to_numpy()
+    return float((np.abs(gelen - beklenen) / np.abs(beklenen)).max())
+
+
+@contextlib.contextmanager
+def _api_istemcisi():
+    """
+    Modelleri yuklenmis API test istemcisi (is kuyrugu gecici dizinde ve iscisiz, yonetim
+    acik, tahmin onbellegi bos)
+    """
+    from fastapi.testclient import TestClient
+    import api_server
+    
+    with tempfile.TemporaryDirectory() as dizin:
+        ayarlar = {'IS_DIZINI': dizin, 'IS_ISCI_SAYISI': 0, 'ADMIN_TOKEN': 'dogrula',
+                   'onbellek': TahminOnbellegi()}
+        onceki = {ad: getattr(api_server, ad) for ad in ayarlar}
+        for ad, deger in ayarlar.items():
+            setattr(api_server, ad, deger)
+        try:
+            with TestClient(api_server.app) as istemci:
+                api_server.yuklemeyi_bekle()
+                yield api_server, istemci
+        finally:
+            for ad, deger in onceki.items():
+                setattr(api_server, ad, deger)
+
+
+def yeniden_yukleme_dogrula():
+    """
+    Yeniden yukleme kapisi: ayni veriyle yeni paket iki paketin ayni ornekteki MAPE'leri
+    esit olarak kabul ediliyor, ML tahminleri bozuk paket reddedilip eski paket hizmette
+    kaliyor mu? Ornegin secildigi test bolmesi train_test_split ile ayni mi?
+    """
+    from sklearn.model_selection import train_test_split
+    
+    class BozukML:
+        """Tahminleri %60 yuksek ML modeli"""
+        def __init__(self, ml):
+            self.ml = ml
+        
+        def __getattr__(self, ad):
+            return getattr(self.ml, ad)
+        
+        def predict_batch(self, X):
+            return self.ml.predict_batch(X) * 1.6
+    
+    def yeniden_yukle(istemci):
+        basliklar = {'X-Admin-Token': 'dogrula'}
+        istemci.post('/admin/reload', headers=basliklar)
+        while (durum := istemci.get('/admin/reload', headers=basliklar).json())['durum'] == 'yukleniyor':
+            time.sleep(0.05)
+        return durum
+    
+    with _api_istemcisi() as (api, istemci):
+        ayni = yeniden_yukle(istemci)
+        ayni_paket = api.paket
+        gercek_yukle = api.paket_yukle
+        api.paket_yukle = lambda *a, **k: (lambda p: p.ile(ml=BozukML(p.ml)))(gercek_yukle(*a, **k))
+        try:
+            bozuk = yeniden_yukle(istemci)
+        finally:
+            api.paket_yukle = gercek_yukle
+        bozuk_reddedildi = (bozuk['durum'] == 'geri_alindi' and api.paket is ayni_paket and
+                            any(s.startswith('ml_mape') for s in bozuk['sorunlar']))
+    
+    bolme_ayni = all(
+        np.array_equal(test_satirlari(bolme), np.sort(np.concatenate(
+            [train_test_split(np.arange(bas, son), test_size=0.2, random_state=42)[1] for bas, son in bolme])))
+        for bolme in ([[0, 2023]], [[0, 1618], [1618, 2023]]))
+    ayni_kabul = (ayni['durum'] == 'tamamlandi' and
+                  ayni['metrikler']['eski']['ml_mape'] == ayni['metrikler']['yeni']['ml_mape'])
+    if not (ayni_kabul and bozuk_reddedildi and bolme_ayni):
+        print(f"  ayni veri: {ayni['durum']}, bozuk paket: {bozuk['durum']} {bozuk.get('sorunlar')}, "
+              f"bolme: {bolme_ayni}")
+        return float('inf')
+    return 0.0
+
+
+def is_dosyasi_bozuk_satir_dogrula(csv_path, n_satir=600, parca_boyutu=250):
+    """
+    /isler/dosya: okunamayan satirli CSV isi hata vermeden tamamlaniyor, bu satirlar bos
+    tahminle donup durumda satir hatasi olarak raporlaniyor, diger satirlar dogrudan
+    skorlamayla ayni mi?
+    """
+    with _api_istemcisi() as (api, istemci), tempfile.TemporaryDirectory() as dizin:
+        yol = os.path.join(dizin, 'girdi.csv')
+        _, temiz = _bozuk_csv(csv_path, yol, n_satir)
+        api.is_kuyrugu.parca_boyutu = parca_boyutu
+        with open(yol, 'rb') as f:
+            is_id = istemci.post('/isler/dosya?bicim=csv', content=f.read()).json()['is_id']
+        with contextlib.redirect_stdout(io.StringIO()):
+            api.is_kuyrugu.isle(api.is_kuyrugu.al(), api.paket.fuzzy, api.paket.ml)
+        durum = istemci.get(f'/isler/{is_id}').json()
+        yanit = istemci.get(f'/isler/{is_id}/sonuc')
+        referans = parca_skorla(temiz, api.paket.fuzzy, api.paket.ml)
+    
+    hatalar = {h['indeks']: h['alan'] for h in durum['hatalar']}
+    beklenen_hatalar = {satir: giris for satir, (_, _, giris) in BOZUK_SATIRLAR.items()}
+    if not (durum['durum'] == 'tamamlandi' and durum['islenen_satir'] == n_satir and
+            durum['hatali'] == len(BOZUK_SATIRLAR) and hatalar == beklenen_hatalar):
+        print(f"  durum: {durum['durum']} ({durum['hata']}), hatalar: {durum['hatali']} {hatalar}")
+        return float('inf')
+    
+    sonuc = pd.read_csv(io.StringIO(yanit.text))
+    bozuk = np.isin(np.arange(n_satir), list(BOZUK_SATIRLAR))
+    tahminler = ['fuzzy_tahmin', 'ml_tahmin', 'ortalama_tahmin']
+    if not (len(sonuc) == n_satir and sonuc.loc[bozuk, tahminler].isna().all().all()):
+        print(f"  sonuc satiri: {len(sonuc)}, bozuk satir tahminleri: {sonuc.loc[bozuk, tahminler].to_numpy().tolist()}")
+        return float('inf')
+    gelen, beklenen = sonuc.loc[~bozuk, tahminler].to_numpy(), referans.loc[~bozuk, tahminler].to_numpy()
+    return float((np.abs(gelen - beklenen) / np.abs(beklenen)).max())
+
+
+def onbellek_dogrula():
+    """
+    Tahmin onbellegi: LRU en uzun suredir kullanilmayani atiyor, suresi dolan kayit iska
+    sayiliyor mu? API'de paket degisince ayni istek eski paketin onbellekteki sonucu yerine
+    yeni paketten mi hesaplaniyor? Paket degisirken suren istegin eski paketle hesapladigi
+    sonuc yeni pakete sizmiyor mu?
+    """
+    class KaymisML:
+        """Tahminleri ve araligi %60 yuksek, surumu ayni ML modeli (onbellek anahtari degismez)"""
+        def __init__(self, ml):
+            self.ml = ml
+        
+        def __getattr__(self, ad):
+            return getattr(self.ml, ad)
+        
+        def predict_aralik(self, ozellikler):
+            return tuple(d * 1.6 for d in self.ml.predict_aralik(ozellikler))
+    
+    lru = TahminOnbellegi(boyut=2)
+    lru.koy('a', 1)
+    lru.koy('b', 2)
+    lru.al('a')
+    lru.koy('c', 3)
+    lru_dogru = [lru.al(k) for k in 'abc'] == [1, None, 3] and lru.tahliye == 1
+    
+    ttl = TahminOnbellegi(boyut=2, ttl=0.05)
+    ttl.koy('a', 1)
+    taze = ttl.al('a')
+    time.sleep(0.1)
+    ttl_dogru = (taze == 1 and ttl.al('a') is None and ttl.suresi_dolan == 1 and
+                 ttl.istatistik()['kayit_sayisi'] == 0)
+    
+    with _api_istemcisi() as (api, istemci):
+        eski = istemci.post('/predict', json=API_ORNEGI).json()
+        tekrar = istemci.post('/predict', json=API_ORNEGI).json()
+        once = istemci.get('/stats/onbellek').json()
+        api.paketi_degistir(api.paket.ile(ml=KaymisML(api.paket.ml)))
+        degisince = istemci.get('/stats/onbellek').json()
+        yeni = istemci.post('/predict', json=API_ORNEGI).json()
+        sonra = istemci.get('/stats/onbellek').json()
+        
+        # Suren istek: kaymis paketle hesaplanirken asil pakete donulur, sonuc degisimden
+        # sonra onbellege yazilir; ayni istek tekrar gelince asil paketle hesaplanmali
+        kaymis, gercek_hesapla = api.paket, api._tahmin_hesapla
+        
+        def degisimli_hesapla(p, *args):
+            sonuc = gercek_hesapla(p, *args)
+            api.paketi_degistir(kaymis.ile(ml=kaymis.ml.ml))
+            return sonuc
+        
+        suren_ornek = {**API_ORNEGI, 'metrekare': API_ORNEGI['metrekare'] + 1}
+        api._tahmin_hesapla = degisimli_hesapla
+        try:
+            suren = istemci.post('/predict', json=suren_ornek).json()
+        finally:
+            api._tahmin_hesapla = gercek_hesapla
+        suren_sonra = istemci.post('/predict', json=suren_ornek).json()
+    
+    # Ilk istek 3 parcayi (fuzzy, ml, benzer) hesaplar, tekrari onbellekten; paket degisince
+    # onbellek bosalir ve 3 parca yeni paketle yeniden hesaplanir
+    api_dogru = (tekrar == eski and once['isabet'] == 3 and once['iska'] == 3 and
+                 degisince['kayit_sayisi'] == 0 and sonra['iska'] - once['iska'] == 3 and
+                 sonra['isabet'] == once['isabet'] and yeni['fuzzy_tahmin'] == eski['fuzzy_tahmin'])
+    fark = max(abs(yeni['ml_tahmin'] / (eski['ml_tahmin'] * 1.6) - 1),
+               abs(suren['ml_tahmin'] / (suren_sonra['ml_tahmin'] * 1.6) - 1)) if api_dogru else 0.0
+    if not (lru_dogru and ttl_dogru and api_dogru):
+        print(f"  LRU: {lru_dogru}, TTL: {ttl_dogru}, sayaclar: {once} -> {degisince} -> {sonra}")
+        return float('inf')
+    return fark
+
+
+def toplu_tahmin_dogrula(n=40, seed=5):
+    """
+    /predict/batch sozlesmesi: gecerli kayitlarin sonuclari tek tek /predict ile ayni ve
+    girdi sirasinda mi, hatali kayitlar null olup gecerlilerle birlikte raporlaniyor mu?
+    Kolon dizileri kayit listesiyle ayni sonucu veriyor mu? Sinir asiminda 413, uzunlugu
+    farkli kolonlarda 422 donuyor mu?
+    """
+    alanlar = ['fuzzy_tahmin', 'ml_tahmin', 'ortalama_tahmin', 'fark', 'fark_yuzde', 'm2_basina_fiyat']
+    
+    with _api_istemcisi() as (api, istemci):
+        rng = np.random.default_rng(seed)
+        sinirlar = {g: api.EmlakOzellikleri.__fields__[g].field_info for g in GIRISLER}
+        kayitlar = [{g: int(rng.integers(sinirlar[g].ge, sinirlar[g].le + 1)) for g in GIRISLER}
+                    for _ in range(n)]
+        hatali = {3: {**kayitlar[3], 'metrekare': sinirlar['metrekare'].le + 1},
+                  7: 'kayit degil',
+                  11: {g: v for g, v in kayitlar[11].items() if g != 'oda_sayisi'}}
+        gonderilen = [hatali.get(i, k) for i, k in enumerate(kayitlar)]
+        
+        toplu = istemci.post('/predict/batch', json={'kayitlar': gonderilen}).json()
+        ters = istemci.post('/predict/batch', json={'kayitlar': gonderilen[::-1]}).json()
+        gecerli = [k for k in gonderilen if isinstance(k, dict) and k.keys() == set(GIRISLER)
+                   and k['metrekare'] <= sinirlar['metrekare'].le]
+        kolon = istemci.post('/predict/batch', json={'kolonlar': {g: [k[g] for k in gecerli]
+                                                                   for g in GIRISLER}}).json()
+        tekli = {i: istemci.post('/predict', json=k).json() for i, k in enumerate(kayitlar) if i not in hatali}
+        
+        sinir_asimi = istemci.post('/predict/batch', json={'kolonlar': {
+            g: [kayitlar[0][g]] * (api.TOPLU_MAKS_BOYUT + 1) for g in GIRISLER}}).status_code
+        uzunluk_farki = istemci.post('/predict/batch', json={'kolonlar': {
+            **{g: [kayitlar[0][g]] * 2 for g in GIRISLER}, 'oda_sayisi': [3]}}).status_code
+    
+    fark = 0.0
+    for i, t in tekli.items():
+        beklenen = [t[a] for a in alanlar] + [t['ml_aralik']['alt'], t['ml_aralik']['ust']]
+        gelen = [toplu[a][i] for a in alanlar + ['ml_alt', 'ml_ust']]
+        gelen, beklenen = np.array(gelen, dtype=float), np.array(beklenen, dtype=float)
+        fark = max(fark, (np.abs(gelen - beklenen) / np.maximum(np.abs(beklenen), 1)).max())
+    
+    hatalar_dogru = (toplu['basarili'] == n - len(hatali) and toplu['hatali'] == len(hatali) and
+                     sorted({h['indeks'] for h in toplu['hatalar']}) == sorted(hatali) and
+                     all(toplu[a][i] is None for a in alanlar for i in hatali))
+    sira_dogru = all(ters[a] == toplu[a][::-1] for a in alanlar)
+    kolon_dogru = all(kolon[a] == [v for i, v in enumerate(toplu[a]) if i not in hatali] for a in alanlar)
+    if not (hatalar_dogru and sira_dogru and kolon_dogru and sinir_asimi == 413 and uzunluk_farki == 422):
+        print(f"  hatalar: {hatalar_dogru} ({toplu['hatalar']}), sira: {sira_dogru}, kolonlar: {kolon_dogru}, "
+              f"sinir asimi: {sinir_asimi}, farkli uzunluk: {uzunluk_farki}")
+        return float('inf')
+    return fark
+
+
+def _metrikleri_oku(metin):
+    """Prometheus metin ciktisindan {ad{etiketler}: deger} ve gecersiz (ya da turu tanimsiz) satirlar"""
+    turler, degerler, gecersiz = {}, {}, []
+    for satir in metin.splitlines():
+        if (baslik := _METRIK_BASLIK.fullmatch(satir)) is not None:
+            if baslik.group(2):
+                turler[baslik.group(2)] = baslik.group(3)
+            continue
+        ornek = _METRIK_ORNEK.fullmatch(satir)
+        try:
+            ad = ornek.group(1)
+            taban = re.sub(r'_(bucket|sum|count)$', '', ad) if ad not in turler else ad
+            if taban not in turler:
+                raise ValueError
+            degerler[ad + (ornek.group(2) or '')] = float(ornek.group(3))
+        except (AttributeError, ValueError):
+            gecersiz.append(satir)
+    return degerler, gecersiz
+
+
+def metrik_dogrula():
+    """
+    /metrics: fallback'e dusen bir tahminden sonra her satir gecerli Prometheus metin formatinda,
+    her ornegin turu tanimli mi? Yeni pakette fallback sayaci artip atesleyen kural sayaci 0 mi?
+    """
+    istek_anahtari = 'emlak_istek_toplam{yol="/predict",durum="200"}'
+    with _api_istemcisi() as (api, istemci):
+        once, _ = _metrikleri_oku(istemci.get('/metrics').text)
+        tahmin = istemci.post('/predict', json=FALLBACK_ORNEGI)
+        degerler, gecersiz = _metrikleri_oku(istemci.get('/metrics').text)
+    
+    # Istek sayaclari process boyunca birikir, fuzzy sayaclari yeni paketle sifirdan baslar
+    fallback = degerler.get('emlak_fuzzy_fallback_toplam', 0)
+    atesleyen = degerler.get('emlak_fuzzy_atesleyen_kural_toplam')
+    istek = degerler.get(istek_anahtari, 0) - once.get(istek_anahtari, 0)
+    if gecersiz or tahmin.status_code != 200 or not (fallback > 0 and atesleyen == 0 and istek == 1):
+        print(f"  gecersiz satirlar: {gecersiz[:5]}, tahmin: {tahmin.status_code}, fallback: {fallback}, "
+              f"atesleyen kural: {atesleyen}, /predict istegi: {istek}")
+        return float('inf')
+    return 0.0
+
+
+def _ozetler_ayni(a, b):
+    """Iki istatistik ozetinin tum segmentleri ayni mi? (toplamlar toplama sirasi kadar farkli olabilir)"""
+    for boyutlar in GRUPLAMALAR:
+        sa, sb = a.segmentler(boyutlar), b.segmentler(boyutlar)
+        if len(sa) != len(sb) or not all(
+                x.keys() == y.keys() and np.allclose(list(x.values()), list(y.values()), rtol=TOLERANS, equal_nan=True)
+                for x, y in zip(sa, sb)):
+            return False
+    return np.allclose(list(a.istatistikler().values()), list(b.istatistikler().values()), rtol=TOLERANS)
+
+
+def segment_istatistik_dogrula(df):
+    """Istatistik ozetinin segment istatistikleri ~ pandas groupby ile kesin istatistikler"""
+    ozet = IstatistikOzeti.veriden(df)
+    fark = 0.0
+    for boyutlar in GRUPLAMALAR:
+        kolonlar = [GIRIS_KOLONLARI[b] for b in boyutlar]
+        kesin = {tuple(int(v) for v in (anahtar if isinstance(anahtar, tuple) else (anahtar,))):
+                 veri_istatistikleri(grup['Fiyat_Numeric'], grup['Metrekare_Numeric'])
+                 for anahtar, grup in df.dropna(subset=kolonlar).groupby(kolonlar)}
+        segmentler = ozet.segmentler(boyutlar)
+        if sorted(kesin) != [tuple(s[b] for b in boyutlar) for s in segmentler]:
+            return float('inf')
+        for s in segmentler:
+            beklenen = kesin[tuple(s[b] for b in boyutlar)]
+            fark = max(fark, max(abs(s[k] - beklenen[k]) / abs(beklenen[k]) for k in beklenen
+                                 if beklenen[k] and not np.isnan(beklenen[k])))
+    return fark
+
+
+def artimli_guncelleme_dogrula(csv_path, n_delta=300, ek_agac=5):
+    """
+    Veri sonundaki n_delta satir artimli eklenince CSV, kolon onbellegi, benzer ev indeksi,
+    istatistik ozeti ve yeni model surumu sifirdan kurulumla ayni mi? (taslak istatistiklerinin
+    kesin istatistiklere goreli farki)
+    """
+    with open(csv_path, 'rb') as f:
+        icerik = f.read()
+    satirlar = icerik.split(b'\n')
+    
+    with tempfile.TemporaryDirectory() as dizin:
+        veri, delta, kayit_dizini = (os.path.join(dizin, ad) for ad in ('veri.csv', 'delta.csv', 'modeller'))
+        with open(veri, 'wb') as f:
+            f.write(b'\n'.join(satirlar[:-n_delta]))
+        with open(delta, 'wb') as f:
+            f.write(b'\n'.join(satirlar[:1] + satirlar[-n_delta:]))
+        
+        temel = EmlakMLModel()
+        temel.veriyi_yukle_ve_isle(veri)
+        temel.model_yukle_veya_egit(kayit_dizini)
+        ozet = artimli_guncelle(delta, veri, 'buyut', ek_agac, kayit_dizini)
+        
+        with open(veri, 'rb') as f:
+            ayni_csv = f.read() == icerik
+        tam, artimli = veri_yukle(veri, onbellek=False), veri_yukle(veri)
+        ayni_onbellek = list(tam.columns) == list(artimli.columns) and all(
+            np.array_equal(tam[k].to_numpy(), artimli[k].to_numpy()) if tam[k].dtype.kind in 'if'
+            else tam[k].tolist() == artimli[k].tolist() for k in tam.columns)
+        indeks = BenzerEvIndeksi.ac(os.path.join(onbellek_dizini(veri), f'benzer-v{INDEKS_SURUMU}'))
+        sifirdan = BenzerEvIndeksi(temiz_kayitlar(tam))
+        ayni_indeks = all(np.array_equal(indeks._diziler[ad], sifirdan._diziler[ad]) for ad in INDEKS_DIZILERI)
+        
+        kayit = ModelKayit(kayit_dizini)
+        artefakt = kayit.yukle(ozet['veri_hash'])
+        ayni_model = (artefakt is not None and artefakt[1]['versiyon'] == ozet['versiyon'] and
+                      len(artefakt[0].estimators_) == len(temel.model.estimators_) + ek_agac and
+                      kayit.yukle(kayit.veri_hash(veri)) is not None)
+        
+        kesin = veri_istatistikleri(tam['Fiyat_Numeric'], tam['Metrekare_Numeric'])
+        taslak = kayitli_istatistikler(onbellek_dizini(veri))
+        ayni_ozet = _ozetler_ayni(IstatistikOzeti.yukle(os.path.join(onbellek_dizini(veri), TASLAK_DOSYASI)),
+                                  IstatistikOzeti.veriden(tam))
+        del indeks, artefakt
+    
+    if not (ayni_csv and ayni_onbellek and ayni_indeks and ayni_model and ayni_ozet):
+        print(f"  csv: {ayni_csv}, onbellek: {ayni_onbellek}, indeks: {ayni_indeks}, model: {ayni_model}, "
+              f"ozet: {ayni_ozet}")
+        return float('inf')
+    return max(abs(taslak[k] - kesin[k]) / abs(kesin[k]) for k in kesin)
+
+
+def main():
+    """Tum dogrulamalari calistir"""
+    print("\n" + "="*60)
+    print(" MODEL DOGRULAMA")
+    print("="*60)
+    
+    df = veri_yukle('sehir_file/emlakverileri.csv')
+    fuzzy_model = EmlakFuzzyModel(df=df, durulastirma='ornekli')
+    ml_model = EmlakMLModel()
+    ml_model.veriyi_yukle_ve_isle(df=df)
+    
+    kontroller = [
+        ("Fuzzy toplu tahmin == skfuzzy referansi", lambda: fuzzy_toplu_dogrula(fuzzy_model, df)),
+        ("Fuzzy eszamanli tek tahmin == skfuzzy referansi", lambda: fuzzy_eszamanli_dogrula(fuzzy_model)),
+        ("Fuzzy VEYA kurallari == skfuzzy referansi", lambda: fuzzy_veya_kurali_dogrula(df)),
+        ("Seyrek kural aktivasyonu == yogun atesleme", lambda: seyrek_aktivasyon_dogrula(fuzzy_model, df), 0.0),
+        ("Analitik centroid == yogun sayisal integral", lambda: analitik_centroid_dogrula(fuzzy_model)),
+        ("Analitik centroid ~ ornekli centroid", lambda: durulastirma_regresyon_dogrula(fuzzy_model, df),
+         DURULASTIRMA_TOLERANSI),
+        ("Ayarli fuzzy kural dosyasi == ayarlayici degerlendirmesi", lambda: fuzzy_ayar_dogrula(df)),
+        ("Benzer ev indeksi == tam tarama", lambda: benzer_indeks_dogrula(ml_model)),
+        ("Benzer ev indeksi (mmap) == bellek ici", lambda: benzer_indeks_kayit_dogrula(ml_model)),
+        ("Duz orman tahmini == sklearn RandomForest", lambda: duz_orman_dogrula(ml_model, df), 0.0),
+        ("Orman tahmin araliklari == quantile forest referansi", lambda: orman_aralik_dogrula(ml_model, df), 0.0),
+        ("Is kuyrugu sonucu == dogrudan toplu skorlama (durdurma ve kurtarma dahil)",
+         lambda: is_kuyrugu_dogrula(fuzzy_model, ml_model, 'sehir_file/emlakverileri.csv'), 0.0),
+        ("Toplu skorlama: okunamayan satir NaN, digerleri ayni",
+         lambda: bozuk_satir_dogrula(fuzzy_model, ml_model, 'sehir_file/emlakverileri.csv')),
+        ("Segment istatistik ozeti ~ pandas groupby", lambda: segment_istatistik_dogrula(df),
+         SEGMENT_TOLERANSI),
+        ("Yeniden yukleme: ayni veri kabul, bozuk ML paketi geri alinir", yeniden_yukleme_dogrula, 0.0),
+        ("Is kuyrugu: okunamayan satirli dosya isi tamamlanir, satir hatasi raporlanir",
+         lambda: is_dosyasi_bozuk_satir_dogrula('sehir_file/emlakverileri.csv')),
+        ("Tahmin onbellegi: LRU, TTL ve paket degisiminde bosalma", onbellek_dogrula, 1e-6),
+        ("/predict/batch == tekli /predict (sira, kalem hatalari, 413/422)", toplu_tahmin_dogrula),
+        ("/metrics formati ve fuzzy fallback sayaclari", metrik_dogrula, 0.0),
+        ("Artimli guncelleme == sifirdan kurulum (taslak istatistikleri)",
+         lambda: artimli_guncelleme_dogrula('sehir_file/emlakverileri.csv'), TASLAK_TOLERANSI),
+    ]
+    
+    hatali = 0
+    print()
+    for ad, kontrol, *tolerans in kontroller:
+        fark = kontrol()
+        durum = "OK" if fark <= (tolerans[0] if tolerans else TOLERANS) else "HATA"
+        if durum == "HATA":
+            hatali += 1
+        print(f"[{durum}] {ad} (maks goreli fark: {fark:.2e})")
+    
+    print(f"\n{len(kontroller) - hatali}/{len(kontroller)} kontrol basarili\n")
+    return 1 if hatali else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Fuzzy Uyelik Fonksiyonu Ayarlama
+Kural tabanindaki ucgen kirilma noktalarini (giris ve cikti terimleri) veriye
+gore ayarlar. Amac fonksiyonu egitim kisminda MAE'dir; her aday toplu numpy
+motoruyla (KuralMatrisi + analitik centroid, hic kural atesmezse m2 fallback'i)
+tum satirlarda birlikte degerlendirilir.
+
+Arama diferansiyel evrimdir (populasyon tabanli): her nesilde deneme adaylari
+isci process'lere bolunerek degerlendirilir. Baslangic populasyonu elle yazilmis
+kural tabani ve veri nicelikleriyle kurulan bolmelendirme etrafindadir.
+
+Her aday degerlendirilmeden once kisitlara cekilir:
+    - noktalar evren icinde, her terimde a <= b <= c
+    - terimler kural tabanindaki sirayi korur (a, b ve c ayri ayri artmayan
+      olmaz; ornegin cikti terimleri cok_dusuk -> cok_yuksek fiyatca artar)
+    - komsu terimler ortusur (sonrakinin a'si oncekinin c'sinden buyuk olmaz),
+      evrende bosluk kalmaz
+    - evren sinirindaki noktalar (omuzlar) sabittir
+
+Sonuc kural dosyasiyla ayni bicimde yazilir, ayar bilgisi 'ayar' alanindadir:
+    EmlakFuzzyModel(kural_dosyasi='sehir_file/fuzzy_kurallar_ayarli.json')
+    FUZZY_KURALLAR=sehir_file/fuzzy_kurallar_ayarli.json python api_server.py
+
+Kullanim:
+    python fuzzy_ayarla.py
+    python fuzzy_ayarla.py --nesil 100 --populasyon 48 --isci 0
+"""
+
+import io
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from kural_tabani import kural_tabani_yukle, kural_tabani_dogrula, KuralMatrisi, KURAL_DOSYASI
+from fuzzy_model import EmlakFuzzyModel, veri_istatistikleri
+from model_ayarla import egitim_verisi
+from veri_isleme import dosya_hash, GIRISLER, VARSAYILAN_CSV
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Varsayilan cikti (kural dosyasi bicimi)
+AYARLI_KURAL_DOSYASI = 'sehir_file/fuzzy_kurallar_ayarli.json'
+
+# Diferansiyel evrim parametreleri
+POPULASYON = 32
+NESIL = 200
+F = 0.6     # Fark vektoru olcegi
+CR = 0.9    # Caprazlama olasiligi
+
+# Kirilma noktalari bu adima yuvarlanir (giris birimleri / TL)
+GIRIS_ADIMI = 0.1
+CIKTI_ADIMI = 10_000
+
+# Dogrulama (ayarlamada kullanilmayan) kismin orani
+DOGRULAMA_ORANI = 0.2
+
+# Isci process durumu (_isci_baslat doldurur)
+_ISCI = {}
+
+
+class KirilmaNoktalari:
+    """
+    Kural tabanindaki tum ucgenlerin tek vektor gorunumu
+    Vektor: once girisler (GIRISLER sirasinda), sonra cikti; her degisken
+    (terim, 3) blok. Kisitlar bloklar uzerinde vektorel uygulanir.
+    """
+    
+    def __init__(self, tanim):
+        self.temel_tanim = tanim
+        self.bloklar = []
+        parcalar, alt, ust = [], [], []
+        degiskenler = [(('girisler', g), tanim['girisler'][g]) for g in GIRISLER] + [(('cikti',), tanim['cikti'])]
+        bas = 0
+        for yol, degisken in degiskenler:
+            abc = np.array(list(degisken['terimler'].values()), dtype=float)
+            bas_, bit, adim = degisken['evren']
+            son_ornek = bit - adim
+            self.bloklar.append({
+                'yol': yol,
+                'terimler': list(degisken['terimler']),
+                'dilim': slice(bas, bas + abc.size),
+                'alt': float(bas_),
+                'ust': float(max(abc.max(), son_ornek)),
+                'adim': CIKTI_ADIMI if yol == ('cikti',) else GIRIS_ADIMI,
+                # Evren sinirindaki noktalar (omuzlar) sabit
+                'sabit': (abc <= bas_) | (abc >= son_ornek),
+                'temel': abc
+            })
+            parcalar.append(abc.ravel())
+            alt.append(np.full(abc.size, float(bas_)))
+            ust.append(np.full(abc.size, self.bloklar[-1]['ust']))
+            bas += abc.size
+        self.temel = np.concatenate(parcalar)
+        self.alt = np.concatenate(alt)
+        self.ust = np.concatenate(ust)
+    
+    def __len__(self):
+        return len(self.temel)
+    
+    def kisitla(self, vektorler):
+        """(P, boyut) aday vektorlerini kisitlara cek (yeni dizi)"""
+        vektorler = np.atleast_2d(np.array(vektorler, dtype=float))
+        for blok in self.bloklar:
+            B = vektorler[:, blok['dilim']].reshape(len(vektorler), -1, 3)
+            np.clip(B, blok['alt'], blok['ust'], out=B)
+            B[:, blok['sabit']] = blok['temel'][blok['sabit']]
+            B.sort(axis=2)
+            B = np.maximum.accumulate(B, axis=1)
+            B[:, 1:, 0] = np.minimum(B[:, 1:, 0], B[:, :-1, 2])
+            B = np.round(B / blok['adim']) * blok['adim']
+            vektorler[:, blok['dilim']] = B.reshape(len(vektorler), -1)
+        return vektorler
+    
+    def tanim(self, vektor):
+        """Vektordeki kirilma noktalariyla yeni kural tabani (kurallar ayni)"""
+        tanim = copy.deepcopy(self.temel_tanim)
+        for blok in self.bloklar:
+            degisken = tanim['girisler'][blok['yol'][1]] if blok['yol'][0] == 'girisler' else tanim['cikti']
+            abc = vektor[blok['dilim']].reshape(-1, 3)
+            ondalik = blok['adim'] < 1
+            for terim, noktalar in zip(blok['terimler'], abc):
+                degisken['terimler'][terim] = [round(float(v), 1) if ondalik else int(round(v)) for v in noktalar]
+        return tanim
+    
+    def nicelik_baslangici(self, X, y):
+        """
+        Verinin niceliklerinden bolmelendirme: T terimin tepeleri %5-%95 arasi esit
+        aralikli niceliklerde, her terim komsularinin tepelerine uzanir
+        """
+        vektor = self.temel.copy()
+        for j, blok in enumerate(self.bloklar):
+            deger = y if blok['yol'] == ('cikti',) else X[:, GIRISLER.index(blok['yol'][1])]
+            T = len(blok['terimler'])
+            tepe = np.quantile(np.clip(deger, blok['alt'], blok['ust']), np.linspace(0.05, 0.95, T))
+            sinir = np.concatenate([[blok['alt']], tepe, [blok['ust']]])
+            vektor[blok['dilim']] = np.column_stack([sinir[:-2], sinir[1:-1], sinir[2:]]).ravel()
+        return self.kisitla(vektor)[0]
+
+
+def degerlendir(tanim, kirpik, fallback, y):
+    """(MAE, MAPE, atesmeyen oran): EmlakFuzzyModel analitik toplu tahmininin aynisi"""
+    motor = KuralMatrisi(tanim, GIRISLER)
+    tahmin, bos = motor.analitik_centroid(motor.kesimler(kirpik))
+    tahmin[bos] = fallback[bos]
+    hata = np.abs(tahmin - y)
+    return float(hata.mean()), float(np.mean(hata / y) * 100), float(bos.mean())
+
+
+def _isci_baslat(noktalar, kirpik, fallback, y):
+    """Isci process'te kisitlar ve egitim verisi (bir kez)"""
+    _ISCI.update(noktalar=noktalar, kirpik=kirpik, fallback=fallback, y=y)
+
+
+def _isci_mae(vektorler):
+    n = _ISCI['noktalar']
+    return [degerlendir(n.tanim(v), _ISCI['kirpik'], _ISCI['fallback'], _ISCI['y'])[0] for v in vektorler]
+
+
+def _populasyon_mae(havuz, vektorler, isci):
+    """Vektorlerin MAE'leri (havuz varsa isci sayisi kadar parcaya bolunur)"""
+    if havuz is None:
+        return np.array(_isci_mae(vektorler))
+    parcalar = np.array_split(vektorler, isci)
+    return np.concatenate([np.asarray(s, dtype=float) for s in havuz.map(_isci_mae, parcalar)])
+
+
+def ayarla(tanim, kirpik, y, fallback, populasyon=POPULASYON, nesil=NESIL, isci=1, seed=0):
+    """
+    Diferansiyel evrim (rand/1/bin) ile egitim MAE'sini en kucukleyen kirilma
+    noktalari; (en iyi tanim, en iyi MAE, nesil gecmisi) dondurur
+    kirpik: sinirlara kirpilmis (N, 6) girdiler, fallback: satirlarin m2 fallback tahmini
+    """
+    rng = np.random.default_rng(seed)
+    noktalar = KirilmaNoktalari(tanim)
+    genislik = noktalar.ust - noktalar.alt
+    
+    # Baslangic: temel ve nicelik bolmelendirmesi, ikisinin etrafinda gurultulu kopyalar
+    merkezler = np.stack([noktalar.temel, noktalar.nicelik_baslangici(kirpik, y)])
+    pop = merkezler[np.arange(populasyon) % 2] + rng.normal(0, 0.05, (populasyon, len(noktalar))) * genislik
+    pop[:2] = merkezler
+    pop = noktalar.kisitla(pop)
+    
+    isci = isci or os.cpu_count() or 1
+    havuz = None
+    if isci == 1:
+        _isci_baslat(noktalar, kirpik, fallback, y)
+    else:
+        havuz = ProcessPoolExecutor(isci, initializer=_isci_baslat, initargs=(noktalar, kirpik, fallback, y))
+    
+    try:
+        bas = time.perf_counter()
+        skor = _populasyon_mae(havuz, pop, isci)
+        gecmis = [float(skor.min())]
+        print(f"Baslangic: en iyi MAE {skor.min():,.0f} TL (temel {skor[0]:,.0f}, nicelik {skor[1]:,.0f})")
+        
+        for n in range(1, nesil + 1):
+            # Her aday icin kendisinden farkli uc aday
+            r = np.array([rng.choice(np.delete(np.arange(populasyon), i), 3, replace=False)
+                          for i in range(populasyon)])
+            mutant = pop[r[:, 0]] + F * (pop[r[:, 1]] - pop[r[:, 2]])
+            capraz = rng.random(pop.shape) < CR
+            capraz[np.arange(populasyon), rng.integers(len(noktalar), size=populasyon)] = True
+            deneme = noktalar.kisitla(np.where(capraz, mutant, pop))
+            
+            deneme_skor = _populasyon_mae(havuz, deneme, isci)
+            iyi = deneme_skor <= skor
+            pop[iyi] = deneme[iyi]
+            skor[iyi] = deneme_skor[iyi]
+            gecmis.append(float(skor.min()))
+            if n % 10 == 0 or n == nesil:
+                print(f"  Nesil {n}/{nesil}: en iyi MAE {skor.min():,.0f} TL "
+                      f"({time.perf_counter() - bas:.0f} sn)", flush=True)
+    finally:
+        if havuz is not None:
+            havuz.shutdown()
+    
+    en_iyi = int(np.argmin(skor))
+    return noktalar.tanim(pop[en_iyi]), float(skor[en_iyi]), gecmis
+
+
+def bolme(n, oran=DOGRULAMA_ORANI, seed=0):
+    """Satirlari (egitim, dogrulama) indekslerine bol"""
+    sira = np.random.default_rng(seed).permutation(n)
+    k = int(round(n * oran))
+    return np.sort(sira[k:]), np.sort(sira[:k])
+
+
+def main():
+    """Kirilma noktalarini ayarla, temel ile karsilastir ve kural dosyasi olarak yaz"""
+    parser = argparse.ArgumentParser(description="Fuzzy uyelik fonksiyonlarini veriye gore ayarla")
+    parser.add_argument('--veri', default=VARSAYILAN_CSV, help="Egitim CSV'si")
+    parser.add_argument('--kurallar', default=KURAL_DOSYASI, help="Baslangic kural dosyasi")
+    parser.add_argument('--cikti', default=AYARLI_KURAL_DOSYASI, help="Ayarli kural dosyasi")
+    parser.add_argument('--populasyon', type=int, default=POPULASYON, help="Populasyon boyutu")
+    parser.add_argument('--nesil', type=int, default=NESIL, help="Nesil sayisi")
+    parser.add_argument('--isci', type=int, default=1, help="Isci process sayisi (0 = tum cekirdekler)")
+    parser.add_argument('--seed', type=int, default=0, help="Rastgelelik tohumu")
+    args = parser.parse_args()
+    
+    if args.populasyon < 4:
+        parser.error("--populasyon en az 4 olmali")
+    if args.nesil < 0 or args.isci < 0:
+        parser.error("--nesil ve --isci negatif olamaz")
+    
+    tanim = kural_tabani_yukle(args.kurallar)
+    with contextlib.redirect_stdout(io.StringIO()):
+        X, y = egitim_verisi(args.veri)
+    
+    # Hic kural atesmeyen satirlar icin modelin m2 fallback'i (veri istatistikleriyle)
+    model = EmlakFuzzyModel(kural_dosyasi=args.kurallar, istatistikler=veri_istatistikleri(y, X[:, 0]))
+    fallback = model._toplu_fallback(X)
+    kirpik = model._toplu_kirp(X)
+    egitim, dogrulama = bolme(len(y), seed=args.seed)
+    print(f"Veri: {len(y):,} satir (egitim {len(egitim):,}, dogrulama {len(dogrulama):,})")
+    
+    bas = time.perf_counter()
+    ayarli, _, gecmis = ayarla(tanim, kirpik[egitim], y[egitim], fallback[egitim], args.populasyon, args.nesil,
+                               args.isci, args.seed)
+    sure = time.perf_counter() - bas
+    kural_tabani_dogrula(ayarli)
+    
+    sonuclar = {}
+    print(f"\n{'':10} {'kume':<10} {'MAE':>12} {'MAPE':>8} {'atesmeyen':>10}")
+    for ad, t in (('temel', tanim), ('ayarli', ayarli)):
+        for kume, satirlar in (('egitim', egitim), ('dogrulama', dogrulama)):
+            mae, mape, bos = degerlendir(t, kirpik[satirlar], fallback[satirlar], y[satirlar])
+            sonuclar[f"{ad}_{kume}"] = {'mae': mae, 'mape': mape, 'atesmeyen_oran': bos}
+            print(f"{ad:10} {kume:<10} {mae:>12,.0f} {mape:>7.2f}% {bos:>9.1%}")
+    
+    ayarli['aciklama'] = tanim.get('aciklama', '') + " Kirilma noktalari fuzzy_ayarla.py ile veriye gore ayarlandi."
+    ayarli['ayar'] = {
+        'temel': os.path.basename(args.kurallar),
+        'veri_hash': dosya_hash(args.veri)[:16],
+        'amac': 'mae',
+        'populasyon': args.populasyon,
+        'nesil': args.nesil,
+        'seed': args.seed,
+        'sure_sn': round(sure, 1),
+        'sonuclar': sonuclar,
+        'gecmis': gecmis
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.cikti)), exist_ok=True)
+    gecici = f"{args.cikti}.{os.getpid()}.tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        json.dump(ayarli, f, ensure_ascii=False, indent=2)
+    os.replace(gecici, args.cikti)
+    print(f"\nAyarli kural tabani yazildi: {args.cikti} ({sure:.0f} sn)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,95 +4,108 @@ Veri: emlakverileri.csv (2043 kayit)
 """
 
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
 import pandas as pd
+import hashlib
+import operator
+import functools
+import threading
+from kural_tabani import kural_tabani_yukle, KuralMatrisi, KURAL_DOSYASI
+from veri_isleme import veri_yukle, veriyi_isle, islenmis_mi, giris_matrisi, GIRISLER
 import warnings
 warnings.filterwarnings('ignore')
 
 
+# Giris sinirlari (predict ile ayni clipping)
+GIRIS_SINIRLARI = {
+    'metrekare': (40, 350),
+    'oda_sayisi': (1, 10),
+    'bina_yasi': (0, 60),
+    'bulundugu_kat': (-1, 20),
+    'bina_kat_sayisi': (1, 25),
+    'isitma_tipi': (0, 10)
+}
+
+# Durulastirma (centroid) yontemleri: kirilma noktalarindan kesin hesap veya
+# cikti evrenini ornekleyen skfuzzy uyumlu hesap
+DURULASTIRMA_YONTEMLERI = ('analitik', 'ornekli')
+
+
+def veri_istatistikleri(fiyat, metrekare):
+    """
+    Fiyat ve metrekare dizilerinden kesin istatistikler (NaN'lar atlanir, pandas quantile ile ayni)
+    Her dizinin tum nicelikleri tek nanquantile cagrisiyla (tek siralama) hesaplanir.
+    Buyuk veri ve segment kirilimlari icin istatistik_taslagi.IstatistikOzeti kullanilir.
+    """
+    fiyat = np.asarray(fiyat, dtype=float)
+    metrekare = np.asarray(metrekare, dtype=float)
+    fiyat_per_m2 = fiyat / metrekare
+    
+    f = np.nanquantile(fiyat, [0.05, 0.25, 0.5, 0.75, 0.90, 0.95]).tolist()
+    m = np.nanquantile(metrekare, [0.05, 0.25, 0.5, 0.75, 0.95]).tolist()
+    fm = np.nanquantile(fiyat_per_m2, [0.25, 0.5, 0.75, 0.90]).tolist()
+    
+    return {
+        'fiyat_min': f[0],
+        'fiyat_p25': f[1],
+        'fiyat_median': f[2],
+        'fiyat_p75': f[3],
+        'fiyat_p90': f[4],
+        'fiyat_max': f[5],
+        'fiyat_mean': float(np.nanmean(fiyat)),
+        'metrekare_min': m[0],
+        'metrekare_p25': m[1],
+        'metrekare_median': m[2],
+        'metrekare_p75': m[3],
+        'metrekare_max': m[4],
+        'fiyat_per_m2_p25': fm[0],
+        'fiyat_per_m2_median': fm[1],
+        'fiyat_per_m2_p75': fm[2],
+        'fiyat_per_m2_p90': fm[3],
+        'veri_sayisi': len(fiyat)
+    }
+
+
 class EmlakFuzzyModel:
     """
     Fuzzy logic ile emlak fiyat tahmini
     """
     
-    def __init__(self, df=None):
+    def __init__(self, df=None, kural_dosyasi=KURAL_DOSYASI, durulastirma='analitik', istatistikler=None):
+        if durulastirma not in DURULASTIRMA_YONTEMLERI:
+            raise ValueError(f"Gecersiz durulastirma: {durulastirma} ({', '.join(DURULASTIRMA_YONTEMLERI)})")
+        
         self.df = df
-        self.istatistikler = {}
+        self.kural_dosyasi = kural_dosyasi
+        self.durulastirma = durulastirma
+        self.istatistikler = dict(istatistikler or {})
+        self.tablo = None
         
-        # Eger veri varsa isleyelim
+        # skfuzzy referans sistemi ilk predict_referans cagrisinda kurulur
+        self.simulasyon = None
+        self._simulasyon_kilidi = threading.Lock()
+        
+        # Hic kural atesmeyip m2 fallback'ine dusen tahmin sayisi ve motorun degerlendirdigi
+        # tahminlerde atesleyen toplam kural sayisi (izleme icin)
+        self.fallback_sayisi = 0
+        self.tahmin_sayisi = 0
+        self.atesleyen_kural_sayisi = 0
+        self._sayac_kilidi = threading.Lock()
+        
+        # Eger veri varsa isleyelim (istatistikler verildiyse DataFrame gerekmez)
         if df is not None:
             self._veriyi_isle()
             self._hesapla_istatistikler()
         
         # Fuzzy sistem kur
-        self._olustur_fuzzy_degiskenler()
-        self._olustur_kurallar()
-        self._olustur_kontrol_sistemi()
+        self._olustur_toplu_motor()
     
     def _veriyi_isle(self):
         """String verileri sayiya cevir"""
         print("\nVeri isleniyor...")
         
-        # Fiyat: "2.500.000 TL" -> 2500000
-        self.df['Fiyat_Numeric'] = self.df['Fiyat'].str.replace('.', '', regex=False).str.replace(' TL', '').astype(float)
-        
-        # Oda sayisi: "2 + 1" -> 3
-        self.df['Oda_Numeric'] = self.df['Oda Sayısı'].str.split('+').apply(
-            lambda x: int(x[0].strip()) + int(x[1].strip()) if len(x) == 2 else int(x[0].strip())
-        )
-        
-        # Metrekare: "80 m2" -> 80
-        self.df['Metrekare_Numeric'] = self.df['Brüt m2'].str.replace(' m2', '').astype(float)
-        
-        # Kat sayisi: "6 Katlı" -> 6
-        self.df['Kat_Sayisi_Numeric'] = self.df['Kat Sayısı'].str.replace(' Katlı', '').astype(int)
-        
-        # Bulundugu kat
-        def kat_donustur(kat_str):
-            if 'Bodrum' in kat_str or 'Bahçe' in kat_str:
-                return -1
-            elif 'Zemin' in kat_str or 'Giriş' in kat_str:
-                return 0
-            elif 'Yüksek' in kat_str:
-                return 5
-            elif 'Ara' in kat_str:
-                return 2
-            else:
-                try:
-                    return int(kat_str.split('.')[0])
-                except:
-                    return 1
-        
-        self.df['Bulundugu_Kat_Numeric'] = self.df['Bulunduğu Kat'].apply(kat_donustur)
-        
-        # Bina yasi: "11 Yaşında" -> 11
-        def yas_donustur(yas_str):
-            if 'Sıfır' in yas_str:
-                return 0
-            elif 'Yaşında' in yas_str:
-                return int(yas_str.replace(' Yaşında', ''))
-            else:
-                return 10
-        
-        self.df['Bina_Yasi_Numeric'] = self.df['Bina Yaşı'].apply(yas_donustur)
-        
-        # Isitma tipi skorlama (0-10 arasi)
-        isitma_skorlari = {
-            'Isıtma Yok': 0,
-            'Soba': 1,
-            'Doğalgaz Sobası': 2,
-            'Kat Kaloriferi': 4,
-            'Kombi': 5,
-            'Merkezi': 6,
-            'Merkezi (Pay Öl...': 6,
-            'Klima': 8,
-            'Yerden Isıtma': 9,
-            'Güneş Enerjisi': 10,
-            'Belirtilmemiş': 5
-        }
-        
-        self.df['Isitma_Numeric'] = self.df['Isınma Tipi'].map(isitma_skorlari).fillna(5)
+        # veri_yukle ile gelen veri zaten islenmis olur
+        if not islenmis_mi(self.df):
+            veriyi_isle(self.df)
         
         print("Veri donusumu tamam. Toplam kayit:", len(self.df))
     
@@ -102,271 +115,199 @@ class EmlakFuzzyModel:
         self.df['Fiyat_Per_M2'] = self.df['Fiyat_Numeric'] / self.df['Metrekare_Numeric']
         
         # Temel istatistikler
-        self.istatistikler = {
-            'fiyat_min': self.df['Fiyat_Numeric'].quantile(0.05),
-            'fiyat_p25': self.df['Fiyat_Numeric'].quantile(0.25),
-            'fiyat_median': self.df['Fiyat_Numeric'].median(),
-            'fiyat_p75': self.df['Fiyat_Numeric'].quantile(0.75),
-            'fiyat_p90': self.df['Fiyat_Numeric'].quantile(0.90),
-            'fiyat_max': self.df['Fiyat_Numeric'].quantile(0.95),
-            'fiyat_mean': self.df['Fiyat_Numeric'].mean(),
-            'metrekare_min': self.df['Metrekare_Numeric'].quantile(0.05),
-            'metrekare_p25': self.df['Metrekare_Numeric'].quantile(0.25),
-            'metrekare_median': self.df['Metrekare_Numeric'].median(),
-            'metrekare_p75': self.df['Metrekare_Numeric'].quantile(0.75),
-            'metrekare_max': self.df['Metrekare_Numeric'].quantile(0.95),
-            'fiyat_per_m2_p25': self.df['Fiyat_Per_M2'].quantile(0.25),
-            'fiyat_per_m2_median': self.df['Fiyat_Per_M2'].median(),
-            'fiyat_per_m2_p75': self.df['Fiyat_Per_M2'].quantile(0.75),
-            'fiyat_per_m2_p90': self.df['Fiyat_Per_M2'].quantile(0.90),
-            'veri_sayisi': len(self.df)
-        }
+        self.istatistikler = veri_istatistikleri(self.df['Fiyat_Numeric'], self.df['Metrekare_Numeric'])
         
         print("\nVeri istatistikleri hesaplandi")
         print("Medyan fiyat:", f"{self.istatistikler['fiyat_median']:,.0f} TL")
         print("Medyan m2:", f"{self.istatistikler['metrekare_median']:.0f} m2")
     
-    def _olustur_fuzzy_degiskenler(self):
-        """Fuzzy degiskenler"""
-        
-        # Metrekare (40-350)
-        self.metrekare = ctrl.Antecedent(np.arange(40, 350, 1), 'metrekare')
-        self.metrekare['kucuk'] = fuzz.trimf(self.metrekare.universe, [40, 40, 90])
-        self.metrekare['orta'] = fuzz.trimf(self.metrekare.universe, [70, 110, 160])
-        self.metrekare['buyuk'] = fuzz.trimf(self.metrekare.universe, [140, 200, 350])
-        
-        # Oda sayisi (1-10)
-        self.oda_sayisi = ctrl.Antecedent(np.arange(1, 10, 1), 'oda_sayisi')
-        self.oda_sayisi['az'] = fuzz.trimf(self.oda_sayisi.universe, [1, 1, 3])
-        self.oda_sayisi['orta'] = fuzz.trimf(self.oda_sayisi.universe, [2, 3, 5])
-        self.oda_sayisi['cok'] = fuzz.trimf(self.oda_sayisi.universe, [4, 7, 10])
-        
-        # Bina yasi (0-60)
-        self.bina_yasi = ctrl.Antecedent(np.arange(0, 60, 1), 'bina_yasi')
-        self.bina_yasi['yeni'] = fuzz.trimf(self.bina_yasi.universe, [0, 0, 8])
-        self.bina_yasi['orta'] = fuzz.trimf(self.bina_yasi.universe, [5, 15, 25])
-        self.bina_yasi['eski'] = fuzz.trimf(self.bina_yasi.universe, [20, 60, 60])
-        
-        # Bulundugu kat (-1 ile 20 arasi)
-        self.bulundugu_kat = ctrl.Antecedent(np.arange(-1, 20, 1), 'bulundugu_kat')
-        self.bulundugu_kat['alt'] = fuzz.trimf(self.bulundugu_kat.universe, [-1, -1, 1])
-        self.bulundugu_kat['orta'] = fuzz.trimf(self.bulundugu_kat.universe, [1, 3, 7])
-        self.bulundugu_kat['yuksek'] = fuzz.trimf(self.bulundugu_kat.universe, [5, 12, 20])
-        
-        # Binanin kat sayisi
-        self.bina_kat_sayisi = ctrl.Antecedent(np.arange(1, 25, 1), 'bina_kat_sayisi')
-        self.bina_kat_sayisi['az_katli'] = fuzz.trimf(self.bina_kat_sayisi.universe, [1, 1, 5])
-        self.bina_kat_sayisi['orta_katli'] = fuzz.trimf(self.bina_kat_sayisi.universe, [4, 7, 12])
-        self.bina_kat_sayisi['cok_katli'] = fuzz.trimf(self.bina_kat_sayisi.universe, [10, 18, 25])
-        
-        # Isitma tipi (0-10 skor)
-        self.isitma_tipi = ctrl.Antecedent(np.arange(0, 11, 1), 'isitma_tipi')
-        self.isitma_tipi['zayif'] = fuzz.trimf(self.isitma_tipi.universe, [0, 0, 3])
-        self.isitma_tipi['orta'] = fuzz.trimf(self.isitma_tipi.universe, [2, 5, 7])
-        self.isitma_tipi['iyi'] = fuzz.trimf(self.isitma_tipi.universe, [6, 8, 11])
-        
-        # Cikti: Tahmini fiyat
-        fmin = 500000
-        fmax = 20000000
-        
-        self.tahmini_fiyat = ctrl.Consequent(np.arange(fmin, fmax, 100000), 'tahmini_fiyat')
-        
-        # fiyat segmenti
-        self.tahmini_fiyat['cok_dusuk'] = fuzz.trimf(self.tahmini_fiyat.universe, [500000, 2000000, 2800000])
-        self.tahmini_fiyat['dusuk'] = fuzz.trimf(self.tahmini_fiyat.universe, [2500000, 3200000, 4000000])
-        self.tahmini_fiyat['orta'] = fuzz.trimf(self.tahmini_fiyat.universe, [3500000, 4500000, 5500000])
-        self.tahmini_fiyat['yuksek'] = fuzz.trimf(self.tahmini_fiyat.universe, [5000000, 6500000, 8500000])
-        self.tahmini_fiyat['cok_yuksek'] = fuzz.trimf(self.tahmini_fiyat.universe, [8000000, 12000000, 20000000])
-    
-    def _olustur_kurallar(self):
-        """Fuzzy kurallari olustur"""
-        
-        self.kurallar = [
-            # Cok yuksek fiyat kurallari
-            ctrl.Rule(self.metrekare['buyuk'] & self.oda_sayisi['cok'] & 
-                     self.bina_yasi['yeni'] & self.isitma_tipi['iyi'] & 
-                     self.bulundugu_kat['yuksek'],
-                     self.tahmini_fiyat['cok_yuksek']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.oda_sayisi['cok'] & 
-                     self.bina_yasi['yeni'] & self.isitma_tipi['iyi'] & 
-                     self.bina_kat_sayisi['cok_katli'],
-                     self.tahmini_fiyat['cok_yuksek']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.oda_sayisi['cok'] & 
-                     self.bulundugu_kat['yuksek'] & self.isitma_tipi['iyi'] &
-                     self.bina_kat_sayisi['cok_katli'],
-                     self.tahmini_fiyat['cok_yuksek']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.bina_yasi['yeni'] & 
-                     self.bulundugu_kat['yuksek'] & self.isitma_tipi['iyi'] &
-                     self.bina_kat_sayisi['cok_katli'],
-                     self.tahmini_fiyat['cok_yuksek']),
-            
-            # Yuksek fiyat kurallari
-            ctrl.Rule(self.metrekare['buyuk'] & self.oda_sayisi['orta'] & 
-                     self.bina_yasi['yeni'] & self.isitma_tipi['iyi'],
-                     self.tahmini_fiyat['yuksek']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.oda_sayisi['cok'] & 
-                     self.bina_yasi['yeni'] & self.bulundugu_kat['orta'],
-                     self.tahmini_fiyat['yuksek']),
-            
-            ctrl.Rule(self.metrekare['orta'] & self.oda_sayisi['cok'] & 
-                     self.bina_yasi['yeni'] & self.bulundugu_kat['yuksek'],
-                     self.tahmini_fiyat['yuksek']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.bulundugu_kat['yuksek'] & 
-                     self.isitma_tipi['iyi'] & self.bina_kat_sayisi['cok_katli'],
-                     self.tahmini_fiyat['yuksek']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.isitma_tipi['iyi'] & 
-                     self.bina_yasi['yeni'] & self.bulundugu_kat['orta'],
-                     self.tahmini_fiyat['yuksek']),
-            
-            ctrl.Rule(self.oda_sayisi['cok'] & self.bina_yasi['yeni'] & 
-                     self.bulundugu_kat['yuksek'] & self.isitma_tipi['orta'],
-                     self.tahmini_fiyat['yuksek']),
-            
-            # Orta fiyat kurallari
-            ctrl.Rule(self.metrekare['orta'] & self.oda_sayisi['orta'] & 
-                     self.bina_yasi['yeni'] & self.isitma_tipi['orta'],
-                     self.tahmini_fiyat['orta']),
-            
-            ctrl.Rule(self.metrekare['orta'] & self.oda_sayisi['orta'] & 
-                     self.bina_yasi['orta'] & self.isitma_tipi['orta'],
-                     self.tahmini_fiyat['orta']),
-            
-            ctrl.Rule(self.metrekare['orta'] & self.oda_sayisi['cok'] & 
-                     self.bulundugu_kat['orta'] & self.isitma_tipi['orta'],
-                     self.tahmini_fiyat['orta']),
-            
-            # Buyuk metrekare ama eski - dengeli
-            ctrl.Rule(self.metrekare['buyuk'] & self.bina_yasi['eski'] & 
-                     self.bulundugu_kat['orta'] & self.isitma_tipi['orta'],
-                     self.tahmini_fiyat['orta']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.bina_yasi['eski'] & 
-                     self.bulundugu_kat['alt'] & self.isitma_tipi['orta'],
-                     self.tahmini_fiyat['orta']),
-            
-            # Kucuk ama yeni ve iyi - dengeli
-            ctrl.Rule(self.metrekare['kucuk'] & self.oda_sayisi['orta'] & 
-                     self.bina_yasi['yeni'] & self.isitma_tipi['iyi'],
-                     self.tahmini_fiyat['orta']),
-            
-            ctrl.Rule(self.metrekare['orta'] & self.bulundugu_kat['orta'] & 
-                     self.isitma_tipi['iyi'] & self.bina_yasi['orta'],
-                     self.tahmini_fiyat['orta']),
-            
-            ctrl.Rule(self.metrekare['orta'] & self.oda_sayisi['orta'] & 
-                     self.bulundugu_kat['yuksek'] & self.bina_yasi['eski'],
-                     self.tahmini_fiyat['orta']),
-            
-            ctrl.Rule(self.metrekare['buyuk'] & self.oda_sayisi['az'] & 
-                     self.bina_yasi['orta'] & self.isitma_tipi['orta'],
-                     self.tahmini_fiyat['orta']),
-            
-            # Dusuk fiyat kurallari
-            ctrl.Rule(self.metrekare['kucuk'] & self.oda_sayisi['az'] & 
-                     self.bulundugu_kat['alt'] & self.isitma_tipi['zayif'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            ctrl.Rule(self.metrekare['kucuk'] & self.bina_yasi['eski'] & 
-                     self.isitma_tipi['zayif'] & self.bulundugu_kat['alt'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            ctrl.Rule(self.metrekare['orta'] & self.oda_sayisi['az'] & 
-                     self.bina_yasi['eski'] & self.bina_kat_sayisi['az_katli'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            ctrl.Rule(self.metrekare['kucuk'] & self.bina_kat_sayisi['az_katli'] & 
-                     self.isitma_tipi['zayif'] & self.bina_yasi['eski'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            ctrl.Rule(self.isitma_tipi['zayif'] & self.bulundugu_kat['alt'] &
-                     self.bina_yasi['eski'] & self.oda_sayisi['az'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            ctrl.Rule(self.metrekare['kucuk'] & self.bulundugu_kat['alt'] &
-                     self.bina_kat_sayisi['az_katli'] & self.bina_yasi['orta'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            ctrl.Rule(self.metrekare['orta'] & self.oda_sayisi['az'] &
-                     self.isitma_tipi['zayif'] & self.bulundugu_kat['alt'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            ctrl.Rule(self.oda_sayisi['az'] & self.bina_yasi['eski'] &
-                     self.isitma_tipi['zayif'] & self.bina_kat_sayisi['az_katli'],
-                     self.tahmini_fiyat['dusuk']),
-            
-            # Cok dusuk fiyat kurallari
-            ctrl.Rule(self.metrekare['kucuk'] & self.oda_sayisi['az'] & 
-                     self.bina_yasi['eski'] & self.bulundugu_kat['alt'] &
-                     self.isitma_tipi['zayif'],
-                     self.tahmini_fiyat['cok_dusuk']),
-            
-            ctrl.Rule(self.metrekare['kucuk'] & self.bina_yasi['eski'] & 
-                     self.isitma_tipi['zayif'] & self.bina_kat_sayisi['az_katli'] &
-                     self.bulundugu_kat['alt'],
-                     self.tahmini_fiyat['cok_dusuk']),
-            
-            ctrl.Rule(self.metrekare['kucuk'] & self.oda_sayisi['az'] & 
-                     self.isitma_tipi['zayif'] & self.bulundugu_kat['alt'] &
-                     self.bina_kat_sayisi['az_katli'],
-                     self.tahmini_fiyat['cok_dusuk']),
-            
-            ctrl.Rule(self.oda_sayisi['az'] & self.bina_yasi['eski'] & 
-                     self.isitma_tipi['zayif'] & self.bulundugu_kat['alt'] &
-                     self.bina_kat_sayisi['az_katli'],
-                     self.tahmini_fiyat['cok_dusuk']),
-        ]
+    def _olustur_toplu_motor(self):
+        """Kural tabanini dosyadan okuyup matrislere derle"""
+        self.kural_tabani = kural_tabani_yukle(self.kural_dosyasi)
+        self.motor = KuralMatrisi(self.kural_tabani, GIRISLER)
+        
+        # Uyelik tablolari ve cikti terimleri (fuzzy_tablo ve centroid kullanir)
+        self._toplu_terimler = self.motor.terimler
+        self._toplu_evren = self.motor.cikti_evreni
+        self._toplu_cikti_mf = self.motor.cikti_mf
+        
+        # Tam sayi girdiler icin her eksende "bu deger hangi kurallari engellemiyor" bit maskesi
+        # (VEYA kurallari eksen eksen elenemez, o durumda hizli yol kapali)
+        self._kural_maske_tablosu = None
+        self._tum_kurallar = sum(1 << r for r, a in enumerate(self.motor.agirlik) if a > 0)
+        if self.motor.veya.any():
+            return
+        
+        self._kural_maske_tablosu = []
+        for j, g in enumerate(GIRISLER):
+            alt, ust = GIRIS_SINIRLARI[g]
+            v = np.arange(alt, ust + 1, dtype=float)
+            izinli = np.ones((len(v), len(self.motor.oncul)), dtype=bool)
+            for r, k in enumerate(self.motor.oncul[:, j]):
+                if k >= 0:
+                    _, evren, mf = self._toplu_terimler[k]
+                    izinli[:, r] = np.interp(v, evren, mf) > 0
+            self._kural_maske_tablosu.append([sum(1 << int(r) for r in np.flatnonzero(satir))
+                                              for satir in izinli])
     
-    def _olustur_kontrol_sistemi(self):
-        """Kontrol sistemi kur"""
-        self.kontrol_sistemi = ctrl.ControlSystem(self.kurallar)
+    def _olustur_referans_sistemi(self):
+        """Ayni kural tabanindan skfuzzy kontrol sistemi (sadece referans icin, ilk kullanimda)"""
+        import skfuzzy as fuzz
+        from skfuzzy import control as ctrl
+        
+        degiskenler = {}
+        for g in GIRISLER:
+            tanim = self.kural_tabani['girisler'][g]
+            degiskenler[g] = ctrl.Antecedent(np.arange(*tanim['evren']), g)
+            for ad, abc in tanim['terimler'].items():
+                degiskenler[g][ad] = fuzz.trimf(degiskenler[g].universe, abc)
+        
+        tanim = self.kural_tabani['cikti']
+        cikti = ctrl.Consequent(np.arange(*tanim['evren']), tanim['ad'])
+        for ad, abc in tanim['terimler'].items():
+            cikti[ad] = fuzz.trimf(cikti.universe, abc)
+        
+        kurallar = []
+        for kural in self.kural_tabani['kurallar']:
+            baglac = operator.or_ if kural.get('baglac', 've') == 'veya' else operator.and_
+            oncul = functools.reduce(baglac, [degiskenler[g][t] for g, t in kural['eger'].items()])
+            sonuc = cikti[kural['ise']]
+            if kural.get('agirlik', 1.0) != 1.0:
+                sonuc = sonuc % kural['agirlik']
+            kurallar.append(ctrl.Rule(oncul, sonuc))
+        
+        self.kontrol_sistemi = ctrl.ControlSystem(kurallar)
         self.simulasyon = ctrl.ControlSystemSimulation(self.kontrol_sistemi)
     
+    def motor_imzasi(self):
+        """Uyelik fonksiyonlari ve kurallardan turetilen imza (tablo uyumlulugu icin)"""
+        h = hashlib.sha1()
+        for j, evren, mf in self._toplu_terimler:
+            h.update(np.int64(j).tobytes())
+            h.update(np.ascontiguousarray(evren, dtype=float).tobytes())
+            h.update(np.ascontiguousarray(mf, dtype=float).tobytes())
+        for dizi in (self._toplu_evren, self._toplu_cikti_mf, self.motor.oncul,
+                     self.motor.veya, self.motor.sonuc, self.motor.agirlik):
+            h.update(np.ascontiguousarray(dizi).tobytes())
+        h.update(repr(sorted(GIRIS_SINIRLARI.items())).encode())
+        h.update(self.durulastirma.encode())
+        return h.hexdigest()
+    
+    def tablo_yukle(self, yol):
+        """Onceden hesaplanmis tahmin tablosunu yukle (bkz. fuzzy_tablo.py)"""
+        from fuzzy_tablo import FuzzyTablo
+        
+        tablo = FuzzyTablo.yukle(yol)
+        if tablo.imza != self.motor_imzasi():
+            print("Uyari: tahmin tablosu bu fuzzy sistemle uyumsuz, kullanilmiyor:", yol)
+            return False
+        
+        self.tablo = tablo
+        print("Tahmin tablosu yuklendi:", yol, f"({tablo.degerler.size:,} dugum)")
+        return True
+    
     def predict(self, ozellikler):
-        """Fiyat tahmini yap"""
+        """
+        Fiyat tahmini yap
+        Durumsuz numpy motoru kullanir, thread'ler arasinda paylasilabilir.
+        """
         try:
-            # Inputlari sinirla (clipping)
-            metrekare = max(40, min(350, ozellikler['metrekare']))
-            oda_sayisi = max(1, min(10, ozellikler['oda_sayisi']))
-            bina_yasi = max(0, min(60, ozellikler['bina_yasi']))
-            bulundugu_kat = max(-1, min(20, ozellikler['bulundugu_kat']))
-            bina_kat_sayisi = max(1, min(25, ozellikler['bina_kat_sayisi']))
-            isitma_tipi = max(0, min(10, ozellikler['isitma_tipi']))
-            
-            # Fuzzy sisteme inputlari ver
-            self.simulasyon.input['metrekare'] = metrekare
-            self.simulasyon.input['oda_sayisi'] = oda_sayisi
-            self.simulasyon.input['bina_yasi'] = bina_yasi
-            self.simulasyon.input['bulundugu_kat'] = bulundugu_kat
-            self.simulasyon.input['bina_kat_sayisi'] = bina_kat_sayisi
-            self.simulasyon.input['isitma_tipi'] = isitma_tipi
-            
-            # Hesapla
-            self.simulasyon.compute()
-            
-            return self.simulasyon.output['tahmini_fiyat']
-        
-        except KeyError:
-            # Fallback: basit m2 hesabi
-            if self.istatistikler:
-                m2_fiyat = self.istatistikler['fiyat_per_m2_median']
-                base = ozellikler['metrekare'] * m2_fiyat
-                yas_factor = 1.0 - (ozellikler['bina_yasi'] * 0.008)
-                yas_factor = max(0.7, min(1.1, yas_factor))
-                isitma_factor = 0.9 + (ozellikler['isitma_tipi'] * 0.02)
-                return base * yas_factor * isitma_factor
-            else:
-                return None
+            # Tablo modu: skfuzzy yerine tablodan interpolasyon
+            if self.tablo is not None:
+                return self._tablo_tek_tahmin(ozellikler)
+            
+            degerler = [ozellikler[g] for g in GIRISLER]
+            atesleme = self._tek_atesleme(degerler)
+            if atesleme is not None and not atesleme[1]:
+                self._atesleme_say(1, 0)
+                return self._fallback(ozellikler)
+            
+            tahmin = self._toplu_hesapla(np.array([degerler], dtype=float))[0]
+            return None if np.isnan(tahmin) else float(tahmin)
         
         except Exception as e:
             print("Hata:", e)
             return None
     
+    def predict_referans(self, ozellikler):
+        """skfuzzy ile referans tahmin (simulasyon paylasimli, kilitle calisir)"""
+        with self._simulasyon_kilidi:
+            try:
+                if self.simulasyon is None:
+                    self._olustur_referans_sistemi()
+                
+                # Inputlari sinirla (clipping) ve fuzzy sisteme ver
+                for g in GIRISLER:
+                    alt, ust = GIRIS_SINIRLARI[g]
+                    self.simulasyon.input[g] = max(alt, min(ust, ozellikler[g]))
+                
+                # Hesapla (onbellekten donen bos sonuc eski ciktiyi tasimasin)
+                self.simulasyon.output.clear()
+                self.simulasyon.compute()
+                
+                return self.simulasyon.output[self.motor.cikti_adi]
+            
+            except KeyError:
+                return self._fallback(ozellikler)
+            
+            except Exception as e:
+                print("Hata:", e)
+                return None
+    
+    def _atesleme_say(self, tahmin, kural):
+        """Izleme sayaclari: tahmin sayisi ve bu tahminlerde atesleyen kural sayisi"""
+        with self._sayac_kilidi:
+            self.tahmin_sayisi += tahmin
+            self.atesleyen_kural_sayisi += kural
+    
+    def _fallback(self, ozellikler):
+        """Hic kural atesmezse: basit m2 hesabi"""
+        with self._sayac_kilidi:
+            self.fallback_sayisi += 1
+        
+        if self.istatistikler:
+            m2_fiyat = self.istatistikler['fiyat_per_m2_median']
+            base = ozellikler['metrekare'] * m2_fiyat
+            yas_factor = 1.0 - (ozellikler['bina_yasi'] * 0.008)
+            yas_factor = max(0.7, min(1.1, yas_factor))
+            isitma_factor = 0.9 + (ozellikler['isitma_tipi'] * 0.02)
+            return base * yas_factor * isitma_factor
+        else:
+            return None
+    
+    def _tek_atesleme(self, degerler):
+        """Tam sayi girdiler icin (kirpik, atesleyen kural bit maskesi), degilse None"""
+        if self._kural_maske_tablosu is None or not all(float(v).is_integer() for v in degerler):
+            return None
+        
+        kirpik = []
+        maske = self._tum_kurallar
+        for j, g in enumerate(GIRISLER):
+            alt, ust = GIRIS_SINIRLARI[g]
+            v = max(alt, min(ust, int(degerler[j])))
+            maske &= self._kural_maske_tablosu[j][v - alt]
+            kirpik.append(v)
+        return kirpik, maske
+    
+    def _tablo_tek_tahmin(self, ozellikler):
+        """Tablo modunda tek tahmin (tam sayi girdiler numpy'siz yoldan)"""
+        degerler = [ozellikler[g] for g in GIRISLER]
+        atesleme = self._tek_atesleme(degerler)
+        if atesleme is None:
+            tahmin = self._tablo_tahmin(np.array([degerler], dtype=float))[0]
+            return None if np.isnan(tahmin) else tahmin
+        
+        kirpik, maske = atesleme
+        if not maske:
+            self._atesleme_say(1, 0)
+            return self._fallback(ozellikler)
+        
+        tahmin = self.tablo.tek_interpole(kirpik)
+        if tahmin is None:
+            return self._toplu_hesapla(np.array([degerler], dtype=float))[0]
+        self._atesleme_say(1, bin(maske).count('1'))
+        return tahmin
+    
     def predict_from_dataframe_row(self, row):
         """DataFrame satirindan tahmin yap"""
         ozellikler = {
@@ -378,6 +319,129 @@ class EmlakFuzzyModel:
             'isitma_tipi': int(row['Isitma_Numeric'])
         }
         return self.predict(ozellikler)
+    
+    def predict_batch(self, X, parca_boyutu=20000):
+        """
+        Toplu fiyat tahmini (N satir icin tum kurallar numpy ile ayni anda)
+        
+        X: (N, 6) dizi (GIRISLER sirasinda), GIRISLER veya *_Numeric
+        kolonlu DataFrame ya da ozellik dict listesi.
+        Tahmin yapilamayan satirlar icin NaN doner.
+        """
+        girdi = giris_matrisi(X)
+        sonuc = np.empty(len(girdi))
+        hesapla = self._tablo_tahmin if self.tablo is not None else self._toplu_hesapla
+        
+        # Bellek kullanimini sinirlamak icin parca parca hesapla
+        for bas in range(0, len(girdi), parca_boyutu):
+            sonuc[bas:bas + parca_boyutu] = hesapla(girdi[bas:bas + parca_boyutu])
+        
+        return sonuc
+    
+    def _toplu_kirp(self, girdi):
+        """Inputlari sinirla (clipping)"""
+        alt = np.array([GIRIS_SINIRLARI[g][0] for g in GIRISLER], dtype=float)
+        ust = np.array([GIRIS_SINIRLARI[g][1] for g in GIRISLER], dtype=float)
+        return np.clip(girdi, alt, ust)
+    
+    def _toplu_kesimler(self, kirpik):
+        """Kirpilmis girdiler icin cikti terimlerinin kesim seviyeleri (N, terim)"""
+        kesimler, kural_sayisi = self.motor.seyrek_kesimler(kirpik)
+        self._atesleme_say(len(kirpik), int(kural_sayisi.sum()))
+        return kesimler
+    
+    def _toplu_hesapla(self, girdi):
+        """Bir parca icin fuzzify -> kural -> birlestirme -> centroid"""
+        kesimler = self._toplu_kesimler(self._toplu_kirp(girdi))
+        sonuc, bos = self._toplu_centroid(kesimler)
+        
+        # Hic kural atesmediyse predict'teki m2 fallback'i uygula
+        if bos.any():
+            sonuc[bos] = self._toplu_fallback(girdi[bos])
+        
+        return sonuc
+    
+    def _tablo_tahmin(self, girdi):
+        """Tablo modu: atesleme kontrolu tam, deger tablodan interpolasyon"""
+        kirpik = self._toplu_kirp(girdi)
+        kesimler = self._toplu_kesimler(kirpik)
+        ateslendi = kesimler.max(axis=1) > 0
+        
+        sonuc = np.empty(len(girdi))
+        sonuc[~ateslendi] = self._toplu_fallback(girdi[~ateslendi])
+        sonuc[ateslendi] = self.tablo.interpole(kirpik[ateslendi])
+        
+        # Kosesi atesmeyen hucreler tablodan okunamaz: kesimlerden tam motorla hesapla
+        eksik = ateslendi & np.isnan(sonuc)
+        if eksik.any():
+            sonuc[eksik] = self._toplu_centroid(kesimler[eksik])[0]
+        
+        return sonuc
+    
+    def _toplu_centroid(self, kesimler):
+        """Kesilmis cikti terimlerinin birlesiminin centroid'i (secili yontemle)"""
+        if self.durulastirma == 'analitik':
+            return self.motor.analitik_centroid(kesimler)
+        return self._ornekli_centroid(kesimler)
+    
+    def _ornekli_centroid(self, kesimler):
+        """Ornekli evren uzerinde centroid (skfuzzy ile ayni)"""
+        evren = self._toplu_evren
+        mfler = self._toplu_cikti_mf
+        n = len(kesimler)
+        
+        # skfuzzy gibi evreni kesim seviyelerinin gectigi noktalarla genislet
+        ekstra = np.full((n, 2 * len(mfler)), evren[0])
+        for t, mf in enumerate(mfler):
+            seviye = kesimler[:, t:t + 1]
+            maske = mf[None, :] >= seviye
+            var = maske.any(axis=1) & (seviye[:, 0] > 0)
+            ilk = maske.argmax(axis=1)
+            son = len(evren) - 1 - maske[:, ::-1].argmax(axis=1)
+            
+            # Yukselen kenar: ilk-1 ile ilk arasi, dusen kenar: son ile son+1 arasi
+            for kolon, i, gecerli in ((2 * t, ilk - 1, var & (ilk > 0)),
+                                      (2 * t + 1, son, var & (son < len(evren) - 1))):
+                i = np.clip(i, 0, len(evren) - 2)
+                egim = (mf[i + 1] - mf[i]) / (evren[i + 1] - evren[i])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    x = evren[i] + (seviye[:, 0] - mf[i]) / egim
+                ekstra[gecerli, kolon] = x[gecerli]
+        
+        x = np.concatenate([np.broadcast_to(evren, (n, len(evren))), ekstra], axis=1)
+        x.sort(axis=1)
+        
+        # Birlesik uyelik: max_t min(kesim_t, mf_t(x))
+        y = np.zeros_like(x)
+        for t, mf in enumerate(mfler):
+            np.maximum(y, np.minimum(kesimler[:, t:t + 1], np.interp(x, evren, mf)), out=y)
+        
+        # Parcali dogrusal fonksiyonun alan ve moment integrali (yamuklar)
+        dx = np.diff(x, axis=1)
+        x1 = x[:, :-1]
+        y1 = y[:, :-1]
+        y2 = y[:, 1:]
+        alan = 0.5 * dx * (y1 + y2)
+        moment = alan * x1 + dx * dx * (y1 + 2 * y2) / 6.0
+        
+        toplam_alan = alan.sum(axis=1)
+        sonuc = moment.sum(axis=1) / np.fmax(toplam_alan, np.finfo(float).eps)
+        bos = y.sum(axis=1) == 0
+        return sonuc, bos
+    
+    def _toplu_fallback(self, girdi):
+        """predict'teki KeyError fallback'inin vektorel hali"""
+        with self._sayac_kilidi:
+            self.fallback_sayisi += len(girdi)
+        
+        if not self.istatistikler:
+            return np.full(len(girdi), np.nan)
+        
+        m2_fiyat = self.istatistikler['fiyat_per_m2_median']
+        base = girdi[:, 0] * m2_fiyat
+        yas_factor = np.clip(1.0 - (girdi[:, 2] * 0.008), 0.7, 1.1)
+        isitma_factor = 0.9 + (girdi[:, 5] * 0.02)
+        return base * yas_factor * isitma_factor
 
 
 def main():
@@ -388,7 +452,7 @@ def main():
     print("\nModel yukleniyor...")
     
     # Veriyi yukle ve modeli olustur
-    df = pd.read_csv('sehir_file/emlakverileri.csv')
+    df = veri_yukle('sehir_file/emlakverileri.csv')
     model = EmlakFuzzyModel(df=df)
     
     print("\nHazir! (Cikmak icin 'q' yazin)\n")
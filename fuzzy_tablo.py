@@ -0,0 +1,258 @@
+"""
+Fuzzy Model - Onceden Hesaplanmis Tahmin Tablosu
+Girdi izgarasinin dugumlerinde fuzzy ciktiyi saklar, tahmini
+cok-dogrusal (6 boyutlu) interpolasyonla yapar.
+
+Tablo olusturma ve hata raporu:
+    python fuzzy_tablo.py
+    python fuzzy_tablo.py --adim metrekare=5 --adim bina_yasi=2 --cikti sehir_file/fuzzy_tablo.npz
+"""
+
+import sys
+import time
+import argparse
+import bisect
+import numpy as np
+from veri_isleme import veri_yukle, giris_matrisi
+from fuzzy_model import EmlakFuzzyModel, GIRISLER, GIRIS_SINIRLARI
+from kural_tabani import KURAL_DOSYASI
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Varsayilan tablo dosyasi
+TABLO_YOLU = 'sehir_file/fuzzy_tablo.npz'
+
+# Varsayilan dugum araliklari (1 = o eksende yogun/tam izgara)
+VARSAYILAN_ADIMLAR = {
+    'metrekare': 10,
+    'oda_sayisi': 1,
+    'bina_yasi': 5,
+    'bulundugu_kat': 2,
+    'bina_kat_sayisi': 3,
+    'isitma_tipi': 1
+}
+
+
+class FuzzyTablo:
+    """
+    6 boyutlu tahmin tablosu
+    Hic kural atesmeyen dugumler NaN olarak saklanir.
+    """
+    
+    def __init__(self, dugumler, degerler, imza):
+        self.dugumler = [np.asarray(d, dtype=float) for d in dugumler]
+        self.degerler = degerler
+        self.imza = imza
+        
+        # Tek tahmin yolu icin duz liste ve adimlar
+        self._dugum_listeleri = [d.tolist() for d in self.dugumler]
+        self._duz = degerler.reshape(-1)
+        self._adimlar = [s // degerler.itemsize for s in degerler.strides]
+    
+    @staticmethod
+    def varsayilan_dugumler(model, adimlar=None):
+        """Her eksen icin adim izgarasi + uyelik fonksiyonu kirilma noktalari"""
+        adimlar = {**VARSAYILAN_ADIMLAR, **(adimlar or {})}
+        
+        dugumler = []
+        for j, g in enumerate(GIRISLER):
+            alt, ust = GIRIS_SINIRLARI[g]
+            noktalar = set(range(alt, ust + 1, adimlar[g])) | {alt, ust}
+            
+            # Kirilma noktalarinda (ve evren sinirlarinda) uyelik egimi degisir, dugum olarak ekle
+            for k, evren, mf in model._toplu_terimler:
+                if k != j:
+                    continue
+                egim = np.diff(mf) / np.diff(evren)
+                kirilma = list(evren[1:-1][np.abs(np.diff(egim)) > 1e-12]) + [evren[0], evren[-1]]
+                noktalar |= {float(x) for x in kirilma if alt <= x <= ust}
+            
+            dugumler.append(np.array(sorted(noktalar), dtype=float))
+        
+        return dugumler
+    
+    @classmethod
+    def olustur(cls, model, dugumler=None, parca_boyutu=50000):
+        """Tum dugumlerde tam fuzzy motorunu calistirip tabloyu doldur"""
+        if dugumler is None:
+            dugumler = cls.varsayilan_dugumler(model)
+        
+        sekil = tuple(len(d) for d in dugumler)
+        degerler = np.empty(sekil, dtype=np.float32)
+        duz = degerler.reshape(-1)
+        
+        for bas in range(0, duz.size, parca_boyutu):
+            indeks = np.unravel_index(np.arange(bas, min(bas + parca_boyutu, duz.size)), sekil)
+            noktalar = np.column_stack([d[i] for d, i in zip(dugumler, indeks)])
+            
+            # Atesmeyen dugumler icin centroid hesaplamaya gerek yok
+            kesimler = model._toplu_kesimler(noktalar)
+            ateslendi = kesimler.max(axis=1) > 0
+            sonuc = np.full(len(noktalar), np.nan)
+            sonuc[ateslendi] = model._toplu_centroid(kesimler[ateslendi])[0]
+            duz[bas:bas + parca_boyutu] = sonuc
+        
+        return cls(dugumler, degerler, model.motor_imzasi())
+    
+    def kaydet(self, yol=TABLO_YOLU):
+        """Tabloyu .npz olarak kaydet"""
+        eksenler = {f'dugum_{g}': d for g, d in zip(GIRISLER, self.dugumler)}
+        np.savez(yol, degerler=self.degerler, imza=np.array(self.imza), **eksenler)
+    
+    @classmethod
+    def yukle(cls, yol=TABLO_YOLU):
+        """Kaydedilmis tabloyu yukle"""
+        with np.load(yol) as veri:
+            dugumler = [veri[f'dugum_{g}'] for g in GIRISLER]
+            return cls(dugumler, veri['degerler'], str(veri['imza']))
+    
+    def interpole(self, kirpik):
+        """
+        Kirpilmis girdiler (N, 6) icin cok-dogrusal interpolasyon
+        Kosesi NaN olan (atesmeyen dugume komsu) satirlar NaN doner.
+        """
+        n = len(kirpik)
+        indeksler = []
+        oranlar = []
+        
+        for j, d in enumerate(self.dugumler):
+            x = kirpik[:, j]
+            i = np.clip(np.searchsorted(d, x, side='right') - 1, 0, len(d) - 1)
+            i2 = np.minimum(i + 1, len(d) - 1)
+            aralik = d[i2] - d[i]
+            t = np.where(aralik > 0, (x - d[i]) / np.where(aralik > 0, aralik, 1), 0.0)
+            
+            # Dugumun tam ustundeyse ust kose alt kose ile ayni olsun (komsu NaN sizmasin)
+            i2 = np.where(t > 0, i2, i)
+            
+            sekil = [n] + [1] * len(self.dugumler)
+            sekil[j + 1] = 2
+            indeksler.append(np.stack([i, i2], axis=1).reshape(sekil))
+            oranlar.append(t)
+        
+        # Hucre koselerini tek seferde topla: (N, 2, 2, 2, 2, 2, 2)
+        kup = self.degerler[tuple(indeksler)].astype(float)
+        
+        # Eksenleri sondan basa daralt
+        for t in reversed(oranlar):
+            t = t.reshape([n] + [1] * (kup.ndim - 2))
+            kup = kup[..., 0] * (1 - t) + kup[..., 1] * t
+        
+        return kup
+    
+    def tek_interpole(self, kirpik):
+        """Tek satir icin interpolasyon (saf Python), kose NaN ise None"""
+        koseler = [(0, 1.0)]
+        for j, x in enumerate(kirpik):
+            d = self._dugum_listeleri[j]
+            i = min(max(bisect.bisect_right(d, x) - 1, 0), len(d) - 1)
+            adim = self._adimlar[j]
+            
+            if i + 1 < len(d) and x > d[i]:
+                t = (x - d[i]) / (d[i + 1] - d[i])
+                koseler = [(k + i * adim, w * (1 - t)) for k, w in koseler] + \
+                          [(k + (i + 1) * adim, w * t) for k, w in koseler]
+            else:
+                koseler = [(k + i * adim, w) for k, w in koseler]
+        
+        toplam = 0.0
+        for k, w in koseler:
+            deger = self._duz.item(k)
+            if deger != deger:
+                return None
+            toplam += w * deger
+        return toplam
+
+
+def hata_raporu(model, tablo, n_rastgele=20000, seed=42):
+    """Tablo tahminlerini tam motorla karsilastir"""
+    df = model.df
+    rng = np.random.default_rng(seed)
+    
+    kumeler = {
+        'rastgele': np.column_stack([rng.integers(GIRIS_SINIRLARI[g][0], GIRIS_SINIRLARI[g][1] + 1, n_rastgele)
+                                     for g in GIRISLER]).astype(float)
+    }
+    if df is not None:
+        kumeler['emlakverileri.csv'] = giris_matrisi(df)
+    
+    print(f"\n{'='*70}")
+    print(" TABLO HATA RAPORU (tam motora gore)")
+    print(f"{'='*70}")
+    
+    for ad, girdi in kumeler.items():
+        kirpik = model._toplu_kirp(girdi)
+        ateslendi = model._toplu_kesimler(kirpik).max(axis=1) > 0
+        tablodan = ateslendi & ~np.isnan(tablo.interpole(kirpik))
+        
+        model.tablo = None
+        bas = time.perf_counter()
+        tam = model.predict_batch(girdi)
+        sure_tam = time.perf_counter() - bas
+        
+        model.tablo = tablo
+        bas = time.perf_counter()
+        yaklasik = model.predict_batch(girdi)
+        sure_tablo = time.perf_counter() - bas
+        
+        hata = np.abs(yaklasik - tam)
+        goreli = hata / np.abs(tam)
+        
+        print(f"\n{ad} ({len(girdi):,} satir)")
+        print(f"  Tablodan okunan:     %{100 * tablodan.mean():.1f}")
+        print(f"  Fallback (kural yok): %{100 * (~ateslendi).mean():.1f}")
+        print(f"  Tam motora dusen:    %{100 * (ateslendi & ~tablodan).mean():.1f}")
+        print(f"  MAE: {hata.mean():,.0f} TL   Maks: {hata.max():,.0f} TL")
+        print(f"  Goreli hata - ortalama: %{100 * goreli.mean():.3f}  p99: %{100 * np.percentile(goreli, 99):.3f}  maks: %{100 * goreli.max():.3f}")
+        print(f"  Sure - tam motor: {sure_tam:.3f} sn   tablo: {sure_tablo:.3f} sn")
+    
+    # Tek tahmin gecikmesi
+    ozellikler = {'metrekare': 120, 'oda_sayisi': 3, 'bina_yasi': 5,
+                  'bulundugu_kat': 3, 'bina_kat_sayisi': 8, 'isitma_tipi': 5}
+    tekrar = 2000
+    bas = time.perf_counter()
+    for _ in range(tekrar):
+        model.predict(ozellikler)
+    print(f"\nTek tahmin (tablo modu): {1e6 * (time.perf_counter() - bas) / tekrar:.1f} mikrosaniye")
+    print(f"{'='*70}\n")
+
+
+def main():
+    """Tabloyu olustur, kaydet ve hatasini raporla"""
+    parser = argparse.ArgumentParser(description="Fuzzy tahmin tablosu olustur")
+    parser.add_argument('--adim', action='append', default=[], metavar='GIRIS=ADIM',
+                        help="Eksen dugum araligi, orn. metrekare=5 (1 = yogun)")
+    parser.add_argument('--cikti', default=TABLO_YOLU, help="Tablo dosyasi")
+    parser.add_argument('--veri', default='sehir_file/emlakverileri.csv', help="Hata raporu icin CSV")
+    parser.add_argument('--kurallar', default=KURAL_DOSYASI,
+                        help="Kural dosyasi (orn. fuzzy_ayarla.py ciktisi)")
+    args = parser.parse_args()
+    
+    adimlar = {}
+    for a in args.adim:
+        g, _, adim = a.partition('=')
+        if g not in GIRISLER:
+            parser.error(f"Bilinmeyen giris: {g}")
+        adimlar[g] = int(adim)
+    
+    model = EmlakFuzzyModel(df=veri_yukle(args.veri), kural_dosyasi=args.kurallar)
+    dugumler = FuzzyTablo.varsayilan_dugumler(model, adimlar)
+    
+    boyut = int(np.prod([len(d) for d in dugumler]))
+    print(f"\nTablo olusturuluyor: {' x '.join(str(len(d)) for d in dugumler)} = {boyut:,} dugum "
+          f"({boyut * 4 / 1e6:.1f} MB)")
+    
+    bas = time.perf_counter()
+    tablo = FuzzyTablo.olustur(model, dugumler)
+    print(f"Olusturma suresi: {time.perf_counter() - bas:.1f} sn")
+    
+    tablo.kaydet(args.cikti)
+    print("Kaydedildi:", args.cikti)
+    
+    hata_raporu(model, tablo)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
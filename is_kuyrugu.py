@@ -0,0 +1,565 @@
+"""
+Is Kuyrugu
+Senkron bir istege sigmayacak buyuklukteki skorlama isleri (yuz binlerce ilan)
+icin asenkron kuyruk: is gonderilir, is kimligi doner, durumu sorgulanir ve
+bitince sonuc CSV'si indirilir. Harici broker gerekmez: is kayitlari SQLite'ta
+(isler/isler.db), girdi ve sonuc dosyalari isin dizinindedir.
+
+Is turleri:
+    - kayit: /predict/batch gibi giris degerleri (N, 6); cikti giris degerleri, iki
+             modelin tahmini ve ML %80 araligi (gecersiz kayitlarin satiri bos)
+    - dosya: emlakverileri.csv kolonlarinda ham ilan dosyasi (CSV veya Parquet);
+             cikti toplu_skorla.py ile ayni kolonlar (girisi bos/okunamayan satirin
+             tahmini bos, satir durumdaki hatalarda raporlanir)
+
+Isler parca parca islenir: her parcanin sonucu ayri dosyaya yazilir ve tamamlanan
+parca sayisi kayda gecer. Isi calistiran process olurse (bu makinede; yeniden
+baslayan process ayni pid'i alsa da) is kuyruga geri konur ve kaldigi parcadan
+devam eder; durdurulan isciler de calisan islerini parca sonunda kuyruga birakir. Parcalar bitince sonuc tek CSV'de birlestirilir.
+
+Isciler API process'inde (IS_ISCI_SAYISI thread) veya ayri process'te calisir:
+    python is_kuyrugu.py
+    python is_kuyrugu.py --isci 2 --veri sehir_file/emlakverileri.csv
+Ayni dizini kullanan tum isciler kuyrugu paylasir; bir is tek isciye verilir.
+
+Ayarlar (ortam degiskenleri):
+    IS_DIZINI          is kayitlari ve dosyalari (varsayilan: isler)
+    IS_ISCI_SAYISI     API icindeki isci sayisi (varsayilan: 1, 0 = API isleri sadece kabul eder)
+    IS_PARCA_BOYUTU    parca boyutu, satir (varsayilan: 20000)
+    IS_SAKLAMA_SURESI  biten islerin saklanma suresi, sn (varsayilan: 7 gun)
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import socket
+import sqlite3
+import argparse
+import threading
+import contextlib
+import numpy as np
+import pandas as pd
+from veri_isleme import GIRISLER, HAM_KOLONLAR, VARSAYILAN_CSV
+from toplu_skorla import parcalari_oku, parca_skorla, parquet_mu
+from kural_tabani import KURAL_DOSYASI
+
+
+# Is kayitlari ve dosyalari
+IS_DIZINI = os.environ.get('IS_DIZINI', 'isler')
+
+# API icindeki isci thread sayisi
+ISCI_SAYISI = int(os.environ.get('IS_ISCI_SAYISI', '1'))
+
+# Parca boyutu (satir): ilerleme adimi ve yeniden baslatmada tekrar hesaplanan en fazla satir
+PARCA_BOYUTU = int(os.environ.get('IS_PARCA_BOYUTU', '20000'))
+
+# Biten (tamamlandi/hata) islerin saklanma suresi (sn)
+SAKLAMA_SURESI = float(os.environ.get('IS_SAKLAMA_SURESI', str(7 * 24 * 3600)))
+
+# Kaydi olmayan is dizinlerinin (gonderimi yarida kalan) silinmeden once bekledigi sure (sn)
+YETIM_SURESI = 3600.0
+
+# Is durumlari
+DURUMLAR = ('bekliyor', 'calisiyor', 'tamamlandi', 'hata', 'iptal')
+
+# Durum sorgusunda saklanan en fazla kayit hatasi
+HATA_LIMITI = 100
+
+# Dosya islerinde girisi bos veya okunamayan satirin hata mesaji
+OKUNAMAYAN_MESAJI = "Bos veya okunamayan deger"
+
+# Bos iscinin kuyrugu yeniden kontrol araligi ve bakim (kurtarma/temizlik) araligi (sn)
+BEKLEME = 1.0
+BAKIM_ARALIGI = 30.0
+
+_SEMA = """
+CREATE TABLE IF NOT EXISTS isler (
+    id TEXT PRIMARY KEY,
+    tur TEXT NOT NULL,
+    durum TEXT NOT NULL,
+    girdi TEXT NOT NULL,
+    parca_boyutu INTEGER NOT NULL,
+    toplam_satir INTEGER,
+    islenen_satir INTEGER NOT NULL DEFAULT 0,
+    tamamlanan_parca INTEGER NOT NULL DEFAULT 0,
+    sahip TEXT,
+    olusturma REAL NOT NULL,
+    baslama REAL,
+    bitis REAL,
+    hata TEXT,
+    bilgi TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS isler_durum ON isler (durum, olusturma);
+"""
+
+
+def _zaman(t):
+    """Epoch -> yerel ISO zaman (None ise None)"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(t)) if t else None
+
+
+# Process'in baslatma belirteci: yeniden baslayan process ayni pid'i alsa da (orn.
+# container'da pid 1) onceki process'in isleri ondan ayrilir; fork'ta yenilenir
+_BELIRTEC = uuid.uuid4().hex[:12]
+
+
+def _belirteci_yenile():
+    global _BELIRTEC
+    _BELIRTEC = uuid.uuid4().hex[:12]
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_belirteci_yenile)
+
+
+def _son_degisiklik(dizin):
+    """Dizin ve altindaki dosyalarin en yeni degisiklik zamani (silinmisse 0)"""
+    en_yeni = 0.0
+    for kok, _, dosyalar in os.walk(dizin):
+        for yol in [kok] + [os.path.join(kok, d) for d in dosyalar]:
+            with contextlib.suppress(OSError):
+                en_yeni = max(en_yeni, os.path.getmtime(yol))
+    return en_yeni
+
+
+def _yasiyor_mu(pid):
+    """Bu makinede pid'li process calisiyor mu?"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def okunamayan_satirlar(sonuc, bas=0):
+    """
+    Skorlanmis dosya parcasinda girisi bos/okunamayan (tahmini NaN) satirlar: (sayi, ilk
+    HATA_LIMITI kadarinin hatalari); indeks dosyadaki satir sirasi (bas: parcanin ilk satiri)
+    """
+    eksik = np.isnan(sonuc[GIRISLER].to_numpy(dtype=float))
+    satirlar = np.flatnonzero(eksik.any(axis=1))
+    alanlar = eksik[satirlar[:HATA_LIMITI]].argmax(axis=1)
+    return len(satirlar), [{'indeks': bas + int(i), 'alan': GIRISLER[j], 'mesaj': OKUNAMAYAN_MESAJI}
+                           for i, j in zip(satirlar[:HATA_LIMITI], alanlar)]
+
+
+def kayit_parcasi_skorla(X, fuzzy, ml):
+    """Giris matrisi parcasini skorla; NaN iceren (gecersiz) satirlarin tahminleri bos"""
+    gecerli = np.isfinite(X).all(axis=1)
+    tahminler = np.full((len(X), 4), np.nan)
+    if gecerli.any():
+        ml_tahmin, (alt, ust) = ml.predict_batch_aralik(X[gecerli])
+        tahminler[gecerli] = np.column_stack([fuzzy.predict_batch(X[gecerli]), ml_tahmin, alt, ust])
+    
+    sonuc = pd.DataFrame({g: pd.Series(np.where(gecerli, X[:, j], np.nan)).astype('Int64')
+                          for j, g in enumerate(GIRISLER)})
+    for j, ad in enumerate(('fuzzy_tahmin', 'ml_tahmin', 'ml_alt', 'ml_ust')):
+        sonuc[ad] = np.round(tahminler[:, j], 2)
+    sonuc['ortalama_tahmin'] = np.round((tahminler[:, 0] + tahminler[:, 1]) / 2, 2)
+    return sonuc
+
+
+class IsKuyrugu:
+    """
+    SQLite'ta kalici is kuyrugu ve isci thread'leri
+    Kayitlar kisa omurlu baglantilarla okunur/yazilir; isi almak yazma kilidiyle
+    (BEGIN IMMEDIATE) yapildigi icin ayni dizini acan process'ler kuyrugu paylasir.
+    """
+    
+    def __init__(self, dizin=IS_DIZINI, parca_boyutu=PARCA_BOYUTU, saklama_suresi=SAKLAMA_SURESI):
+        self.dizin = dizin
+        self.parca_boyutu = parca_boyutu
+        self.saklama_suresi = saklama_suresi
+        self.makine = socket.gethostname()
+        os.makedirs(dizin, exist_ok=True)
+        self._db = os.path.join(dizin, 'isler.db')
+        with self._baglanti() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(_SEMA)
+        
+        self._isciler = []
+        self._dur = threading.Event()
+        self._uyandir = threading.Event()
+        self._son_bakim = 0.0
+    
+    @property
+    def sahip(self):
+        """Bu process'in is sahipligi etiketi (makine:pid:belirtec); fork sonrasi da dogru"""
+        return f"{self.makine}:{os.getpid()}:{_BELIRTEC}"
+    
+    def _olu_mu(self, sahip):
+        """
+        Sahip bu makinede artik calismiyor mu? (pid olmus ya da pid bu process'in ama
+        belirteci farkli: ayni pid'le yeniden baslamadan onceki process)
+        """
+        makine, pid, belirtec = (sahip.rsplit(':', 2) + [''])[:3]
+        if makine != self.makine:
+            return False
+        pid = int(pid)
+        return not _yasiyor_mu(pid) or (pid == os.getpid() and belirtec != _BELIRTEC)
+    
+    @contextlib.contextmanager
+    def _baglanti(self):
+        """Kisa omurlu, otomatik commit'li baglanti"""
+        db = sqlite3.connect(self._db, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    @contextlib.contextmanager
+    def _islem(self):
+        """Yazma kilidini bastan alan islem (ayni isi iki iscinin almasini onler)"""
+        with self._baglanti() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                yield db
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+    
+    def is_dizini(self, is_id):
+        return os.path.join(self.dizin, is_id)
+    
+    def sonuc_yolu(self, is_id):
+        """Tamamlanan isin sonuc CSV'si"""
+        return os.path.join(self.is_dizini(is_id), 'sonuc.csv')
+    
+    def yeni_is(self):
+        """Yeni is kimligi ve bos dizini (girdi dosyasi buraya yazilip dosya_gonder cagrilir)"""
+        is_id = uuid.uuid4().hex
+        os.makedirs(self.is_dizini(is_id))
+        return is_id
+    
+    def _ekle(self, is_id, tur, girdi, toplam_satir, bilgi=None):
+        """Isi kuyruga ekle ve durumunu dondur"""
+        with self._baglanti() as db:
+            db.execute('INSERT INTO isler (id, tur, durum, girdi, parca_boyutu, toplam_satir, olusturma, bilgi) '
+                       'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                       (is_id, tur, 'bekliyor', girdi, self.parca_boyutu, toplam_satir, time.time(),
+                        json.dumps(bilgi or {}, ensure_ascii=False)))
+        self._uyandir.set()
+        return self.durum(is_id)
+    
+    def kayit_gonder(self, X, hatalar=()):
+        """
+        Giris matrisi (N, 6) icin is olustur; gecersiz kayitlarin satiri NaN olmali
+        hatalar: kayit hatalari (sozluk listesi), ilk HATA_LIMITI kadari durumda doner.
+        """
+        is_id = self.yeni_is()
+        np.save(os.path.join(self.is_dizini(is_id), 'girdi.npy'), np.asarray(X, dtype=float))
+        hatalar = list(hatalar)
+        return self._ekle(is_id, 'kayit', 'girdi.npy', len(X),
+                          {'hatali': len(hatalar), 'hatalar': hatalar[:HATA_LIMITI]})
+    
+    def dosya_gonder(self, is_id, ad):
+        """
+        Is dizinine yazilmis ham ilan dosyasi (CSV/Parquet) icin isi kuyruga ekle
+        Dosya okunamazsa veya ham kolonlar eksikse ValueError.
+        """
+        yol = os.path.join(self.is_dizini(is_id), ad)
+        if parquet_mu(yol):
+            try:
+                import pyarrow.parquet
+            except ImportError:
+                raise ValueError("Parquet icin pyarrow gerekli")
+            dosya = pyarrow.parquet.ParquetFile(yol)
+            kolonlar, toplam = dosya.schema_arrow.names, dosya.metadata.num_rows
+        else:
+            # CSV'nin satir sayisi okunmadan bilinmez (ilerleme is bitince 1 olur)
+            kolonlar, toplam = list(pd.read_csv(yol, nrows=0).columns), None
+        
+        eksik = [k for k in HAM_KOLONLAR if k not in kolonlar]
+        if eksik:
+            raise ValueError("Dosyada eksik kolonlar: " + ", ".join(eksik))
+        return self._ekle(is_id, 'dosya', ad, toplam)
+    
+    def durum(self, is_id):
+        """Isin durumu (sozluk), is yoksa None"""
+        with self._baglanti() as db:
+            satir = db.execute('SELECT * FROM isler WHERE id = ?', (is_id,)).fetchone()
+        return self._ozet(satir) if satir else None
+    
+    @staticmethod
+    def _ozet(satir):
+        """Kayit satirindan durum sozlugu"""
+        bilgi = json.loads(satir['bilgi'])
+        toplam, islenen = satir['toplam_satir'], satir['islenen_satir']
+        if satir['durum'] == 'tamamlandi':
+            ilerleme = 1.0
+        else:
+            ilerleme = round(islenen / toplam, 4) if toplam else None
+        return {
+            'is_id': satir['id'],
+            'tur': satir['tur'],
+            'durum': satir['durum'],
+            'olusturma': _zaman(satir['olusturma']),
+            'baslama': _zaman(satir['baslama']),
+            'bitis': _zaman(satir['bitis']),
+            'toplam_satir': toplam,
+            'islenen_satir': islenen,
+            'ilerleme': ilerleme,
+            'hata': satir['hata'],
+            'hatali': bilgi.get('hatali', 0),
+            'hatalar': bilgi.get('hatalar', [])
+        }
+    
+    def sayilar(self):
+        """Durum -> is sayisi"""
+        with self._baglanti() as db:
+            sayilar = dict(db.execute('SELECT durum, COUNT(*) FROM isler GROUP BY durum').fetchall())
+        return {d: sayilar.get(d, 0) for d in DURUMLAR}
+    
+    def sil(self, is_id):
+        """
+        Isi sil ve onceki durumunu dondur (is yoksa None)
+        Bekleyen ve biten isler dosyalariyla hemen silinir; calisan is 'iptal' olur,
+        iscisi parca sonunda durup isi ve dosyalarini siler.
+        """
+        with self._islem() as db:
+            satir = db.execute('SELECT durum FROM isler WHERE id = ?', (is_id,)).fetchone()
+            if satir is None:
+                return None
+            if satir['durum'] == 'calisiyor':
+                db.execute("UPDATE isler SET durum = 'iptal', bitis = ? WHERE id = ?", (time.time(), is_id))
+            else:
+                db.execute('DELETE FROM isler WHERE id = ?', (is_id,))
+        
+        if satir['durum'] != 'calisiyor':
+            shutil.rmtree(self.is_dizini(is_id), ignore_errors=True)
+        return satir['durum']
+    
+    def temizle(self, saklama_suresi=None, yetim_suresi=YETIM_SURESI):
+        """
+        Saklama suresi dolan biten isleri ve dosyalarini sil; kaydi olmayan (gonderimi
+        yarida kalmis) ve yetim_suresi boyunca degismemis is dizinlerini de sil.
+        Silinen is ve dizin sayisini dondur.
+        """
+        simdi = time.time()
+        sinir = simdi - (self.saklama_suresi if saklama_suresi is None else saklama_suresi)
+        # Dizinler kayitlardan once listelenir: arada kaydi eklenen is yetim sayilmaz
+        dizinler = [d for d in os.listdir(self.dizin)
+                    if len(d) == 32 and all(c in '0123456789abcdef' for c in d)
+                    and os.path.isdir(self.is_dizini(d))]
+        with self._islem() as db:
+            idler = [s['id'] for s in db.execute(
+                "SELECT id FROM isler WHERE durum IN ('tamamlandi', 'hata') AND bitis <= ?", (sinir,))]
+            db.executemany('DELETE FROM isler WHERE id = ?', [(i,) for i in idler])
+            kayitli = {s['id'] for s in db.execute('SELECT id FROM isler')}
+        yetimler = [d for d in dizinler
+                    if d not in kayitli and d not in idler
+                    and _son_degisiklik(self.is_dizini(d)) <= simdi - yetim_suresi]
+        for is_id in idler + yetimler:
+            shutil.rmtree(self.is_dizini(is_id), ignore_errors=True)
+        return len(idler) + len(yetimler)
+    
+    def sahipsizleri_kurtar(self):
+        """
+        Bu makinede olmus process'lerin islerini kurtar: calisan isler kaldiklari parcadan
+        devam etmek uzere kuyruga doner, iptal edilenler silinir. Kurtarilan is sayisi.
+        """
+        olu = []
+        with self._islem() as db:
+            for s in db.execute("SELECT id, durum, sahip FROM isler WHERE durum IN ('calisiyor', 'iptal') "
+                                "AND sahip IS NOT NULL").fetchall():
+                if self._olu_mu(s['sahip']):
+                    olu.append(s)
+            for s in olu:
+                if s['durum'] == 'calisiyor':
+                    db.execute("UPDATE isler SET durum = 'bekliyor', sahip = NULL WHERE id = ?", (s['id'],))
+                else:
+                    db.execute('DELETE FROM isler WHERE id = ?', (s['id'],))
+        
+        for s in olu:
+            if s['durum'] == 'iptal':
+                shutil.rmtree(self.is_dizini(s['id']), ignore_errors=True)
+            else:
+                print(f"Is {s['id'][:8]} sahibi ({s['sahip']}) calismiyor, kuyruga geri kondu")
+        return sum(s['durum'] == 'calisiyor' for s in olu)
+    
+    def al(self):
+        """En eski bekleyen isi bu process'in uzerine al (yoksa None)"""
+        with self._islem() as db:
+            satir = db.execute("SELECT * FROM isler WHERE durum = 'bekliyor' ORDER BY olusturma LIMIT 1").fetchone()
+            if satir is None:
+                return None
+            db.execute("UPDATE isler SET durum = 'calisiyor', sahip = ?, baslama = COALESCE(baslama, ?) WHERE id = ?",
+                       (self.sahip, time.time(), satir['id']))
+        return satir
+    
+    def _parcalar(self, satir, fuzzy, ml):
+        """Isin parcalari: her biri cagrilinca skorlanan parcayi (DataFrame) dondurur"""
+        yol = os.path.join(self.is_dizini(satir['id']), satir['girdi'])
+        boyut = satir['parca_boyutu']
+        if satir['tur'] == 'kayit':
+            X = np.load(yol, mmap_mode='r')
+            for bas in range(0, len(X), boyut):
+                yield lambda bas=bas: kayit_parcasi_skorla(np.asarray(X[bas:bas + boyut]), fuzzy, ml)
+        else:
+            for parca in parcalari_oku(yol, boyut):
+                yield lambda parca=parca: parca_skorla(parca, fuzzy, ml)
+    
+    def _guncelle(self, is_id, sql, *degerler):
+        """Bu process'in calistirdigi isi guncelle; is iptal edildiyse (satir degismezse) False"""
+        with self._baglanti() as db:
+            return db.execute(f"UPDATE isler SET {sql} WHERE id = ? AND durum = 'calisiyor' AND sahip = ?",
+                              (*degerler, is_id, self.sahip)).rowcount > 0
+    
+    def _iptali_tamamla(self, is_id):
+        """Iptal edilen isin kaydini ve dosyalarini sil"""
+        with self._baglanti() as db:
+            db.execute("DELETE FROM isler WHERE id = ? AND durum = 'iptal'", (is_id,))
+        shutil.rmtree(self.is_dizini(is_id), ignore_errors=True)
+        print(f"Is {is_id[:8]} iptal edildi")
+    
+    def isle(self, satir, fuzzy, ml):
+        """Alinmis isi kaldigi parcadan sonuna kadar isle (durdurulursa parca sonunda kuyruga birakir)"""
+        is_id = satir['id']
+        dizin = self.is_dizini(is_id)
+        parca_dizini = os.path.join(dizin, 'parcalar')
+        os.makedirs(parca_dizini, exist_ok=True)
+        tamamlanan, islenen = satir['tamamlanan_parca'], satir['islenen_satir']
+        bilgi = json.loads(satir['bilgi'])
+        bas = time.perf_counter()
+        print(f"Is {is_id[:8]} basladi ({satir['tur']}, parca {tamamlanan + 1}'den)")
+        
+        try:
+            for i, skorla in enumerate(self._parcalar(satir, fuzzy, ml)):
+                if i < tamamlanan:
+                    continue
+                if self._dur.is_set():
+                    self._guncelle(is_id, "durum = 'bekliyor', sahip = NULL")
+                    print(f"Is {is_id[:8]} kuyruga birakildi ({islenen:,} satir islendi)")
+                    return
+                
+                sonuc = skorla()
+                yol = os.path.join(parca_dizini, f'{i:06d}.csv')
+                sonuc.to_csv(yol + '.tmp', index=False)
+                os.replace(yol + '.tmp', yol)
+                if satir['tur'] == 'dosya':
+                    # Okunamayan satirlar isi durdurmaz: tahminleri bos, hatalari parcayla birlikte kayda gecer
+                    sayi, hatalar = okunamayan_satirlar(sonuc, islenen)
+                    bilgi['hatali'] = bilgi.get('hatali', 0) + sayi
+                    bilgi['hatalar'] = (bilgi.get('hatalar', []) + hatalar)[:HATA_LIMITI]
+                islenen += len(sonuc)
+                if not self._guncelle(is_id, 'tamamlanan_parca = ?, islenen_satir = ?, bilgi = ?', i + 1, islenen,
+                                      json.dumps(bilgi, ensure_ascii=False)):
+                    self._iptali_tamamla(is_id)
+                    return
+            
+            self._birlestir(dizin)
+            if not self._guncelle(is_id, "durum = 'tamamlandi', bitis = ?, toplam_satir = ?",
+                                  time.time(), islenen):
+                self._iptali_tamamla(is_id)
+                return
+        except Exception as e:
+            self._guncelle(is_id, "durum = 'hata', bitis = ?, hata = ?", time.time(), str(e))
+            print(f"Is {is_id[:8]} hata verdi: {e}")
+            return
+        
+        # Sonuc kaydedildi: girdi ve parcalar artik gerekmez
+        shutil.rmtree(parca_dizini, ignore_errors=True)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(dizin, satir['girdi']))
+        print(f"Is {is_id[:8]} tamamlandi ({islenen:,} satir, {time.perf_counter() - bas:.1f} sn)")
+    
+    @staticmethod
+    def _birlestir(dizin):
+        """Parca sonuclarini sirayla tek CSV'de birlestir (baslik bir kez)"""
+        parca_dizini = os.path.join(dizin, 'parcalar')
+        parcalar = sorted(ad for ad in os.listdir(parca_dizini) if ad.endswith('.csv'))
+        gecici = os.path.join(dizin, 'sonuc.csv.tmp')
+        with open(gecici, 'wb') as hedef:
+            for i, ad in enumerate(parcalar):
+                with open(os.path.join(parca_dizini, ad), 'rb') as kaynak:
+                    if i:
+                        kaynak.readline()
+                    shutil.copyfileobj(kaynak, hedef, 1 << 20)
+        os.replace(gecici, os.path.join(dizin, 'sonuc.csv'))
+    
+    def _bakim(self):
+        """Olu process'lerin islerini kurtar, eski isleri temizle (BAKIM_ARALIGI'nda bir)"""
+        if time.monotonic() - self._son_bakim < BAKIM_ARALIGI:
+            return
+        self._son_bakim = time.monotonic()
+        self.sahipsizleri_kurtar()
+        self.temizle()
+    
+    def _isci(self, modeller):
+        """Isci dongusu: kuyruktan is al, yoksa bekle"""
+        while not self._dur.is_set():
+            try:
+                self._bakim()
+                hazir = modeller()
+                satir = self.al() if hazir is not None else None
+                if satir is None:
+                    self._uyandir.wait(BEKLEME)
+                    self._uyandir.clear()
+                    continue
+                self.isle(satir, *hazir)
+            except Exception as e:
+                print(f"Is kuyrugu hatasi: {e}")
+                self._dur.wait(BEKLEME)
+    
+    def baslat(self, modeller, isci_sayisi=ISCI_SAYISI):
+        """
+        isci_sayisi isci thread'i baslat
+        modeller(): (fuzzy, ml) ya da modeller henuz hazir degilse None (isler bekler).
+        """
+        self._dur.clear()
+        for i in range(isci_sayisi):
+            t = threading.Thread(target=self._isci, args=(modeller,), name=f'is-{i}', daemon=True)
+            t.start()
+            self._isciler.append(t)
+    
+    def durdur(self, zaman_asimi=None):
+        """Iscileri durdur; calisan isler parca sonunda kuyruga birakilir"""
+        self._dur.set()
+        self._uyandir.set()
+        for t in self._isciler:
+            t.join(zaman_asimi)
+        self._isciler = []
+
+
+def main():
+    """Kuyruktaki isleri API'den bagimsiz bir process'te isle"""
+    from fuzzy_model import DURULASTIRMA_YONTEMLERI
+    from model_paketi import paket_yukle
+    
+    parser = argparse.ArgumentParser(description="Kuyruktaki skorlama islerini isle")
+    parser.add_argument('--dizin', default=IS_DIZINI, help="Is kayitlari ve dosyalari")
+    parser.add_argument('--isci', type=int, default=1, help="Isci thread sayisi")
+    parser.add_argument('--veri', default=VARSAYILAN_CSV, help="Model istatistikleri ve ML modeli icin veri dosyasi")
+    parser.add_argument('--durulastirma', choices=DURULASTIRMA_YONTEMLERI, default='analitik',
+                        help="Fuzzy centroid yontemi")
+    parser.add_argument('--kurallar', default=KURAL_DOSYASI, help="Fuzzy kural dosyasi")
+    args = parser.parse_args()
+    
+    if args.isci <= 0:
+        parser.error("--isci pozitif olmali")
+    
+    print("Modeller yukleniyor...")
+    paket = paket_yukle(args.veri, args.durulastirma, kural_dosyasi=args.kurallar)
+    
+    kuyruk = IsKuyrugu(args.dizin)
+    kuyruk.sahipsizleri_kurtar()
+    kuyruk.baslat(lambda: (paket.fuzzy, paket.ml), args.isci)
+    print(f"\nIsler bekleniyor: {args.dizin} ({args.isci} isci, Ctrl+C ile dur)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nDurduruluyor (calisan isler kuyruga birakilir)...")
+        kuyruk.durdur()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
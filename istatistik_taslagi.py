@@ -0,0 +1,444 @@
+"""
+Istatistik Taslaklari
+Birlestirilebilir (mergeable) nicelik taslaklari ile tek geciste, veriyi
+bellekte tutmadan fiyat/metrekare istatistikleri. Yeni ilanlar geldikce
+sadece yeni satirlarin taslagi cikarilip eskisiyle birlestirilir; tum
+nicelikleri bastan hesaplamak (siralama) gerekmez.
+
+NicelikTaslagi logaritmik kovalar kullanir (DDSketch): her pozitif deger
+ceil(log_gamma(x)) kovasina sayilir, nicelik tahmini gercek degerden en
+fazla GORELI_HATA kadar (goreli) sapar. Iki taslagin birlesimi kova
+sayilarinin toplamidir ve tum veriden cikarilan taslakla aynidir.
+
+IstatistikOzeti tum veri icin taslaga ek olarak oda sayisi, isitma tipi ve
+ikisinin kombinasyonu segmentlerinde fiyat, metrekare ve m2 fiyati taslaklari
+tutar. Ozet veri onbellek dizinine (verinin yanina) yazilir; API /stats
+yanitlarini buradan verir.
+"""
+
+import os
+import json
+import numpy as np
+from veri_isleme import GIRIS_KOLONLARI
+
+
+# Nicelik tahminlerinde en buyuk goreli hata (tum veri / segmentler)
+GORELI_HATA = 0.001
+GRUP_GORELI_HATA = 0.01
+
+# Kayitli ozet bicimi degisirse artirilir
+TASLAK_SURUMU = 2
+
+# Veri onbellek dizinindeki ozet dosyasi
+TASLAK_DOSYASI = f'istatistik-v{TASLAK_SURUMU}.json'
+
+# Segment kirilimlari (giris adlari; kolonlar GIRIS_KOLONLARI'ndan)
+GRUPLAMALAR = (('oda_sayisi',), ('isitma_tipi',), ('oda_sayisi', 'isitma_tipi'))
+
+# Ozetin ihtiyac duydugu islenmis kolonlar
+OZET_KOLONLARI = ['Fiyat_Numeric', 'Metrekare_Numeric'] + [GIRIS_KOLONLARI[g] for g in ('oda_sayisi', 'isitma_tipi')]
+
+# Cok buyuk veride ozet bu kadar satirlik parcalarla cikarilip birlestirilir
+OZET_PARCASI = 1_000_000
+
+
+class NicelikTaslagi:
+    """
+    Pozitif degerler icin goreli hatali nicelik taslagi
+    Sifir ve negatif degerler tek bir 0 kovasinda sayilir, NaN'lar atlanir.
+    """
+    
+    def __init__(self, goreli_hata=GORELI_HATA):
+        self.goreli_hata = goreli_hata
+        self.gamma = (1 + goreli_hata) / (1 - goreli_hata)
+        self._log_gamma = np.log(self.gamma)
+        self.kovalar = np.empty(0, dtype=np.int64)
+        self.sayilar = np.empty(0, dtype=np.int64)
+        self.sifir = 0
+    
+    def __len__(self):
+        return int(self.sayilar.sum()) + self.sifir
+    
+    def _kova_no(self, pozitif):
+        """Pozitif degerlerin kova numaralari"""
+        return np.ceil(np.log(pozitif) / self._log_gamma).astype(np.int64)
+    
+    def ekle(self, degerler):
+        """Degerleri (vektorel) taslaga ekle"""
+        x = np.asarray(degerler, dtype=float).ravel()
+        x = x[~np.isnan(x)]
+        pozitif = x[x > 0]
+        self.sifir += len(x) - len(pozitif)
+        
+        # Kova numaralari dar bir araliktadir (float64'te en fazla ~7e5 kova): siralama yerine bincount
+        k = self._kova_no(pozitif)
+        if len(k):
+            en_kucuk = k.min()
+            sayilar = np.bincount(k - en_kucuk)
+            dolu = np.flatnonzero(sayilar)
+            self._kovalari_ekle(dolu + en_kucuk, sayilar[dolu])
+        return self
+    
+    @classmethod
+    def gruplu(cls, segment, n_segment, degerler, goreli_hata=GORELI_HATA):
+        """
+        segment[i] numarali segmentlerin taslaklari (liste), tum satirlar icin tek bincount
+        Her segmentin taslagi, o segmentin degerleriyle ekle cagrilmis taslakla aynidir.
+        """
+        taslaklar = [cls(goreli_hata) for _ in range(n_segment)]
+        x = np.asarray(degerler, dtype=float)
+        gecerli = ~np.isnan(x)
+        pozitif = gecerli & (x > 0)
+        sifirlar = np.bincount(segment[gecerli & ~pozitif], minlength=n_segment)
+        
+        k = taslaklar[0]._kova_no(x[pozitif]) if n_segment else np.empty(0, dtype=np.int64)
+        if len(k):
+            en_kucuk = k.min()
+            genislik = int(k.max() - en_kucuk) + 1
+            sayilar = np.bincount(segment[pozitif] * genislik + (k - en_kucuk),
+                                  minlength=n_segment * genislik).reshape(n_segment, genislik)
+        
+        for i, taslak in enumerate(taslaklar):
+            taslak.sifir = int(sifirlar[i])
+            if len(k):
+                dolu = np.flatnonzero(sayilar[i])
+                taslak.kovalar, taslak.sayilar = dolu + en_kucuk, sayilar[i, dolu]
+        return taslaklar
+    
+    def _kovalari_ekle(self, kovalar, sayilar):
+        """Kova sayimlarini mevcut sayimlarla topla (kovalar sirali kalir)"""
+        if len(kovalar) == 0:
+            return
+        tum, ters = np.unique(np.concatenate([self.kovalar, kovalar]), return_inverse=True)
+        toplam = np.zeros(len(tum), dtype=np.int64)
+        np.add.at(toplam, ters, np.concatenate([self.sayilar, sayilar]))
+        self.kovalar, self.sayilar = tum, toplam
+    
+    def birlestir(self, diger):
+        """Diger taslagin sayimlarini ekle (ayni goreli hata olmali)"""
+        if diger.goreli_hata != self.goreli_hata:
+            raise ValueError("Farkli goreli hatali taslaklar birlestirilemez")
+        self.sifir += diger.sifir
+        self._kovalari_ekle(diger.kovalar, diger.sayilar)
+        return self
+    
+    def _sira_degeri(self, sira):
+        """Artan siradaki sira. degerin tahmini (kova temsilcisi)"""
+        if sira < self.sifir:
+            return 0.0
+        k = self.kovalar[np.searchsorted(np.cumsum(self.sayilar), sira - self.sifir, side='right')]
+        return float(2 * self.gamma ** k / (self.gamma + 1))
+    
+    def nicelik(self, oran):
+        """np.nanquantile (dogrusal ara deger) ile ayni tanim, goreli hata payi icinde"""
+        n = len(self)
+        if n == 0:
+            return float('nan')
+        sira = oran * (n - 1)
+        alt = int(np.floor(sira))
+        ust = min(alt + 1, n - 1)
+        a, b = self._sira_degeri(alt), self._sira_degeri(ust)
+        return a + (sira - alt) * (b - a)
+    
+    def nicelikler(self, oranlar):
+        """Birden cok nicelik, kovalar uzerinde tek geciste (nicelik ile ayni degerler)"""
+        oranlar = np.asarray(oranlar, dtype=float)
+        n = len(self)
+        if n == 0:
+            return np.full(len(oranlar), np.nan)
+        
+        sira = oranlar * (n - 1)
+        alt = np.floor(sira).astype(np.int64)
+        ust = np.minimum(alt + 1, n - 1)
+        birikimli = np.cumsum(self.sayilar)
+        
+        def degerler(siralar):
+            if len(self.kovalar) == 0:
+                return np.zeros(len(siralar))
+            k = self.kovalar[np.searchsorted(birikimli, siralar - self.sifir, side='right')]
+            return np.where(siralar < self.sifir, 0.0, 2 * self.gamma ** k / (self.gamma + 1))
+        
+        a, b = degerler(alt), degerler(ust)
+        return a + (sira - alt) * (b - a)
+    
+    def sozluk(self):
+        return {'goreli_hata': self.goreli_hata, 'sifir': self.sifir,
+                'kovalar': self.kovalar.tolist(), 'sayilar': self.sayilar.tolist()}
+    
+    @classmethod
+    def sozlukten(cls, veri):
+        taslak = cls(veri['goreli_hata'])
+        taslak.sifir = veri['sifir']
+        taslak.kovalar = np.array(veri['kovalar'], dtype=np.int64)
+        taslak.sayilar = np.array(veri['sayilar'], dtype=np.int64)
+        return taslak
+
+
+class IstatistikTaslagi:
+    """
+    fuzzy_model.veri_istatistikleri ile ayni anahtarlar, birlestirilebilir taslaklardan
+    Ortalama ve satir sayisi kesin, nicelikler GORELI_HATA payi icindedir.
+    """
+    
+    def __init__(self, goreli_hata=GORELI_HATA):
+        self.fiyat = NicelikTaslagi(goreli_hata)
+        self.metrekare = NicelikTaslagi(goreli_hata)
+        self.fiyat_per_m2 = NicelikTaslagi(goreli_hata)
+        self.fiyat_toplam = 0.0
+        self.fiyat_sayisi = 0
+        self.satir = 0
+    
+    @classmethod
+    def veriden(cls, fiyat, metrekare, goreli_hata=GORELI_HATA):
+        return cls(goreli_hata).ekle(fiyat, metrekare)
+    
+    @classmethod
+    def gruplu(cls, segment, n_segment, fiyat, metrekare, goreli_hata=GORELI_HATA):
+        """segment[i] numarali segmentlerin taslaklari (liste), satirlar segmentlere ayrilmadan"""
+        fiyat = np.asarray(fiyat, dtype=float)
+        metrekare = np.asarray(metrekare, dtype=float)
+        fiyat_dolu = ~np.isnan(fiyat)
+        parcalar = zip(NicelikTaslagi.gruplu(segment, n_segment, fiyat, goreli_hata),
+                       NicelikTaslagi.gruplu(segment, n_segment, metrekare, goreli_hata),
+                       NicelikTaslagi.gruplu(segment, n_segment, fiyat / metrekare, goreli_hata),
+                       np.bincount(segment[fiyat_dolu], weights=fiyat[fiyat_dolu], minlength=n_segment).tolist(),
+                       np.bincount(segment[fiyat_dolu], minlength=n_segment).tolist(),
+                       np.bincount(segment, minlength=n_segment).tolist())
+        
+        taslaklar = []
+        for f, m, fm, toplam, sayi, satir in parcalar:
+            taslak = cls.__new__(cls)
+            taslak.fiyat, taslak.metrekare, taslak.fiyat_per_m2 = f, m, fm
+            taslak.fiyat_toplam, taslak.fiyat_sayisi, taslak.satir = toplam, sayi, satir
+            taslaklar.append(taslak)
+        return taslaklar
+    
+    def ekle(self, fiyat, metrekare):
+        """Yeni satirlarin fiyat ve metrekare dizilerini ekle"""
+        fiyat = np.asarray(fiyat, dtype=float)
+        metrekare = np.asarray(metrekare, dtype=float)
+        self.fiyat.ekle(fiyat)
+        self.metrekare.ekle(metrekare)
+        self.fiyat_per_m2.ekle(fiyat / metrekare)
+        self.fiyat_toplam += float(np.nansum(fiyat))
+        self.fiyat_sayisi += int(np.count_nonzero(~np.isnan(fiyat)))
+        self.satir += len(fiyat)
+        return self
+    
+    def birlestir(self, diger):
+        """Diger taslagi bu taslaga kat"""
+        self.fiyat.birlestir(diger.fiyat)
+        self.metrekare.birlestir(diger.metrekare)
+        self.fiyat_per_m2.birlestir(diger.fiyat_per_m2)
+        self.fiyat_toplam += diger.fiyat_toplam
+        self.fiyat_sayisi += diger.fiyat_sayisi
+        self.satir += diger.satir
+        return self
+    
+    def istatistikler(self):
+        """veri_istatistikleri ile ayni sozluk (her taslakta nicelikler tek geciste)"""
+        f = self.fiyat.nicelikler([0.05, 0.25, 0.5, 0.75, 0.90, 0.95]).tolist()
+        m = self.metrekare.nicelikler([0.05, 0.25, 0.5, 0.75, 0.95]).tolist()
+        fm = self.fiyat_per_m2.nicelikler([0.25, 0.5, 0.75, 0.90]).tolist()
+        return {
+            'fiyat_min': f[0],
+            'fiyat_p25': f[1],
+            'fiyat_median': f[2],
+            'fiyat_p75': f[3],
+            'fiyat_p90': f[4],
+            'fiyat_max': f[5],
+            'fiyat_mean': self.fiyat_toplam / self.fiyat_sayisi if self.fiyat_sayisi else float('nan'),
+            'metrekare_min': m[0],
+            'metrekare_p25': m[1],
+            'metrekare_median': m[2],
+            'metrekare_p75': m[3],
+            'metrekare_max': m[4],
+            'fiyat_per_m2_p25': fm[0],
+            'fiyat_per_m2_median': fm[1],
+            'fiyat_per_m2_p75': fm[2],
+            'fiyat_per_m2_p90': fm[3],
+            'veri_sayisi': self.satir
+        }
+    
+    def sozluk(self):
+        return {
+            'fiyat': self.fiyat.sozluk(),
+            'metrekare': self.metrekare.sozluk(),
+            'fiyat_per_m2': self.fiyat_per_m2.sozluk(),
+            'fiyat_toplam': self.fiyat_toplam,
+            'fiyat_sayisi': self.fiyat_sayisi,
+            'satir': self.satir
+        }
+    
+    @classmethod
+    def sozlukten(cls, veri):
+        taslak = cls.__new__(cls)
+        taslak.fiyat = NicelikTaslagi.sozlukten(veri['fiyat'])
+        taslak.metrekare = NicelikTaslagi.sozlukten(veri['metrekare'])
+        taslak.fiyat_per_m2 = NicelikTaslagi.sozlukten(veri['fiyat_per_m2'])
+        taslak.fiyat_toplam = veri['fiyat_toplam']
+        taslak.fiyat_sayisi = veri['fiyat_sayisi']
+        taslak.satir = veri['satir']
+        return taslak
+
+
+class IstatistikOzeti:
+    """
+    Tum veri ve segmentler (GRUPLAMALAR) icin birlestirilebilir istatistik taslaklari
+    Segment anahtari giris degerlerinin tuple'idir, ornegin ('oda_sayisi', 'isitma_tipi')
+    kiriliminda (3, 5). Segment degeri NaN olan satirlar o kirilimda sayilmaz.
+    """
+    
+    def __init__(self, goreli_hata=GORELI_HATA, grup_goreli_hata=GRUP_GORELI_HATA):
+        self.grup_goreli_hata = grup_goreli_hata
+        self.genel = IstatistikTaslagi(goreli_hata)
+        self.gruplar = {boyutlar: {} for boyutlar in GRUPLAMALAR}
+    
+    @classmethod
+    def veriden(cls, kolonlar, goreli_hata=GORELI_HATA, grup_goreli_hata=GRUP_GORELI_HATA):
+        """Islenmis kolonlardan (dict veya DataFrame, OZET_KOLONLARI) ozet"""
+        return cls(goreli_hata, grup_goreli_hata).ekle(kolonlar)
+    
+    def ekle(self, kolonlar):
+        """Yeni satirlari ekle: her parcada satirlar bir kez segmentlerine gore siralanir"""
+        diziler = {k: np.asarray(kolonlar[k]) for k in OZET_KOLONLARI}
+        for bas in range(0, len(diziler['Fiyat_Numeric']), OZET_PARCASI):
+            parca = slice(bas, bas + OZET_PARCASI)
+            self._parca_ekle({k: d[parca].astype(float) for k, d in diziler.items()})
+        return self
+    
+    def _parca_ekle(self, kolonlar):
+        fiyat, metrekare = kolonlar['Fiyat_Numeric'], kolonlar['Metrekare_Numeric']
+        self.genel.ekle(fiyat, metrekare)
+        
+        for boyutlar, segmentler in self.gruplar.items():
+            anahtarlar = np.column_stack([kolonlar[GIRIS_KOLONLARI[b]] for b in boyutlar])
+            satirlar = np.flatnonzero(~np.isnan(anahtarlar).any(axis=1))
+            degerler, segment = _segment_numaralari(anahtarlar[satirlar].astype(np.int64))
+            
+            # Tum segmentlerin taslaklari tek geciste (satirlar segmentlere ayrilmaz)
+            yeni = IstatistikTaslagi.gruplu(segment, len(degerler), fiyat[satirlar], metrekare[satirlar],
+                                            self.grup_goreli_hata)
+            for deger, taslak in zip(degerler.tolist(), yeni):
+                anahtar = tuple(deger)
+                if anahtar in segmentler:
+                    segmentler[anahtar].birlestir(taslak)
+                else:
+                    segmentler[anahtar] = taslak
+    
+    def birlestir(self, diger):
+        """Diger ozeti (ornegin yeni ilanlarinkini) bu ozete kat"""
+        self.genel.birlestir(diger.genel)
+        for boyutlar, segmentler in diger.gruplar.items():
+            for anahtar, taslak in segmentler.items():
+                if anahtar in self.gruplar[boyutlar]:
+                    self.gruplar[boyutlar][anahtar].birlestir(taslak)
+                else:
+                    self.gruplar[boyutlar][anahtar] = IstatistikTaslagi.sozlukten(taslak.sozluk())
+        return self
+    
+    def istatistikler(self):
+        """Tum veri istatistikleri (veri_istatistikleri ile ayni anahtarlar)"""
+        return self.genel.istatistikler()
+    
+    def segmentler(self, boyutlar, filtre=None, en_az=1):
+        """
+        Kirilimdaki segmentlerin istatistikleri, segment degerine gore sirali liste
+        filtre: {'oda_sayisi': 3} gibi; en_az: segmentteki en az kayit sayisi
+        """
+        boyutlar = tuple(boyutlar)
+        if boyutlar not in self.gruplar:
+            raise KeyError(f"Bilinmeyen kirilim: {','.join(boyutlar)}")
+        filtre = filtre or {}
+        
+        sonuc = []
+        for anahtar in sorted(self.gruplar[boyutlar]):
+            segment = dict(zip(boyutlar, anahtar))
+            taslak = self.gruplar[boyutlar][anahtar]
+            if taslak.satir < en_az or any(segment.get(b, deger) != deger for b, deger in filtre.items()):
+                continue
+            sonuc.append({**segment, **taslak.istatistikler()})
+        return sonuc
+    
+    def kaydet(self, yol):
+        """JSON olarak atomik yaz"""
+        veri = {
+            'surum': TASLAK_SURUMU,
+            'grup_goreli_hata': self.grup_goreli_hata,
+            'genel': self.genel.sozluk(),
+            'gruplar': {','.join(boyutlar): {'|'.join(map(str, anahtar)): taslak.sozluk()
+                                             for anahtar, taslak in segmentler.items()}
+                        for boyutlar, segmentler in self.gruplar.items()}
+        }
+        gecici = f"{yol}.{os.getpid()}.tmp"
+        with open(gecici, 'w', encoding='utf-8') as f:
+            json.dump(veri, f)
+        os.replace(gecici, yol)
+    
+    @classmethod
+    def yukle(cls, yol):
+        with open(yol, encoding='utf-8') as f:
+            veri = json.load(f)
+        if veri.get('surum') != TASLAK_SURUMU:
+            raise ValueError(f"Desteklenmeyen ozet surumu: {veri.get('surum')}")
+        
+        ozet = cls.__new__(cls)
+        ozet.grup_goreli_hata = veri['grup_goreli_hata']
+        ozet.genel = IstatistikTaslagi.sozlukten(veri['genel'])
+        ozet.gruplar = {boyutlar: {} for boyutlar in GRUPLAMALAR}
+        for ad, segmentler in veri['gruplar'].items():
+            ozet.gruplar[tuple(ad.split(','))] = {
+                tuple(int(v) for v in anahtar.split('|')): IstatistikTaslagi.sozlukten(taslak)
+                for anahtar, taslak in segmentler.items()}
+        return ozet
+
+
+def _segment_numaralari(anahtarlar):
+    """
+    (N, d) tam sayi anahtarlardan (benzersiz anahtarlar (S, d), satir basina 0..S-1 segment no)
+    Deger araliklari dar oldugundan siralama yerine bincount; genisse np.unique.
+    """
+    if len(anahtarlar) == 0:
+        return np.empty((0, anahtarlar.shape[1]), dtype=np.int64), np.empty(0, dtype=np.int64)
+    
+    en_kucuk = anahtarlar.min(axis=0)
+    genislik = tuple((anahtarlar.max(axis=0) - en_kucuk + 1).tolist())
+    hucre = int(np.prod(genislik))
+    if hucre > max(len(anahtarlar), 1 << 20):
+        degerler, segment = np.unique(anahtarlar, axis=0, return_inverse=True)
+        return degerler, segment.ravel()
+    
+    kod = np.ravel_multi_index(tuple((anahtarlar - en_kucuk).T), genislik)
+    dolu = np.flatnonzero(np.bincount(kod, minlength=hucre))
+    numara = np.empty(hucre, dtype=np.int64)
+    numara[dolu] = np.arange(len(dolu))
+    return np.column_stack(np.unravel_index(dolu, genislik)) + en_kucuk, numara[kod]
+
+
+def istatistik_ozeti(veri_dizini, kolonlar):
+    """
+    Veri onbellek dizinindeki kayitli ozet; yoksa kolonlardan hesaplanip dizine yazilir
+    kolonlar: OZET_KOLONLARI'ni iceren dict (mmap diziler olabilir) veya DataFrame.
+    """
+    yol = os.path.join(veri_dizini, TASLAK_DOSYASI)
+    try:
+        return IstatistikOzeti.yukle(yol)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+        pass
+    
+    ozet = IstatistikOzeti.veriden(kolonlar)
+    try:
+        os.makedirs(veri_dizini, exist_ok=True)
+        ozet.kaydet(yol)
+    except OSError as e:
+        print("Uyari: istatistik ozeti yazilamadi:", e)
+    return ozet
+
+
+def kayitli_istatistikler(veri_dizini):
+    """Veri onbellek dizininde ozet varsa tum veri istatistikleri, yoksa None"""
+    yol = os.path.join(veri_dizini, TASLAK_DOSYASI)
+    try:
+        return IstatistikOzeti.yukle(yol).istatistikler()
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+        return None
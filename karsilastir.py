@@ -3,7 +3,7 @@ Fuzzy vs Makine Ogrenmesi Karsilastirma
 Ayni input ile iki modeli de test eder
 """
 
-import pandas as pd
+from veri_isleme import veri_yukle
 from fuzzy_model import EmlakFuzzyModel
 from ml_model import EmlakMLModel
 import warnings
@@ -18,7 +18,7 @@ def main():
     
     # Veriyi yukle
     print("\nVeri yukleniyor...")
-    df = pd.read_csv('sehir_file/emlakverileri.csv')
+    df = veri_yukle('sehir_file/emlakverileri.csv')
     
     # Fuzzy model
     print("\nFuzzy model olusturuluyor...")
@@ -27,7 +27,7 @@ def main():
     # ML model
     print("\nML model egitiliyor...")
     ml_model = EmlakMLModel()
-    ml_model.veriyi_yukle_ve_isle()
+    ml_model.veriyi_yukle_ve_isle(df=df)
     ml_model.model_egit()
     
     print("\n" + "="*70)
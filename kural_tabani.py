@@ -0,0 +1,296 @@
+"""
+Fuzzy Kural Tabani
+Giris/cikti terimleri ve kurallar bir veri dosyasindan (fuzzy_kurallar.json)
+okunur ve yogun dizilere derlenir:
+    oncul   (kural, giris) terim kolonu indeksi, -1 = giris kullanilmiyor
+    veya    (kural,) True ise kosullar max (VEYA), degilse min (VE) ile birlesir
+    sonuc   (kural,) cikti terimi indeksi
+    agirlik (kural,) kural agirligi
+Ucgen terimlerde her giris en fazla iki komsu terimi aktif eder; kurallar
+terim -> kurallar ters indeksinden aday secilir ve sadece atesleyebilecek
+(satir, kural) ciftleri degerlendirilir.
+Degerlendirme tamamen numpy'dir; skfuzzy sadece referans icin kullanilir.
+"""
+
+import json
+import numpy as np
+
+
+# Varsayilan kural dosyasi
+KURAL_DOSYASI = 'fuzzy_kurallar.json'
+
+
+def ucgen(x, abc):
+    """Ucgen uyelik fonksiyonu (skfuzzy.trimf ile ayni degerler)"""
+    a, b, c = abc
+    x = np.asarray(x, dtype=float)
+    y = np.zeros(len(x))
+    
+    if a != b:
+        sol = (a < x) & (x < b)
+        y[sol] = (x[sol] - a) / float(b - a)
+    if b != c:
+        sag = (b < x) & (x < c)
+        y[sag] = (c - x[sag]) / float(c - b)
+    y[x == b] = 1
+    return y
+
+
+def evren_olustur(tanim):
+    """[baslangic, bitis (haric), adim] -> evren dizisi"""
+    return np.arange(*tanim).astype(float)
+
+
+def kural_tabani_yukle(yol=KURAL_DOSYASI):
+    """Kural dosyasini oku ve dogrula"""
+    with open(yol, encoding='utf-8') as f:
+        tanim = json.load(f)
+    kural_tabani_dogrula(tanim)
+    return tanim
+
+
+def kural_tabani_dogrula(tanim):
+    """Eksik/bilinmeyen terim ve baglaclar icin ValueError"""
+    for alan in ('girisler', 'cikti', 'kurallar'):
+        if alan not in tanim:
+            raise ValueError(f"Kural tabaninda '{alan}' alani yok")
+    
+    for ad, degisken in list(tanim['girisler'].items()) + [(tanim['cikti'].get('ad'), tanim['cikti'])]:
+        if len(degisken.get('evren', [])) != 3:
+            raise ValueError(f"{ad}: evren [baslangic, bitis, adim] olmali")
+        for terim, abc in degisken.get('terimler', {}).items():
+            if len(abc) != 3 or not abc[0] <= abc[1] <= abc[2]:
+                raise ValueError(f"{ad}.{terim}: ucgen [a, b, c] ve a <= b <= c olmali")
+    
+    cikti_terimleri = tanim['cikti']['terimler']
+    for i, kural in enumerate(tanim['kurallar']):
+        if not kural.get('eger'):
+            raise ValueError(f"Kural {i}: kosul yok")
+        for giris, terim in kural['eger'].items():
+            if terim not in tanim['girisler'].get(giris, {}).get('terimler', {}):
+                raise ValueError(f"Kural {i}: bilinmeyen terim {giris}.{terim}")
+        if kural.get('baglac', 've') not in ('ve', 'veya'):
+            raise ValueError(f"Kural {i}: baglac 've' veya 'veya' olmali")
+        if kural.get('ise') not in cikti_terimleri:
+            raise ValueError(f"Kural {i}: bilinmeyen sonuc {kural.get('ise')}")
+
+
+class KuralMatrisi:
+    """
+    Derlenmis kural tabani ve numpy degerlendiricisi
+    """
+    
+    def __init__(self, tanim, girisler):
+        self.tanim = tanim
+        self.girisler = list(girisler)
+        
+        # Giris terimleri: (giris indeksi, evren, uyelik) ve (giris, terim) -> kolon
+        self.terimler = []
+        self.terim_adlari = []
+        kolon = {}
+        for j, g in enumerate(self.girisler):
+            degisken = tanim['girisler'][g]
+            evren = evren_olustur(degisken['evren'])
+            for ad, abc in degisken['terimler'].items():
+                kolon[(g, ad)] = len(self.terimler)
+                self.terimler.append((j, evren, ucgen(evren, abc)))
+                self.terim_adlari.append((g, ad))
+        
+        # Cikti terimleri
+        cikti = tanim['cikti']
+        self.cikti_adi = cikti['ad']
+        self.cikti_etiketleri = list(cikti['terimler'])
+        self.cikti_ucgenleri = np.array([cikti['terimler'][e] for e in self.cikti_etiketleri], dtype=float)
+        self.cikti_evreni = evren_olustur(cikti['evren'])
+        self.cikti_mf = np.array([ucgen(self.cikti_evreni, abc) for abc in self.cikti_ucgenleri])
+        
+        # Kural matrisleri
+        kurallar = tanim['kurallar']
+        self.oncul = np.full((len(kurallar), len(self.girisler)), -1, dtype=np.int64)
+        for r, kural in enumerate(kurallar):
+            for g, ad in kural['eger'].items():
+                self.oncul[r, self.girisler.index(g)] = kolon[(g, ad)]
+        self.veya = np.array([k.get('baglac', 've') == 'veya' for k in kurallar])
+        self.sonuc = np.array([self.cikti_etiketleri.index(k['ise']) for k in kurallar], dtype=np.int64)
+        self.agirlik = np.array([k.get('agirlik', 1.0) for k in kurallar], dtype=float)
+        
+        # Kullanilmayan giris: VE icin 1 kolonu, VEYA icin 0 kolonu (min/max'i etkilemez)
+        bir, sifir = len(self.terimler), len(self.terimler) + 1
+        self._secim = np.where(self.oncul >= 0, self.oncul, np.where(self.veya[:, None], sifir, bir))
+        self._sonuc_kurallari = [np.flatnonzero(self.sonuc == t) for t in range(len(self.cikti_etiketleri))]
+        
+        # Ters indeks: giris terimi -> kosulunda o terim olan kurallar
+        self.terim_kurallari = [np.flatnonzero((self.oncul == k).any(axis=1)) for k in range(len(self.terimler))]
+        self._ters_indeks_hazirla()
+        
+        # Analitik centroid icin sabit kirilma noktalari: koseler, evren sinirlari ve
+        # ortusen terimlerin kenar-kenar kesisimleri
+        self._analitik_hazirla()
+    
+    def _kural_maskesi(self, kurallar):
+        """Kural indeksleri -> bit maskesi (kural r, r // 64. kelimenin r % 64. biti)"""
+        maske = np.zeros(self._kelime, dtype=np.uint64)
+        for r in kurallar:
+            maske[r // 64] |= np.uint64(1) << np.uint64(r % 64)
+        return maske
+    
+    def _ters_indeks_hazirla(self):
+        """
+        Ters indeksten her giris icin aktif terim deseni -> izinli kurallar tablosu
+        VE kurali her girisinde kosul terimi aktifse (ya da girisi kullanmiyorsa),
+        VEYA kurali herhangi bir kosul terimi aktifse atesler. Desen, girisin
+        terimlerinin aktiflik bitleridir; agirligi 0 olan kurallar hic atesmez.
+        """
+        R, G = len(self.oncul), len(self.girisler)
+        self._kelime = max(1, -(-R // 64))
+        etkin = self.agirlik > 0
+        self._ve_maskesi = self._kural_maskesi(np.flatnonzero(~self.veya & etkin))
+        self._veya_maskesi = self._kural_maskesi(np.flatnonzero(self.veya & etkin))
+        self._veya_var = bool(self.veya[etkin].any())
+        
+        giris_terimleri = [[k for k, (g, _, _) in enumerate(self.terimler) if g == j] for j in range(G)]
+        desen_sayisi = 1 << max(len(k) for k in giris_terimleri)
+        self._desen_agirligi = np.zeros((len(self.terimler), G))
+        self._izin_tablosu = np.zeros((G, desen_sayisi, self._kelime), dtype=np.uint64)
+        self._birlesim_tablosu = np.zeros((G, desen_sayisi, self._kelime), dtype=np.uint64)
+        for j, kolonlar in enumerate(giris_terimleri):
+            kullanmayan = self._kural_maskesi(np.flatnonzero(self.oncul[:, j] < 0))
+            for i, k in enumerate(kolonlar):
+                self._desen_agirligi[k, j] = 1 << i
+            for desen in range(1 << len(kolonlar)):
+                kurallar = [r for i, k in enumerate(kolonlar) if desen >> i & 1 for r in self.terim_kurallari[k]]
+                self._birlesim_tablosu[j, desen] = self._kural_maskesi(kurallar)
+                self._izin_tablosu[j, desen] = self._birlesim_tablosu[j, desen] | kullanmayan
+        self._girisler = np.arange(G)
+    
+    def aktif_kurallar(self, uyelik):
+        """(N, kural) atesleme derecesi > 0 olan kurallar (ters indeksten, dereceler hesaplanmadan)"""
+        aktif = uyelik[:, :len(self.terimler)] > 0
+        desen = (aktif @ self._desen_agirligi).astype(np.int64)
+        maske = np.bitwise_and.reduce(self._izin_tablosu[self._girisler, desen], axis=1) & self._ve_maskesi
+        if self._veya_var:
+            maske |= np.bitwise_or.reduce(self._birlesim_tablosu[self._girisler, desen], axis=1) & self._veya_maskesi
+        bitler = np.unpackbits(maske.view(np.uint8), axis=1, bitorder='little')
+        return bitler[:, :len(self.oncul)]
+    
+    def uyelikler(self, kirpik):
+        """(N, giris) -> (N, terim + 2) uyelik dereceleri (son iki kolon: 1 ve 0)"""
+        uyelik = np.empty((len(kirpik), len(self.terimler) + 2))
+        for k, (j, evren, mf) in enumerate(self.terimler):
+            # Evren disi degerler evren sinirina yapisir (skfuzzy gibi)
+            uyelik[:, k] = np.interp(kirpik[:, j], evren, mf)
+        uyelik[:, -2] = 1.0
+        uyelik[:, -1] = 0.0
+        return uyelik
+    
+    def atesleme(self, uyelik):
+        """(N, kural) kural atesleme dereceleri"""
+        secili = uyelik[:, self._secim]
+        if self.veya.any():
+            derece = np.where(self.veya, secili.max(axis=2), secili.min(axis=2))
+        else:
+            derece = secili.min(axis=2)
+        return derece * self.agirlik
+    
+    def kesimler(self, kirpik):
+        """(N, cikti terimi) kesim seviyeleri: ayni sonuca giden kurallar max ile birikir"""
+        return self.seyrek_kesimler(kirpik)[0]
+    
+    def seyrek_kesimler(self, kirpik):
+        """
+        Kesim seviyeleri ve satir basina atesleyen kural sayisi: sadece ters indeksin
+        aday gosterdigi (satir, kural) ciftlerinin derecesi hesaplanir
+        """
+        uyelik = self.uyelikler(kirpik)
+        satir, kural = np.nonzero(self.aktif_kurallar(uyelik))
+        secili = uyelik[satir[:, None], self._secim[kural]]
+        if self._veya_var:
+            derece = np.where(self.veya[kural], secili.max(axis=1), secili.min(axis=1)) * self.agirlik[kural]
+        else:
+            derece = secili.min(axis=1) * self.agirlik[kural]
+        
+        kesimler = np.zeros((len(kirpik), len(self.cikti_etiketleri)))
+        np.maximum.at(kesimler, (satir, self.sonuc[kural]), derece)
+        return kesimler, np.bincount(satir, minlength=len(kirpik))
+    
+    def yogun_kesimler(self, kirpik):
+        """Tum kurallar tum satirlarda (seyrek yolun referansi)"""
+        atesleme = self.atesleme(self.uyelikler(kirpik))
+        kesimler = np.zeros((len(kirpik), len(self.cikti_etiketleri)))
+        for t, kurallar in enumerate(self._sonuc_kurallari):
+            if len(kurallar):
+                kesimler[:, t] = atesleme[:, kurallar].max(axis=1)
+        return kesimler
+    
+    def _analitik_hazirla(self):
+        """Kesim seviyesinden bagimsiz kirilma noktalari ve ortusen terim ciftleri"""
+        abc = self.cikti_ucgenleri
+        self._alt, self._ust = self.cikti_evreni[0], self.cikti_evreni[-1]
+        
+        # Kenarlar dogru olarak: y = egim * x + kayma (dikey kenarlar atlanir)
+        kenarlar = []
+        for a, b, c in abc:
+            if b > a:
+                kenarlar.append((a, b, 1 / (b - a), -a / (b - a)))
+            if c > b:
+                kenarlar.append((b, c, -1 / (c - b), c / (c - b)))
+        
+        sabit = [self._alt, self._ust, *abc.ravel()]
+        for i, (x1, x2, e1, k1) in enumerate(kenarlar):
+            for y1, y2, e2, k2 in kenarlar[i + 1:]:
+                if e1 != e2:
+                    x = (k2 - k1) / (e1 - e2)
+                    if max(x1, y1) < x < min(x2, y2):
+                        sabit.append(x)
+        self._sabit_noktalar = np.clip(np.unique(sabit), self._alt, self._ust)
+        
+        # Destekleri ortusen (t, s) ciftleri: s'nin kesim seviyesi t'nin kenarlarini keser
+        K = len(abc)
+        self._seviye_ciftleri = np.array([(t, s) for t in range(K) for s in range(K)
+                                          if t == s or (abc[s, 0] < abc[t, 2] and abc[t, 0] < abc[s, 2])])
+    
+    def _cikti_uyelik(self, x, t):
+        """t. cikti ucgeninin x noktalarindaki uyeligi (dikey kenarlar dahil)"""
+        a, b, c = self.cikti_ucgenleri[t]
+        sol = (x - a) / (b - a) if b > a else (x >= a).astype(float)
+        sag = (c - x) / (c - b) if c > b else (x <= c).astype(float)
+        return np.clip(np.minimum(sol, sag), 0.0, 1.0)
+    
+    def analitik_centroid(self, kesimler):
+        """
+        Kesilmis ucgenlerin birlesiminin ornekleme yapmadan centroid'i
+        (evrenin ilk ve son noktasi arasinda, ornekli yontemle ayni aralik)
+        """
+        n = len(kesimler)
+        t, s = self._seviye_ciftleri[:, 0], self._seviye_ciftleri[:, 1]
+        a, b, c = (self.cikti_ucgenleri[t, i] for i in range(3))
+        
+        # s'nin kesim seviyesinin t'nin yukselen ve dusen kenarini kestigi noktalar
+        seviye = kesimler[:, s]
+        x = np.concatenate([
+            np.broadcast_to(self._sabit_noktalar, (n, len(self._sabit_noktalar))),
+            a + seviye * (b - a),
+            c - seviye * (c - b)
+        ], axis=1)
+        x = np.clip(x, self._alt, self._ust)
+        x.sort(axis=1)
+        
+        # Kirilma noktalari arasinda birlesim dogrusal: parcayi ic noktalarindan
+        # (1/4 ve 3/4) degerlendir, boylece dikey kenarlardaki sicrama sorun olmaz
+        dx = np.diff(x, axis=1)
+        orta = x[:, :-1] + 0.5 * dx
+        y1 = np.zeros_like(dx)
+        y3 = np.zeros_like(dx)
+        for k in range(len(self.cikti_ucgenleri)):
+            h = kesimler[:, k:k + 1]
+            np.maximum(y1, np.minimum(h, self._cikti_uyelik(orta - 0.25 * dx, k)), out=y1)
+            np.maximum(y3, np.minimum(h, self._cikti_uyelik(orta + 0.25 * dx, k)), out=y3)
+        
+        # Dogrusal parca uzerinde alan ve moment integrali
+        alan = 0.5 * dx * (y1 + y3)
+        moment = alan * orta + (y3 - y1) * dx * dx / 6.0
+        
+        toplam_alan = alan.sum(axis=1)
+        sonuc = moment.sum(axis=1) / np.fmax(toplam_alan, np.finfo(float).eps)
+        bos = toplam_alan <= 0
+        return sonuc, bos
@@ -0,0 +1,224 @@
+"""
+Metrikler
+Prometheus metin formatinda (text exposition) sayac, gosterge ve
+histogramlar. Harici bagimlilik yok; gozlem basina bir kilit ve
+ikili arama maliyeti vardir, production'da acik kalabilir.
+
+Kullanim:
+    ISTEK = Sayac('emlak_istek_toplam', 'Istek sayisi', ['yol'])
+    ISTEK.artir(yol='/predict')
+    ASAMA = Histogram('emlak_asama_suresi_saniye', 'Asama suresi', ['asama'])
+    with ASAMA.zamanla(asama='fuzzy'):
+        ...
+    KAYIT.metin()  # /metrics yaniti
+
+Gostergeler (anlik degerler) okuma aninda toplayicilarla uretilir.
+"""
+
+import time
+import bisect
+import functools
+import threading
+import contextlib
+import contextvars
+
+
+# Varsayilan histogram sinirlari (saniye)
+VARSAYILAN_SINIRLAR = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                       0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Istek basina zaman damgalari (middleware <-> endpoint)
+_istek_zamani = contextvars.ContextVar('istek_zamani', default=None)
+
+
+def _etiket_yazi(adlar, degerler, ek=()):
+    """{ad="deger",...} (etiket yoksa bos)"""
+    ciftler = list(zip(adlar, degerler)) + list(ek)
+    if not ciftler:
+        return ''
+    kacisli = (str(d).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, d in ciftler)
+    return '{' + ','.join(f'{a}="{d}"' for (a, _), d in zip(ciftler, kacisli)) + '}'
+
+
+def _sayi_yazi(deger):
+    """Prometheus sayi formati"""
+    if deger == float('inf'):
+        return '+Inf'
+    return repr(float(deger)) if isinstance(deger, float) else str(deger)
+
+
+class MetrikKaydi:
+    """Kayitli metrikler + okuma aninda deger ureten toplayicilar"""
+    
+    def __init__(self):
+        self._metrikler = []
+        self._toplayicilar = []
+    
+    def kaydet(self, metrik):
+        self._metrikler.append(metrik)
+        return metrik
+    
+    def toplayici_ekle(self, fn):
+        """fn() -> [(ad, tur, yardim, [(etiket_dict, deger), ...]), ...]"""
+        self._toplayicilar.append(fn)
+        return fn
+    
+    def metin(self):
+        """Tum metriklerin text exposition ciktisi"""
+        satirlar = []
+        for metrik in self._metrikler:
+            satirlar.extend(metrik.satirlar())
+        
+        for fn in self._toplayicilar:
+            for ad, tur, yardim, ornekler in fn():
+                satirlar.append(f'# HELP {ad} {yardim}')
+                satirlar.append(f'# TYPE {ad} {tur}')
+                for etiketler, deger in ornekler:
+                    satirlar.append(f'{ad}{_etiket_yazi(list(etiketler), list(etiketler.values()))} '
+                                    f'{_sayi_yazi(deger)}')
+        
+        return '\n'.join(satirlar) + '\n'
+
+
+# Varsayilan kayit
+KAYIT = MetrikKaydi()
+
+
+class _Metrik:
+    """Etiketli metrik tabani"""
+    tur = None
+    
+    def __init__(self, ad, yardim, etiketler=(), kayit=KAYIT):
+        self.ad = ad
+        self.yardim = yardim
+        self.etiketler = tuple(etiketler)
+        self._kilit = threading.Lock()
+        self._degerler = {}
+        if kayit is not None:
+            kayit.kaydet(self)
+    
+    def _anahtar(self, etiketler):
+        return tuple(etiketler[e] for e in self.etiketler)
+    
+    def _baslik(self):
+        return [f'# HELP {self.ad} {self.yardim}', f'# TYPE {self.ad} {self.tur}']
+
+
+class Sayac(_Metrik):
+    """Sadece artan sayac"""
+    tur = 'counter'
+    
+    def artir(self, miktar=1, **etiketler):
+        anahtar = self._anahtar(etiketler)
+        with self._kilit:
+            self._degerler[anahtar] = self._degerler.get(anahtar, 0) + miktar
+    
+    def satirlar(self):
+        with self._kilit:
+            degerler = dict(self._degerler)
+        return self._baslik() + [f'{self.ad}{_etiket_yazi(self.etiketler, a)} {_sayi_yazi(d)}'
+                                 for a, d in degerler.items()]
+
+
+class Histogram(_Metrik):
+    """Sabit sinirli histogram (kumulatif kovalar, toplam ve adet)"""
+    tur = 'histogram'
+    
+    def __init__(self, ad, yardim, etiketler=(), sinirlar=VARSAYILAN_SINIRLAR, kayit=KAYIT):
+        super().__init__(ad, yardim, etiketler, kayit)
+        self.sinirlar = tuple(sorted(sinirlar))
+    
+    def gozlemle(self, deger, **etiketler):
+        anahtar = self._anahtar(etiketler)
+        kova = bisect.bisect_left(self.sinirlar, deger)
+        with self._kilit:
+            durum = self._degerler.get(anahtar)
+            if durum is None:
+                durum = self._degerler[anahtar] = [[0] * (len(self.sinirlar) + 1), 0.0, 0]
+            durum[0][kova] += 1
+            durum[1] += deger
+            durum[2] += 1
+    
+    @contextlib.contextmanager
+    def zamanla(self, **etiketler):
+        """Blogun suresini gozlemle"""
+        bas = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.gozlemle(time.perf_counter() - bas, **etiketler)
+    
+    def satirlar(self):
+        with self._kilit:
+            degerler = {a: ([*d[0]], d[1], d[2]) for a, d in self._degerler.items()}
+        
+        satirlar = self._baslik()
+        for anahtar, (kovalar, toplam, adet) in degerler.items():
+            birikimli = 0
+            for sinir, sayi in zip(self.sinirlar + (float('inf'),), kovalar):
+                birikimli += sayi
+                satirlar.append(f'{self.ad}_bucket{_etiket_yazi(self.etiketler, anahtar, [("le", _sayi_yazi(sinir))])} '
+                                f'{birikimli}')
+            satirlar.append(f'{self.ad}_sum{_etiket_yazi(self.etiketler, anahtar)} {_sayi_yazi(toplam)}')
+            satirlar.append(f'{self.ad}_count{_etiket_yazi(self.etiketler, anahtar)} {adet}')
+        return satirlar
+
+
+class IstekMetrikMiddleware:
+    """
+    ASGI middleware: istek suresi/sayisi ve endpoint donusunden yanit
+    baslangicina kadar gecen serilestirme suresi
+    """
+    
+    def __init__(self, app, sure, sayac, serilestirme=None):
+        self.app = app
+        self.sure = sure
+        self.sayac = sayac
+        self.serilestirme = serilestirme
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        
+        zaman = {'baslangic': time.perf_counter(), 'endpoint_bitis': None}
+        belirtec = _istek_zamani.set(zaman)
+        durum = {'kod': 500}
+        
+        async def gonder(mesaj):
+            if mesaj['type'] == 'http.response.start':
+                durum['kod'] = mesaj['status']
+                if self.serilestirme is not None and zaman['endpoint_bitis'] is not None:
+                    self.serilestirme(time.perf_counter() - zaman['endpoint_bitis'])
+            await send(mesaj)
+        
+        try:
+            await self.app(scope, receive, gonder)
+        finally:
+            _istek_zamani.reset(belirtec)
+            
+            # Etiket sayisi sinirli kalsin: parametreli yollar sablonuyla (/isler/{is_id}),
+            # eslesmeyen yollar tek etikette
+            yol = getattr(scope.get('route'), 'path', scope['path']) if 'endpoint' in scope else 'diger'
+            self.sure.gozlemle(time.perf_counter() - zaman['baslangic'], yol=yol)
+            self.sayac.artir(yol=yol, durum=str(durum['kod']))
+
+
+def endpoint_olc(dogrulama):
+    """
+    Endpoint dekoratoru: giriste istegin alinmasindan beri gecen sureyi
+    (govde okuma + JSON ayristirma + pydantic dogrulamasi) dogrulama(sure)
+    ile bildirir, donuste serilestirme olcumu icin zaman damgasi birakir.
+    """
+    def dekorator(endpoint):
+        @functools.wraps(endpoint)
+        async def sarici(*args, **kwargs):
+            zaman = _istek_zamani.get()
+            if zaman is not None:
+                dogrulama(time.perf_counter() - zaman['baslangic'])
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if zaman is not None:
+                    zaman['endpoint_bitis'] = time.perf_counter()
+        return sarici
+    return dekorator
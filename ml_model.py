@@ -4,14 +4,59 @@ Random Forest ile egitilmis model
 Veri: emlakverileri.csv (2043 kayit)
 """
 
+import os
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from veri_isleme import veri_yukle, veriyi_isle, islenmis_mi, giris_matrisi, onbellek_dizini, GIRISLER
+from benzer_indeks import BenzerEvIndeksi, INDEKS_SURUMU
+from agac_ormani import DuzOrman
 import warnings
 warnings.filterwarnings('ignore')
 
+# sklearn (~1 sn import) sadece egitimde ve sklearn modeliyle tahminde, ilk
+# kullanimda import edilir; kayitli duz ormanla tahmin yapan API ve CLI'lar yuklemez.
+
+
+# Model girdileri (sira onemli)
+OZELLIKLER = ['Metrekare_Numeric', 'Oda_Numeric', 'Bina_Yasi_Numeric',
+              'Bulundugu_Kat_Numeric', 'Kat_Sayisi_Numeric', 'Isitma_Numeric']
+
+# Random Forest parametreleri
+RF_PARAMETRELERI = {
+    'n_estimators': 100,  # Agac sayisi
+    'max_depth': 20,      # Maksimum derinlik
+    'min_samples_split': 5,
+    'min_samples_leaf': 2,
+    'random_state': 42
+}
+
+# Tahmin araliginin alt ve ust nicelikleri (%80 aralik)
+ARALIK_NICELIKLERI = (0.1, 0.9)
+
+# Warm start ile buyutmede varsayilan ek agac sayisi
+EK_AGAC = 10
+
+# Bu sayiya kadar satir duzlestirilmis ormanla tahmin edilir; daha buyuk
+# toplularda (sklearn modeli yukluyse) sklearn'un Cython gezintisi daha hizli
+KUCUK_TOPLU = 256
+
+
+def temiz_kayitlar(df):
+    """Fiyati ve tum girisleri dolu kayitlar (egitim ve benzer ev indeksi bunlarla kurulur)"""
+    return df.dropna(subset=['Fiyat_Numeric'] + OZELLIKLER)
+
+
+def test_satirlari(bolme):
+    """
+    Modelin egitimde gormedigi test kayitlari (temiz kayit sira numaralari, sirali)
+    bolme: metriklerdeki [bas, son) parcalari; her parca train_test_split(test_size=0.2,
+    random_state=42) ile bolunur, 5 kayittan kisa parca tamamen egitime girer. Permutasyon
+    train_test_split ile aynidir (sklearn import edilmez).
+    """
+    parcalar = [bas + np.random.RandomState(42).permutation(son - bas)[:int(np.ceil(0.2 * (son - bas)))]
+                for bas, son in bolme if son - bas >= 5]
+    return np.sort(np.concatenate(parcalar)) if parcalar else np.empty(0, dtype=int)
+
 
 class EmlakMLModel:
     """
@@ -20,106 +65,90 @@ class EmlakMLModel:
     
     def __init__(self):
         self.model = None
+        self.orman = None
         self.df = None
         self.df_processed = None
-        
-    def veriyi_yukle_ve_isle(self, csv_path='sehir_file/emlakverileri.csv'):
-        """CSV verisini yukle ve isle"""
+        self.csv_path = None
+        self.metrikler = {}
+        self.versiyon = None
+        self.benzer_indeks = None
+    
+    def veriyi_yukle_ve_isle(self, csv_path='sehir_file/emlakverileri.csv', df=None):
+        """CSV verisini yukle ve isle (df verilirse tekrar okunmaz)"""
         print("\nVeri yukleniyor...")
-        self.df = pd.read_csv(csv_path)
+        self.csv_path = csv_path
+        self.df = df if df is not None else veri_yukle(csv_path)
         
         # String verileri sayiya cevir
-        self.df['Fiyat_Numeric'] = self.df['Fiyat'].str.replace('.', '', regex=False).str.replace(' TL', '').astype(float)
-        
-        # Oda sayisi: "2 + 1" -> 3
-        self.df['Oda_Numeric'] = self.df['Oda Sayısı'].str.split('+').apply(
-            lambda x: int(x[0].strip()) + int(x[1].strip()) if len(x) == 2 else int(x[0].strip())
-        )
-        
-        # Metrekare: "80 m2" -> 80
-        self.df['Metrekare_Numeric'] = self.df['Brüt m2'].str.replace(' m2', '').astype(float)
-        
-        # Kat sayisi: "6 Katlı" -> 6
-        self.df['Kat_Sayisi_Numeric'] = self.df['Kat Sayısı'].str.replace(' Katlı', '').astype(int)
-        
-        # Bulundugu kat
-        def kat_donustur(kat_str):
-            if 'Bodrum' in kat_str or 'Bahçe' in kat_str:
-                return -1
-            elif 'Zemin' in kat_str or 'Giriş' in kat_str:
-                return 0
-            elif 'Yüksek' in kat_str:
-                return 5
-            elif 'Ara' in kat_str:
-                return 2
-            else:
-                try:
-                    return int(kat_str.split('.')[0])
-                except:
-                    return 1
-        
-        self.df['Bulundugu_Kat_Numeric'] = self.df['Bulunduğu Kat'].apply(kat_donustur)
-        
-        # Bina yasi: "11 Yaşında" -> 11
-        def yas_donustur(yas_str):
-            if 'Sıfır' in yas_str:
-                return 0
-            elif 'Yaşında' in yas_str:
-                return int(yas_str.replace(' Yaşında', ''))
-            else:
-                return 10
-        
-        self.df['Bina_Yasi_Numeric'] = self.df['Bina Yaşı'].apply(yas_donustur)
-        
-        # Isitma tipi skorlama
-        isitma_skorlari = {
-            'Isıtma Yok': 0,
-            'Soba': 1,
-            'Doğalgaz Sobası': 2,
-            'Kat Kaloriferi': 4,
-            'Kombi': 5,
-            'Merkezi': 6,
-            'Merkezi (Pay Öl...': 6,
-            'Klima': 8,
-            'Yerden Isıtma': 9,
-            'Güneş Enerjisi': 10,
-            'Belirtilmemiş': 5
-        }
-        
-        self.df['Isitma_Numeric'] = self.df['Isınma Tipi'].map(isitma_skorlari).fillna(5)
+        if not islenmis_mi(self.df):
+            veriyi_isle(self.df)
         
         # Temiz veriyi sakla
-        self.df_processed = self.df.dropna(subset=['Fiyat_Numeric', 'Metrekare_Numeric', 'Oda_Numeric', 
-                                                     'Bina_Yasi_Numeric', 'Bulundugu_Kat_Numeric', 
-                                                     'Kat_Sayisi_Numeric', 'Isitma_Numeric'])
+        self.df_processed = temiz_kayitlar(self.df)
         
-        print(f"Veri islendi. Toplam kayit: {len(self.df_processed)}")
+        # Benzer ev aramasi icin (m2, oda) indeksi
+        self.benzer_indeks = BenzerEvIndeksi(self.df_processed)
         
+        print(f"Veri islendi. Toplam kayit: {len(self.df_processed)}")
+    
     def model_egit(self):
         """Random Forest modelini egit"""
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.model_selection import train_test_split
         print("\nModel egitiliyor...")
         
         # Feature'lari hazirla
-        X = self.df_processed[['Metrekare_Numeric', 'Oda_Numeric', 'Bina_Yasi_Numeric', 
-                                'Bulundugu_Kat_Numeric', 'Kat_Sayisi_Numeric', 'Isitma_Numeric']]
+        X = self.df_processed[OZELLIKLER]
         y = self.df_processed['Fiyat_Numeric']
         
         # Train-test split
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Random Forest modeli
-        self.model = RandomForestRegressor(
-            n_estimators=100,  # Agac sayisi
-            max_depth=20,      # Maksimum derinlik
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1
-        )
+        self.model = RandomForestRegressor(**RF_PARAMETRELERI, n_jobs=-1)
         
         self.model.fit(X_train, y_train)
+        self.orman = DuzOrman.rf_den(self.model)
+        self.orman.yaprak_dagilimi_ekle(X_train, y_train)
         
-        # Test performansi
+        self._metrikleri_hesapla(X_test, y_test, len(X_train), [[0, len(X)]])
+    
+    def model_buyut(self, eski_satir, ek_agac=EK_AGAC):
+        """
+        Mevcut ormana ek_agac yeni agac ekle (warm start), eski agaclar degismez
+        df_processed'in ilk eski_satir kaydi modelin egitildigi veridir. Eski veride
+        modelin kendi train/test bolmesi (metriklerdeki 'bolme', yoksa model_egit'inki)
+        yeniden uretilir, yeni kayitlar ayrica bolunur; yeni agaclar train kisimlariyla
+        egitilir, metrikler test kisimlarindan.
+        """
+        from sklearn.model_selection import train_test_split
+        print(f"\nModel buyutuluyor (+{ek_agac} agac)...")
+        
+        X = self.df_processed[OZELLIKLER]
+        y = self.df_processed['Fiyat_Numeric']
+        bolme = self.metrikler.get('bolme')
+        if not bolme or bolme[-1][1] != eski_satir:
+            bolme = [[0, eski_satir]]
+        bolme = bolme + [[eski_satir, len(X)]]
+        bolmeler = []
+        for bas, son in bolme:
+            if son - bas >= 5:
+                bolmeler.append(train_test_split(X.iloc[bas:son], y.iloc[bas:son], test_size=0.2, random_state=42))
+            else:
+                bolmeler.append((X.iloc[bas:son], X.iloc[:0], y.iloc[bas:son], y.iloc[:0]))
+        X_train, X_test, y_train, y_test = (pd.concat(parca) for parca in zip(*bolmeler))
+        
+        self.model.set_params(warm_start=True, n_estimators=len(self.model.estimators_) + ek_agac)
+        self.model.fit(X_train, y_train)
+        self.model.set_params(warm_start=False)
+        self.orman = DuzOrman.rf_den(self.model)
+        self.orman.yaprak_dagilimi_ekle(X_train, y_train)
+        
+        self._metrikleri_hesapla(X_test, y_test, len(X_train), bolme)
+    
+    def _metrikleri_hesapla(self, X_test, y_test, egitim_sayisi, bolme):
+        """Test seti performansi (bolme: test_satirlari'nin kullandigi train/test parcalari)"""
+        from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
         y_pred = self.model.predict(X_test)
         
         mae = mean_absolute_error(y_test, y_pred)
@@ -127,71 +156,164 @@ class EmlakMLModel:
         r2 = r2_score(y_test, y_pred)
         mape = np.mean(np.abs((y_test - y_pred) / y_test)) * 100
         
-        print(f"\nModel egitildi!")
+        # Tahmin araliginin test setindeki gercek kapsama orani
+        _, (alt, ust) = self.orman.aralik(X_test, ARALIK_NICELIKLERI)
+        kapsama = np.mean((y_test >= alt) & (y_test <= ust)) * 100
+        
+        self.metrikler = {
+            'mae': float(mae),
+            'rmse': float(rmse),
+            'r2': float(r2),
+            'mape': float(mape),
+            'aralik_kapsama': float(kapsama),
+            'aralik_yontemi': self.orman.aralik_yontemi,
+            'egitim_sayisi': egitim_sayisi,
+            'test_sayisi': len(X_test),
+            'bolme': bolme
+        }
+        self.versiyon = None
+        
+        print(f"\nModel egitildi! ({len(self.model.estimators_)} agac)")
         print(f"Test seti performansi:")
         print(f"  MAE: {mae:,.0f} TL")
         print(f"  RMSE: {rmse:,.0f} TL")
         print(f"  R2: {r2:.4f}")
         print(f"  MAPE: {mape:.2f}%")
+        print(f"  %{(ARALIK_NICELIKLERI[1] - ARALIK_NICELIKLERI[0]) * 100:.0f} aralik kapsamasi: {kapsama:.1f}%")
+    
+    def model_yukle_veya_egit(self, kayit_dizini=None):
+        """Kayitli model veriyle uyumluysa yukle, degilse egit ve kaydet"""
+        from model_kayit import ModelKayit
+        
+        kayit = ModelKayit(kayit_dizini) if kayit_dizini else ModelKayit()
+        veri_hash = kayit.veri_hash(self.csv_path)
+        
+        # Ayni anda baslayan worker'lar tek sefer egitsin
+        with kayit.kilit():
+            artefakt = kayit.yukle(veri_hash)
+            if artefakt is None:
+                print("Uyumlu kayitli model yok, egitiliyor...")
+                self.model_egit()
+                self.versiyon = kayit.kaydet(self.model, veri_hash, self.metrikler, self.orman)
+                print("Model kaydedildi:", self.versiyon)
+                return
+        
+        self.model, meta = artefakt
+        self.metrikler = meta['metrikler']
+        self.versiyon = meta['versiyon']
+        self.orman = kayit.orman_yukle(self.versiyon, self.model)
+        print("Kayitli model yuklendi:", self.versiyon)
+    
+    def paylasimli_yukle(self, csv_path='sehir_file/emlakverileri.csv', kayit_dizini=None, sklearn_isleri=None):
+        """
+        Kayitli duzlestirilmis ormani ve benzer ev indeksini mmap ile ac, DataFrame
+        ve sklearn modeli tutma (sklearn agaclari yuklerken kopyalar); ayni makinedeki
+        process'ler orman ve indeks dizilerini sayfa paylasimli kullanir.
+        Ilk acilista (uyumlu kayit/indeks yoksa) veri islenir, gerekirse model egitilir
+        ve ikisi de diske yazilir. Kayit hazirsa sklearn import edilmez, model.joblib okunmaz.
+        sklearn_isleri verilirse sklearn modeli de yuklenir: KUCUK_TOPLU'dan buyuk toplular
+        onunla, bu kadar thread'le tahmin edilir (toplu skorlama; buyuk toplularda daha hizli).
+        """
+        from model_kayit import ModelKayit
         
+        kayit = ModelKayit(kayit_dizini) if kayit_dizini else ModelKayit()
+        self.csv_path = csv_path
+        veri_hash = kayit.veri_hash(csv_path)
+        indeks_dizini = os.path.join(onbellek_dizini(csv_path, veri_hash), f'benzer-v{INDEKS_SURUMU}')
+        
+        versiyon, meta = kayit.uyumlu_versiyon(veri_hash)
+        if versiyon is None or not BenzerEvIndeksi.kayitli_mi(indeks_dizini):
+            self.veriyi_yukle_ve_isle(csv_path)
+            self.model_yukle_veya_egit(kayit_dizini)
+            self.benzer_indeks.kaydet(indeks_dizini)
+            versiyon, meta = kayit.uyumlu_versiyon(veri_hash)
+        
+        # Egitimden kalan bellek ici kopyalar yerine mmap'li diziler
+        self.df = self.df_processed = None
+        if versiyon is not None:
+            self.metrikler = meta['metrikler']
+            self.versiyon = versiyon
+            self.orman = kayit.orman_yukle(versiyon, self.model)
+            self.model = None
+            if sklearn_isleri is not None:
+                self.model = kayit.model_oku(versiyon)
+                self.model.n_jobs = sklearn_isleri
+        self.benzer_indeks = BenzerEvIndeksi.ac(indeks_dizini)
+        print("Paylasimli model acildi:", self.versiyon)
+    
     def predict(self, ozellikler):
         """Fiyat tahmini yap"""
-        if self.model is None:
+        if self.model is None and self.orman is None:
             print("Hata: Model egitilmemis!")
             return None
         
         # Feature'lari hazirla
-        X = pd.DataFrame([{
-            'Metrekare_Numeric': ozellikler['metrekare'],
-            'Oda_Numeric': ozellikler['oda_sayisi'],
-            'Bina_Yasi_Numeric': ozellikler['bina_yasi'],
-            'Bulundugu_Kat_Numeric': ozellikler['bulundugu_kat'],
-            'Kat_Sayisi_Numeric': ozellikler['bina_kat_sayisi'],
-            'Isitma_Numeric': ozellikler['isitma_tipi']
-        }])
-        
-        tahmin = self.model.predict(X)[0]
+        X = np.array([[
+            ozellikler['metrekare'],
+            ozellikler['oda_sayisi'],
+            ozellikler['bina_yasi'],
+            ozellikler['bulundugu_kat'],
+            ozellikler['bina_kat_sayisi'],
+            ozellikler['isitma_tipi']
+        ]], dtype=float)
+        
+        tahmin = self._tahmin(X)[0]
         return tahmin
     
+    def predict_aralik(self, ozellikler):
+        """(tahmin, alt, ust): fiyat tahmini ve ARALIK_NICELIKLERI araligi"""
+        if self.orman is None:
+            print("Hata: Model egitilmemis!")
+            return None
+        
+        X = np.array([[ozellikler[g] for g in GIRISLER]], dtype=float)
+        tahmin, (alt, ust) = self.orman.aralik(X, ARALIK_NICELIKLERI)
+        return tahmin[0], alt[0], ust[0]
+    
+    def predict_batch(self, X):
+        """
+        Toplu fiyat tahmini (tek DataFrame, tek predict cagrisi)
+        X: (N, 6) dizi (GIRISLER sirasinda), GIRISLER veya *_Numeric kolonlu
+        DataFrame ya da ozellik dict listesi
+        """
+        if self.model is None and self.orman is None:
+            print("Hata: Model egitilmemis!")
+            return None
+        
+        girdi = giris_matrisi(X)
+        if len(girdi) == 0:
+            return np.empty(0)
+        
+        return self._tahmin(girdi)
+    
+    def predict_batch_aralik(self, X):
+        """
+        Toplu tahmin ve aralik: (tahmin, (alt, ust)) tek orman gezintisinden
+        Tahmin predict_batch ile aynidir; aralik yaprak dagilimi olan ormanda quantile
+        forest, olmayanda (eski kayitli modeller) agac tahminlerinin nicelikleri.
+        """
+        if self.orman is None:
+            print("Hata: Model egitilmemis!")
+            return None
+        
+        girdi = giris_matrisi(X)
+        if len(girdi) == 0:
+            return np.empty(0), np.empty((len(ARALIK_NICELIKLERI), 0))
+        
+        return self.orman.aralik(girdi, ARALIK_NICELIKLERI)
+    
+    def _tahmin(self, X):
+        """(N, 6) matris icin tahmin: kucuk toplular duz ormanla, buyukler sklearn ile"""
+        if self.orman is not None and (len(X) <= KUCUK_TOPLU or self.model is None):
+            return self.orman.tahmin(X)
+        return self.model.predict(pd.DataFrame(X, columns=OZELLIKLER))
+    
     def benzer_evler_bul(self, ozellikler, n=5):
-        """Benzer evleri bul ve linklerini dondur"""
-        if self.df_processed is None:
+        """Benzer evleri bul ve linklerini dondur (ayni oda sayisinda m2'ce en yakin n ev)"""
+        if self.benzer_indeks is None:
             return []
         
-        # Benzer evleri filtrele (m2 ve oda sayisina gore)
-        m2_min = ozellikler['metrekare'] - 20
-        m2_max = ozellikler['metrekare'] + 20
-        
-        benzer = self.df_processed[
-            (self.df_processed['Metrekare_Numeric'] >= m2_min) & 
-            (self.df_processed['Metrekare_Numeric'] <= m2_max) &
-            (self.df_processed['Oda_Numeric'] == ozellikler['oda_sayisi'])
-        ]
-        
-        if len(benzer) == 0:
-            # Sadece m2'ye gore ara
-            benzer = self.df_processed[
-                (self.df_processed['Metrekare_Numeric'] >= m2_min) & 
-                (self.df_processed['Metrekare_Numeric'] <= m2_max)
-            ]
-        
-        if len(benzer) > 0:
-            # Rastgele n tane sec
-            ornekler = benzer.sample(min(n, len(benzer)))
-            
-            sonuclar = []
-            for idx, row in ornekler.iterrows():
-                sonuclar.append({
-                    'url': row['URL'],
-                    'fiyat': row['Fiyat_Numeric'],
-                    'metrekare': row['Metrekare_Numeric'],
-                    'oda': row['Oda_Numeric'],
-                    'yas': row['Bina_Yasi_Numeric']
-                })
-            
-            return sonuclar
-        
-        return []
+        return self.benzer_indeks.bul(ozellikler['metrekare'], ozellikler['oda_sayisi'], n=n)
 
 
 def main():
@@ -0,0 +1,307 @@
+"""
+Model Ayarlama
+Random Forest parametre izgarasini k katli capraz dogrulamayla dener. Her
+(aday, kat) isi ayri process'te egitilir; sonuclar verinin onbellek dizinine
+kat kat yazilir, yarida kesilen calisma tekrar baslatilinca sadece eksik
+katlari hesaplar.
+
+Her aday icin katlarin ortalamasi (MAE, RMSE, MAPE, R2), duz ormanla tek satir
+ve toplu tahmin gecikmesi (API'nin kullandigi yol) ve orman boyutu raporlanir.
+Hata, tek satir gecikmesi ve boyutta baska bir aday tarafindan geride
+birakilmayan adaylar Pareto cephesindedir (*).
+
+Gecikmeler katin egitildigi process'te olculur; --isci cekirdek sayisina
+yakinsa isciler birbirini yavaslatir, adaylari karsilastirmak icin yeterlidir.
+
+Kullanim:
+    python model_ayarla.py
+    python model_ayarla.py --kat 5 --isci 0
+    python model_ayarla.py --izgara n_estimators=50,100,200 max_depth=10,20,None --cikti ayar.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from veri_isleme import kolonlari_ac, onbellek_dizini, GIRISLER, GIRIS_KOLONLARI, VARSAYILAN_CSV
+from ml_model import RF_PARAMETRELERI
+from agac_ormani import DuzOrman
+from model_kayit import sklearn_versiyonu
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Varsayilan aranan parametreler (digerleri RF_PARAMETRELERI'nden)
+PARAMETRE_IZGARASI = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [10, 20, None],
+    'min_samples_leaf': [1, 2, 5]
+}
+
+# Izgarada RF_PARAMETRELERI disinda kullanilabilecek RandomForestRegressor parametreleri
+EK_PARAMETRELER = ('max_features', 'max_samples', 'max_leaf_nodes', 'bootstrap')
+
+# Varsayilan kat sayisi
+KAT_SAYISI = 5
+
+# Kat sonuclari bicimi degisirse artirilir
+AYAR_SURUMU = 1
+
+# Gecikme olcumleri: tek satir cagri sayisi ve toplu tahmin satir sayisi
+TEK_CAGRI = 200
+TOPLU_SATIR = 1000
+
+# Isci process durumu (_isci_baslat doldurur)
+_ISCI = {}
+
+
+def egitim_verisi(csv_path=VARSAYILAN_CSV):
+    """Fiyati ve tum girisleri dolu kayitlarin (X, y) dizileri (ml_model.temiz_kayitlar ile ayni)"""
+    kolonlar = kolonlari_ac(csv_path)
+    X = np.column_stack([np.asarray(kolonlar[GIRIS_KOLONLARI[g]], dtype=float) for g in GIRISLER])
+    y = np.asarray(kolonlar['Fiyat_Numeric'], dtype=float)
+    gecerli = ~np.isnan(X).any(axis=1) & ~np.isnan(y)
+    return X[gecerli], y[gecerli]
+
+
+def adaylari_uret(izgara):
+    """Izgaradaki tum parametre kombinasyonlari (RF_PARAMETRELERI ile tamamlanmis)"""
+    adlar = list(izgara)
+    return [{**RF_PARAMETRELERI, **dict(zip(adlar, degerler))}
+            for degerler in itertools.product(*(izgara[ad] for ad in adlar))]
+
+
+def aday_anahtari(parametreler, kat_sayisi, seed):
+    """Kat sonuclarinin onbellek anahtari (parametreler, katlama ve sklearn surumu)"""
+    icerik = json.dumps({'parametreler': parametreler, 'kat': kat_sayisi, 'seed': seed,
+                         'sklearn': sklearn_versiyonu()}, sort_keys=True)
+    return hashlib.sha256(icerik.encode('utf-8')).hexdigest()[:16]
+
+
+def katlar(n, kat_sayisi, seed):
+    """Her satirin kat numarasi (karistirilmis, katlar arasi en fazla 1 satir fark)"""
+    kat = np.empty(n, dtype=np.int64)
+    kat[np.random.default_rng(seed).permutation(n)] = np.arange(n) % kat_sayisi
+    return kat
+
+
+def _sure_olc(fn, tekrar):
+    """fn'in tekrar cagrisinin medyan suresi (sn)"""
+    sureler = []
+    for _ in range(tekrar):
+        bas = time.perf_counter()
+        fn()
+        sureler.append(time.perf_counter() - bas)
+    return float(np.median(sureler))
+
+
+def kat_degerlendir(X, y, kat, k, parametreler):
+    """k. kati test, digerlerini egitim kumesi yaparak adayi egit ve olc"""
+    from sklearn.ensemble import RandomForestRegressor
+    
+    test = kat == k
+    bas = time.perf_counter()
+    model = RandomForestRegressor(**parametreler, n_jobs=1).fit(X[~test], y[~test])
+    egitim_sn = time.perf_counter() - bas
+    orman = DuzOrman.rf_den(model)
+    
+    y_test = y[test]
+    y_pred = orman.tahmin(X[test])
+    hata = y_pred - y_test
+    
+    X_tek = X[test][:1]
+    X_toplu = np.resize(X[test], (TOPLU_SATIR, X.shape[1]))
+    return {
+        'mae': float(np.mean(np.abs(hata))),
+        'rmse': float(np.sqrt(np.mean(hata ** 2))),
+        'mape': float(np.mean(np.abs(hata / y_test)) * 100),
+        'r2': float(1 - np.sum(hata ** 2) / np.sum((y_test - y_test.mean()) ** 2)),
+        'egitim_sn': egitim_sn,
+        'tek_satir_ms': _sure_olc(lambda: orman.tahmin(X_tek), TEK_CAGRI) * 1000,
+        'toplu_satir_us': _sure_olc(lambda: orman.tahmin(X_toplu), 5) / TOPLU_SATIR * 1e6,
+        'dugum_sayisi': orman.dugum_sayisi(),
+        'boyut_mb': sum(np.asarray(d).nbytes for d in orman._diziler.values()) / 1e6,
+        'egitim_sayisi': int(np.count_nonzero(~test)),
+        'test_sayisi': int(np.count_nonzero(test))
+    }
+
+
+def _isci_baslat(csv_path, kat_sayisi, seed):
+    """Isci process'te egitim verisini (mmap'li kolonlardan) ve katlari bir kez hazirla"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        X, y = egitim_verisi(csv_path)
+    _ISCI.update(X=X, y=y, kat=katlar(len(y), kat_sayisi, seed))
+
+
+def _isci_kat(is_):
+    parametreler, k = is_
+    return kat_degerlendir(_ISCI['X'], _ISCI['y'], _ISCI['kat'], k, parametreler)
+
+
+def _kat_yolu(dizin, anahtar, k):
+    return os.path.join(dizin, f"{anahtar}-k{k}.json")
+
+
+def _kat_oku(yol):
+    """Kayitli kat sonucu (yoksa veya bozuksa None)"""
+    try:
+        with open(yol, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _kat_yaz(yol, sonuc):
+    """Kat sonucunu gecici dosya + os.replace ile yaz"""
+    gecici = f"{yol}.{os.getpid()}.tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    os.replace(gecici, yol)
+
+
+def _katlari_hesapla(adaylar, eksik, csv_path, kat_sayisi, isci, seed):
+    """Eksik (aday, kat) islerini hesapla, bittikce ((aday, kat), sonuc) uret"""
+    if not eksik:
+        return
+    isci = isci or os.cpu_count() or 1
+    if isci == 1:
+        _isci_baslat(csv_path, kat_sayisi, seed)
+        for i, k in eksik:
+            yield (i, k), _isci_kat((adaylar[i], k))
+        return
+    
+    with ProcessPoolExecutor(min(isci, len(eksik)), initializer=_isci_baslat,
+                             initargs=(csv_path, kat_sayisi, seed)) as havuz:
+        isler = {havuz.submit(_isci_kat, (adaylar[i], k)): (i, k) for i, k in eksik}
+        try:
+            for gelecek in as_completed(isler):
+                yield isler[gelecek], gelecek.result()
+        finally:
+            havuz.shutdown(cancel_futures=True)
+
+
+def ozetle(parametreler, kat_sonuclari):
+    """Adayin kat sonuclarini birlestir: hatalar ortalama (+ std), gecikmeler medyan"""
+    ozet = {'parametreler': parametreler}
+    for metrik in ('mae', 'rmse', 'mape', 'r2', 'egitim_sn'):
+        degerler = [s[metrik] for s in kat_sonuclari]
+        ozet[metrik] = float(np.mean(degerler))
+        ozet[metrik + '_std'] = float(np.std(degerler))
+    for metrik in ('tek_satir_ms', 'toplu_satir_us', 'dugum_sayisi', 'boyut_mb'):
+        ozet[metrik] = float(np.median([s[metrik] for s in kat_sonuclari]))
+    return ozet
+
+
+def pareto_cephesi(ozetler, metrikler=('mape', 'tek_satir_ms', 'boyut_mb')):
+    """Hicbir metrikte daha kotu olmayip birinde daha iyi olan baska aday yoksa True"""
+    degerler = np.array([[o[m] for m in metrikler] for o in ozetler])
+    return [not np.any(np.all(degerler <= d, axis=1) & np.any(degerler < d, axis=1)) for d in degerler]
+
+
+def ayarla(csv_path=VARSAYILAN_CSV, izgara=None, kat_sayisi=KAT_SAYISI, isci=1, seed=42, onbellek=True):
+    """
+    Izgaradaki adaylari capraz dogrula, MAPE'ye gore sirali ozet listesi dondur
+    Onbellekte olan katlar yeniden egitilmez; yeni katlar biter bitmez yazilir.
+    """
+    izgara = izgara or PARAMETRE_IZGARASI
+    adaylar = adaylari_uret(izgara)
+    dizin = os.path.join(onbellek_dizini(csv_path), f'ayar-v{AYAR_SURUMU}')
+    os.makedirs(dizin, exist_ok=True)
+    
+    anahtarlar = [aday_anahtari(p, kat_sayisi, seed) for p in adaylar]
+    sonuclar = {}
+    eksik = []
+    for i, (parametreler, anahtar) in enumerate(zip(adaylar, anahtarlar)):
+        for k in range(kat_sayisi):
+            sonuc = _kat_oku(_kat_yolu(dizin, anahtar, k)) if onbellek else None
+            if sonuc is not None:
+                sonuclar[i, k] = sonuc
+            else:
+                eksik.append((i, k))
+    print(f"{len(adaylar)} aday x {kat_sayisi} kat: {len(sonuclar)} onbellekte, {len(eksik)} hesaplanacak")
+    
+    bas = time.perf_counter()
+    for n, ((i, k), sonuc) in enumerate(_katlari_hesapla(adaylar, eksik, csv_path, kat_sayisi, isci, seed), 1):
+        sonuclar[i, k] = sonuc
+        _kat_yaz(_kat_yolu(dizin, anahtarlar[i], k), sonuc)
+        print(f"  [{n}/{len(eksik)}] aday {i + 1}, kat {k + 1}: MAPE {sonuc['mape']:.2f}% "
+              f"({time.perf_counter() - bas:.0f} sn)", flush=True)
+    
+    ozetler = [ozetle(p, [sonuclar[i, k] for k in range(kat_sayisi)]) for i, p in enumerate(adaylar)]
+    for ozet, pareto in zip(ozetler, pareto_cephesi(ozetler)):
+        ozet['pareto'] = pareto
+    return sorted(ozetler, key=lambda o: o['mape'])
+
+
+def _deger_coz(metin):
+    """'10' -> 10, '0.5' -> 0.5, 'None' -> None, 'sqrt' -> 'sqrt'"""
+    if metin in ('None', 'none'):
+        return None
+    try:
+        return json.loads(metin)
+    except ValueError:
+        return metin
+
+
+def izgara_coz(ifadeler):
+    """['n_estimators=50,100', 'max_depth=10,None'] -> izgara sozlugu"""
+    izgara = {}
+    for ifade in ifadeler:
+        ad, _, degerler = ifade.partition('=')
+        if ad not in RF_PARAMETRELERI and ad not in EK_PARAMETRELER:
+            raise ValueError(f"Bilinmeyen parametre: {ad}")
+        izgara[ad] = [_deger_coz(d) for d in degerler.split(',')]
+    return izgara
+
+
+def main():
+    """Izgarayi dene ve sonuc tablosunu yazdir"""
+    parser = argparse.ArgumentParser(description="Random Forest parametrelerini capraz dogrulamayla ayarla")
+    parser.add_argument('--veri', default=VARSAYILAN_CSV, help="Egitim CSV'si")
+    parser.add_argument('--izgara', nargs='+', default=None,
+                        help="ad=deger1,deger2 ... (varsayilan: PARAMETRE_IZGARASI)")
+    parser.add_argument('--kat', type=int, default=KAT_SAYISI, help="Capraz dogrulama kat sayisi")
+    parser.add_argument('--isci', type=int, default=1, help="Isci process sayisi (0 = tum cekirdekler)")
+    parser.add_argument('--seed', type=int, default=42, help="Katlama tohumu")
+    parser.add_argument('--onbelleksiz', action='store_true', help="Kayitli kat sonuclarini kullanma")
+    parser.add_argument('--cikti', default=None, help="Sonuclarin yazilacagi JSON dosyasi")
+    args = parser.parse_args()
+    
+    if args.kat < 2:
+        parser.error("--kat en az 2 olmali")
+    if args.isci < 0:
+        parser.error("--isci negatif olamaz")
+    try:
+        izgara = izgara_coz(args.izgara) if args.izgara else None
+    except ValueError as e:
+        parser.error(str(e))
+    
+    ozetler = ayarla(args.veri, izgara, args.kat, args.isci, args.seed, not args.onbelleksiz)
+    
+    izgara = izgara or PARAMETRE_IZGARASI
+    etiketler = [", ".join(f"{ad}={o['parametreler'][ad]}" for ad in izgara) for o in ozetler]
+    genislik = max(len('parametreler'), *map(len, etiketler))
+    print(f"\n{'':2}{'parametreler':<{genislik}} {'MAE':>12} {'RMSE':>12} {'MAPE':>8} {'tek ms':>8} "
+          f"{'toplu us':>9} {'MB':>7}")
+    for o, etiket in zip(ozetler, etiketler):
+        print(f"{'*' if o['pareto'] else ' ':2}{etiket:<{genislik}} {o['mae']:>12,.0f} {o['rmse']:>12,.0f} "
+              f"{o['mape']:>7.2f}% {o['tek_satir_ms']:>8.3f} {o['toplu_satir_us']:>9.2f} {o['boyut_mb']:>7.2f}")
+    print("\n* Pareto cephesi (MAPE, tek satir gecikmesi, boyut)")
+    
+    if args.cikti:
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            json.dump({'kat': args.kat, 'seed': args.seed, 'izgara': izgara, 'adaylar': ozetler},
+                      f, ensure_ascii=False, indent=2)
+        print("Sonuclar yazildi:", args.cikti)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
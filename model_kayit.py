@@ -0,0 +1,178 @@
+"""
+Model Kayit Defteri
+Egitilmis Random Forest'i ozellik semasi, veri hash'i ve metriklerle
+birlikte surumlu olarak diske kaydeder ve geri yukler.
+
+Dizin yapisi:
+    modeller/
+        GUNCEL                      # guncel surumun adi
+        20250101-120000-ab12cd34/
+            model.joblib            # sikistirilmamis (mmap ile yuklenebilir)
+            orman/                  # duzlestirilmis agaclar (.npy, mmap ile paylasimli)
+            meta.json               # sema, veri hash'i, parametreler, metrikler
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import contextlib
+import functools
+import importlib.metadata
+from datetime import datetime
+from ml_model import OZELLIKLER, RF_PARAMETRELERI
+from veri_isleme import dosya_hash
+from agac_ormani import DuzOrman
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Varsayilan kayit dizini
+KAYIT_DIZINI = os.environ.get('MODEL_KAYIT_DIZINI', 'modeller')
+
+
+@functools.lru_cache(maxsize=None)
+def sklearn_versiyonu():
+    """Kurulu scikit-learn surumu (uyumluluk kontrolu icin sklearn import edilmez)"""
+    return importlib.metadata.version('scikit-learn')
+
+
+class ModelKayit:
+    """
+    Surumlu model artefaktlari
+    """
+    
+    def __init__(self, dizin=KAYIT_DIZINI):
+        self.dizin = dizin
+        os.makedirs(self.dizin, exist_ok=True)
+    
+    @staticmethod
+    def veri_hash(csv_path):
+        """CSV dosyasinin sha256 ozeti"""
+        return dosya_hash(csv_path)
+    
+    @contextlib.contextmanager
+    def kilit(self):
+        """Dizin kilidi: egitim/kayit sirasinda diger process'ler bekler"""
+        if fcntl is None:
+            yield
+            return
+        
+        with open(os.path.join(self.dizin, '.kilit'), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def guncel_versiyon(self):
+        """GUNCEL isaretcisindeki surum (yoksa None)"""
+        try:
+            with open(os.path.join(self.dizin, 'GUNCEL')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def meta_oku(self, versiyon):
+        """Bir surumun meta.json icerigi"""
+        with open(os.path.join(self.dizin, versiyon, 'meta.json'), encoding='utf-8') as f:
+            return json.load(f)
+    
+    def uyumlu_mu(self, meta, veri_hash):
+        """Artefakt bu veri ve kod ile kullanilabilir mi?"""
+        return (meta.get('veri_hash') == veri_hash and
+                meta.get('ozellikler') == OZELLIKLER and
+                meta.get('parametreler') == RF_PARAMETRELERI and
+                meta.get('sklearn_versiyon') == sklearn_versiyonu())
+    
+    def uyumlu_versiyon(self, veri_hash):
+        """
+        Veriyle uyumlu surum ve meta'si: once GUNCEL, degilse en yeni uyumlu surum
+        (artimli guncelleme yeni veriye ait surumu GUNCEL yaptiktan sonra eski veriyle
+        acilan process'ler kendi surumlerini bulur), yoksa (None, None)
+        """
+        guncel = self.guncel_versiyon()
+        adaylar = [guncel] if guncel else []
+        adaylar += [v for v in reversed(self.versiyonlar()) if v != guncel]
+        for versiyon in adaylar:
+            try:
+                meta = self.meta_oku(versiyon)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            if self.uyumlu_mu(meta, veri_hash):
+                return versiyon, meta
+        return None, None
+    
+    def yukle(self, veri_hash, mmap=True):
+        """Veriyle uyumlu surum varsa (model, meta) dondur, yoksa None"""
+        versiyon, meta = self.uyumlu_versiyon(veri_hash)
+        if versiyon is None:
+            return None
+        return self.model_oku(versiyon, mmap), meta
+    
+    def model_oku(self, versiyon, mmap=True):
+        """Surumun sklearn modeli (agaclar yuklenirken kopyalanir, paylasimli degildir)"""
+        import joblib
+        return joblib.load(os.path.join(self.dizin, versiyon, 'model.joblib'),
+                           mmap_mode='r' if mmap else None)
+    
+    def orman_yukle(self, versiyon, model=None):
+        """
+        Surumun duzlestirilmis ormanini mmap ile ac
+        Orman dizini olmayan eski surumlerde model'den (verilmezse diskten) uretilip yazilir.
+        """
+        dizin = os.path.join(self.dizin, versiyon, 'orman')
+        if not DuzOrman.kayitli_mi(dizin):
+            if model is None:
+                import joblib
+                model = joblib.load(os.path.join(self.dizin, versiyon, 'model.joblib'))
+            DuzOrman.rf_den(model).kaydet(dizin)
+        return DuzOrman.ac(dizin)
+    
+    def kaydet(self, model, veri_hash, metrikler, orman=None, ek_meta=None):
+        """Modeli (ve duzlestirilmis ormanini) yeni bir surum olarak kaydet ve GUNCEL yap"""
+        if orman is None:
+            orman = DuzOrman.rf_den(model)
+        
+        versiyon = f"{datetime.now():%Y%m%d-%H%M%S}-{veri_hash[:8]}"
+        meta = {
+            'versiyon': versiyon,
+            'olusturma': datetime.now().isoformat(timespec='seconds'),
+            'veri_hash': veri_hash,
+            'ozellikler': OZELLIKLER,
+            'parametreler': RF_PARAMETRELERI,
+            'sklearn_versiyon': sklearn_versiyonu(),
+            'metrikler': metrikler,
+            **(ek_meta or {})
+        }
+        
+        # Once gecici dizine yaz, sonra tek adimda yerine tasi
+        import joblib
+        gecici = tempfile.mkdtemp(dir=self.dizin, prefix='.yaziliyor-')
+        try:
+            joblib.dump(model, os.path.join(gecici, 'model.joblib'))
+            orman.kaydet(os.path.join(gecici, 'orman'))
+            with open(os.path.join(gecici, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2, ensure_ascii=False)
+            os.replace(gecici, os.path.join(self.dizin, versiyon))
+        except Exception:
+            shutil.rmtree(gecici, ignore_errors=True)
+            raise
+        
+        self._guncel_yap(versiyon)
+        return versiyon
+    
+    def _guncel_yap(self, versiyon):
+        """GUNCEL isaretcisini atomik olarak guncelle"""
+        gecici = os.path.join(self.dizin, '.GUNCEL.tmp')
+        with open(gecici, 'w') as f:
+            f.write(versiyon)
+        os.replace(gecici, os.path.join(self.dizin, 'GUNCEL'))
+    
+    def versiyonlar(self):
+        """Kayitli surumler (eskiden yeniye)"""
+        return sorted(d for d in os.listdir(self.dizin)
+                      if os.path.isfile(os.path.join(self.dizin, d, 'meta.json')))
@@ -0,0 +1,188 @@
+"""
+Model Paketi
+API'nin birlikte yukledigi ve birlikte degistirdigi modeller: islenmis veri
+kolonlari, istatistik ozeti, fuzzy model ve ML modeli (benzer ev indeksiyle). Istekler aktif
+paketi baslangicta bir kez alir; yeni paket yuklenip yerine konurken devam
+eden istekler eski paketle tamamlanir. Acilista fuzzy ve ML modelleri birbirinden
+bagimsiz yuklenir; hazir olan parca pakete eklenir (ModelPaketi.ile), eksik
+parcalar None kalir.
+
+Yeni paket yerine konmadan once eskisiyle karsilastirilir (paket_karsilastir):
+iki paket yeni verinin ayni orneginde (iki ML modelinin de egitimde gormedigi
+kayitlardan) skorlanir; tahminler sonlu ve pozitif olmali, ML ve fuzzy MAPE'si
+tolerans disinda kotulesmemeli.
+"""
+
+import os
+import time
+import itertools
+import numpy as np
+from fuzzy_model import EmlakFuzzyModel
+from kural_tabani import KURAL_DOSYASI
+from ml_model import EmlakMLModel, test_satirlari
+from veri_isleme import kolonlari_ac, onbellek_dizini, GIRISLER, GIRIS_KOLONLARI
+from istatistik_taslagi import istatistik_ozeti
+
+
+# Karsilastirma icin yeni veriden alinan ornek sayisi
+DOGRULAMA_ORNEGI = 2000
+
+# MAPE'nin kabul edilen goreli kotulesmesi (0.10 = %10)
+GERILEME_TOLERANSI = float(os.environ.get('YENIDEN_YUKLEME_TOLERANSI', '0.10'))
+
+
+# Paket nesli: her paket (ile() ile kurulanlar dahil) yeni numara alir
+_NESIL = itertools.count(1)
+
+
+class ModelPaketi:
+    """
+    Birlikte hizmet veren modeller ve surumleri (yuklendikten sonra degismez)
+    Henuz yuklenmemis parca (fuzzy/veri/istatistik veya ml) None'dir.
+    """
+    
+    def __init__(self, fuzzy, ml, veri, veri_yolu, istatistik=None):
+        self.fuzzy = fuzzy
+        self.ml = ml
+        self.veri = veri
+        self.veri_yolu = veri_yolu
+        self.istatistik = istatistik
+        self.yuklenme = time.time()
+        self.nesil = next(_NESIL)
+        
+        # Tahmin onbellegi anahtarlarindaki surumler (nesil de anahtarda: surum imzasi
+        # istatistikleri kapsamaz, yeniden egitilen ML ayni surumu alabilir)
+        self.surumler = {}
+        if fuzzy is not None:
+            self.surumler['fuzzy'] = fuzzy.motor_imzasi()[:16] + ("+tablo" if fuzzy.tablo is not None else "")
+        if ml is not None:
+            self.surumler.update(ml=ml.versiyon, benzer=ml.versiyon)
+    
+    @property
+    def hazir(self):
+        """Tum parcalar yuklu mu?"""
+        return self.fuzzy is not None and self.ml is not None
+    
+    def ile(self, **parcalar):
+        """Verilen parcalari (fuzzy, ml, veri, istatistik) degistirilmis yeni paket"""
+        degerler = {'fuzzy': self.fuzzy, 'ml': self.ml, 'veri': self.veri, 'istatistik': self.istatistik,
+                    **parcalar}
+        return ModelPaketi(veri_yolu=self.veri_yolu, **degerler)
+    
+    def ozet(self):
+        """Saglik/yonetim yanitlari icin kisa bilgi"""
+        return {
+            'surumler': self.surumler,
+            'veri_sayisi': len(self.veri['Fiyat_Numeric']) if self.veri is not None else None,
+            'ml_metrikler': self.ml.metrikler if self.ml is not None else None,
+            'yuklenme': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.yuklenme))
+        }
+
+
+def _asama(ilerleme, ad):
+    """Yukleme asamasini bildir (ilerleme verildiyse)"""
+    if ilerleme is not None:
+        ilerleme(ad)
+
+
+def fuzzy_yukle(veri_yolu, durulastirma='analitik', tablo_yolu=None, ilerleme=None,
+                kural_dosyasi=KURAL_DOSYASI):
+    """
+    Islenmis kolonlari mmap ile ac, istatistik ozetini al ve fuzzy modeli kur
+    (veri, istatistik, fuzzy) dondurur. Ozet verinin onbellek dizininden okunur,
+    yoksa kolonlardan tek geciste hesaplanip oraya yazilir. Kural dosyasi her
+    yuklemede yeniden okunur (orn. fuzzy_ayarla.py ile ayarlanmis kirilma noktalari).
+    ilerleme: her asamanin ('veri', 'istatistikler', 'fuzzy') basinda cagrilir.
+    """
+    _asama(ilerleme, 'veri')
+    veri = kolonlari_ac(veri_yolu)
+    
+    _asama(ilerleme, 'istatistikler')
+    istatistik = istatistik_ozeti(onbellek_dizini(veri_yolu), veri)
+    
+    _asama(ilerleme, 'fuzzy')
+    fuzzy = EmlakFuzzyModel(kural_dosyasi=kural_dosyasi, durulastirma=durulastirma,
+                            istatistikler=istatistik.istatistikler())
+    if tablo_yolu and os.path.exists(tablo_yolu):
+        fuzzy.tablo_yukle(tablo_yolu)
+    return veri, istatistik, fuzzy
+
+
+def ml_yukle(veri_yolu, ilerleme=None):
+    """ML modeli (duz orman) ve benzer ev indeksi mmap ile (yoksa bir kez egitilip yazilir)"""
+    _asama(ilerleme, 'ml')
+    ml = EmlakMLModel()
+    ml.paylasimli_yukle(veri_yolu)
+    return ml
+
+
+def paket_yukle(veri_yolu, durulastirma='analitik', tablo_yolu=None, kural_dosyasi=KURAL_DOSYASI):
+    """Veri dosyasinin ve kural dosyasinin guncel halinden yeni (tam) paket kur"""
+    veri, istatistik, fuzzy = fuzzy_yukle(veri_yolu, durulastirma, tablo_yolu, kural_dosyasi=kural_dosyasi)
+    return ModelPaketi(fuzzy, ml_yukle(veri_yolu), veri, veri_yolu, istatistik)
+
+
+def gorulmemis_maskesi(ml, n):
+    """
+    Verinin ilk n temiz kaydindan ML modelinin egitimde gormedikleri (maske): modelin
+    test bolmesi ve modelin verisinden sonra eklenen kayitlar (veri hep sona eklenir)
+    """
+    m = ml.metrikler
+    bolme = m.get('bolme') or [[0, m.get('egitim_sayisi', 0) + m.get('test_sayisi', 0)]]
+    maske = np.zeros(n, dtype=bool)
+    maske[bolme[-1][1]:] = True
+    test = test_satirlari(bolme)
+    maske[test[test < n]] = True
+    return maske
+
+
+def dogrulama_ornegi(veri, n=DOGRULAMA_ORNEGI, seed=0, modeller=()):
+    """
+    Girisleri ve fiyati dolu n kaydin (X, fiyat) ornegi
+    modeller: ML modelleri; verilirse yalnizca hicbirinin egitimde gormedigi kayitlardan
+    (boyle kayit yoksa tum temiz kayitlardan).
+    """
+    X = np.column_stack([np.asarray(veri[GIRIS_KOLONLARI[g]], dtype=float) for g in GIRISLER])
+    fiyat = np.asarray(veri['Fiyat_Numeric'], dtype=float)
+    temiz = np.flatnonzero(np.isfinite(X).all(axis=1) & np.isfinite(fiyat))
+    maske = np.ones(len(temiz), dtype=bool)
+    for ml in modeller:
+        maske &= gorulmemis_maskesi(ml, len(temiz))
+    aday = temiz[maske] if maske.any() else temiz
+    aday = aday[fiyat[aday] > 0]
+    secilen = np.sort(np.random.default_rng(seed).choice(aday, min(n, len(aday)), replace=False))
+    return X[secilen], fiyat[secilen]
+
+
+def paket_metrikleri(paket, X, fiyat):
+    """Paketin ornek uzerindeki tahmin sagligi ve hata metrikleri"""
+    fuzzy_tahmin = paket.fuzzy.predict_batch(X)
+    ml_tahmin = paket.ml.predict_batch(X)
+    return {
+        'gecersiz_tahmin': int(np.count_nonzero(~(np.isfinite(fuzzy_tahmin) & (fuzzy_tahmin > 0))) +
+                               np.count_nonzero(~(np.isfinite(ml_tahmin) & (ml_tahmin > 0)))),
+        'fuzzy_mape': float(np.mean(np.abs(fuzzy_tahmin - fiyat) / fiyat) * 100),
+        'ml_mape': float(np.mean(np.abs(ml_tahmin - fiyat) / fiyat) * 100)
+    }
+
+
+def paket_karsilastir(eski, yeni, tolerans=GERILEME_TOLERANSI):
+    """
+    Yeni paketi eskisiyle ayni ornekte (yeni veriden, iki ML modelinin de gormedigi
+    kayitlardan) karsilastir
+    (sorunlar, metrikler) dondurur; sorun listesi bossa yeni paket kullanilabilir.
+    """
+    X, fiyat = dogrulama_ornegi(yeni.veri, modeller=[p.ml for p in (eski, yeni) if p is not None])
+    metrikler = {'ornek_sayisi': len(X), 'yeni': paket_metrikleri(yeni, X, fiyat)}
+    sorunlar = []
+    if metrikler['yeni']['gecersiz_tahmin']:
+        sorunlar.append(f"{metrikler['yeni']['gecersiz_tahmin']} gecersiz (NaN/negatif) tahmin")
+    
+    if eski is not None:
+        metrikler['eski'] = paket_metrikleri(eski, X, fiyat)
+        for ad in ('fuzzy_mape', 'ml_mape'):
+            e, y = metrikler['eski'][ad], metrikler['yeni'][ad]
+            if e is not None and y is not None and y > e * (1 + tolerans):
+                sorunlar.append(f"{ad} kotulesti: {e:.2f} -> {y:.2f}")
+    
+    return sorunlar, metrikler
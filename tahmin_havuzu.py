@@ -0,0 +1,78 @@
+"""
+Tahmin Havuzu
+CPU-yogun tahmin islerini event loop disinda, sinirli bir thread havuzunda
+calistirir. Havuz ve kuyruk doluysa is kabul edilmez (API 503 doner).
+
+Ayarlar (ortam degiskenleri):
+    TAHMIN_ISCI_SAYISI    ayni anda calisan is sayisi (varsayilan: cekirdek sayisi, en fazla 8)
+    TAHMIN_KUYRUK_LIMITI  isci bekleyen en fazla is sayisi (varsayilan: 64)
+"""
+
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Varsayilan eszamanlilik ayarlari
+ISCI_SAYISI = int(os.environ.get('TAHMIN_ISCI_SAYISI', str(min(8, os.cpu_count() or 1))))
+KUYRUK_LIMITI = int(os.environ.get('TAHMIN_KUYRUK_LIMITI', '64'))
+
+
+class HavuzDolu(Exception):
+    """Calisan + bekleyen is sayisi limite ulasti"""
+    pass
+
+
+class TahminHavuzu:
+    """
+    Sinirli thread havuzu + geri basinc
+    Fuzzy tahmin durumsuz numpy motoruyla, ML tahmin salt okunur agaclarla
+    yapildigi icin isciler modelleri paylasir.
+    """
+    
+    def __init__(self, isci_sayisi=ISCI_SAYISI, kuyruk_limiti=KUYRUK_LIMITI):
+        self.isci_sayisi = max(1, isci_sayisi)
+        self.kuyruk_limiti = max(0, kuyruk_limiti)
+        self._havuz = ThreadPoolExecutor(max_workers=self.isci_sayisi, thread_name_prefix='tahmin')
+        self._kilit = threading.Lock()
+        self._icerde = 0
+        self.tamamlanan = 0
+        self.reddedilen = 0
+    
+    async def calistir(self, fn, *args, **kwargs):
+        """fn'i havuzda calistir; kapasite doluysa HavuzDolu firlat"""
+        with self._kilit:
+            if self._icerde >= self.isci_sayisi + self.kuyruk_limiti:
+                self.reddedilen += 1
+                raise HavuzDolu(f"Tahmin kuyrugu dolu ({self._icerde} is)")
+            self._icerde += 1
+        
+        # Sayac is gercekten bittiginde duser (istemci koparsa bile thread calismaya devam eder)
+        gelecek = self._havuz.submit(functools.partial(fn, *args, **kwargs))
+        gelecek.add_done_callback(self._bitti)
+        return await asyncio.wrap_future(gelecek)
+    
+    def _bitti(self, gelecek):
+        """Is tamamlandi (veya baslamadan iptal edildi)"""
+        with self._kilit:
+            self._icerde -= 1
+            self.tamamlanan += 1
+    
+    def durum(self):
+        """Anlik havuz durumu"""
+        with self._kilit:
+            icerde = self._icerde
+        return {
+            'isci_sayisi': self.isci_sayisi,
+            'kuyruk_limiti': self.kuyruk_limiti,
+            'calisan': min(icerde, self.isci_sayisi),
+            'bekleyen': max(0, icerde - self.isci_sayisi),
+            'tamamlanan': self.tamamlanan,
+            'reddedilen': self.reddedilen
+        }
+    
+    def kapat(self):
+        """Bekleyen isleri bitirip thread'leri kapat"""
+        self._havuz.shutdown(wait=True)
@@ -0,0 +1,88 @@
+"""
+Tahmin Onbellegi
+Tekrarlanan sorgular icin LRU (+ istege bagli TTL) onbellek. Anahtar
+normalize edilmis ozellik demeti, paket nesli ve model surumunu icerir;
+model yeniden yuklendiginde onbellek temizlenir.
+
+Ayarlar (ortam degiskenleri):
+    TAHMIN_ONBELLEK_BOYUTU  en fazla kayit sayisi (varsayilan: 10000, 0 = kapali)
+    TAHMIN_ONBELLEK_TTL     kayit omru, saniye (varsayilan: 0 = suresiz)
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+# Varsayilan onbellek ayarlari
+ONBELLEK_BOYUTU = int(os.environ.get('TAHMIN_ONBELLEK_BOYUTU', '10000'))
+ONBELLEK_TTL = float(os.environ.get('TAHMIN_ONBELLEK_TTL', '0'))
+
+
+class TahminOnbellegi:
+    """
+    Thread-guvenli LRU onbellek
+    None degerler saklanmaz (al() icin None = bulunamadi).
+    """
+    
+    def __init__(self, boyut=ONBELLEK_BOYUTU, ttl=ONBELLEK_TTL):
+        self.boyut = max(0, boyut)
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._kayitlar = OrderedDict()
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        self.suresi_dolan = 0
+    
+    def al(self, anahtar):
+        """Kayitli deger (yoksa veya suresi dolduysa None)"""
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is None:
+                self.iska += 1
+                return None
+            
+            deger, zaman = kayit
+            if self.ttl is not None and time.monotonic() - zaman > self.ttl:
+                del self._kayitlar[anahtar]
+                self.suresi_dolan += 1
+                self.iska += 1
+                return None
+            
+            self._kayitlar.move_to_end(anahtar)
+            self.isabet += 1
+            return deger
+    
+    def koy(self, anahtar, deger):
+        """Degeri sakla, kapasite asilirsa en eski kullanilani at"""
+        if self.boyut == 0 or deger is None:
+            return
+        
+        with self._kilit:
+            self._kayitlar[anahtar] = (deger, time.monotonic())
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.boyut:
+                self._kayitlar.popitem(last=False)
+                self.tahliye += 1
+    
+    def temizle(self):
+        """Tum kayitlari sil (model yeniden yuklendiginde)"""
+        with self._kilit:
+            self._kayitlar.clear()
+    
+    def istatistik(self):
+        """Boyut ve isabet/iska sayaclari"""
+        with self._kilit:
+            toplam = self.isabet + self.iska
+            return {
+                'kayit_sayisi': len(self._kayitlar),
+                'kapasite': self.boyut,
+                'ttl_saniye': self.ttl,
+                'isabet': self.isabet,
+                'iska': self.iska,
+                'isabet_orani': round(self.isabet / toplam, 4) if toplam else 0.0,
+                'tahliye': self.tahliye,
+                'suresi_dolan': self.suresi_dolan
+            }
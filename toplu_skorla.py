@@ -0,0 +1,279 @@
+"""
+Toplu Skorlama
+Buyuk ilan dosyalarini (CSV veya Parquet) sabit boyutlu parcalar halinde okur,
+her parcayi veri_isleme.veriyi_isle ile ayristirip fuzzy ve ML modelleriyle
+vektorel olarak skorlar ve sonuclari parca parca cikti dosyasina yazar.
+Bellek kullanimi girdi boyutundan bagimsizdir (parca boyutuyla sinirli).
+
+Modeller veri DataFrame'e ayristirilmadan yuklenir: veri kolonlari, duz orman ve
+benzer ev indeksi mmap ile acilir (API ile ayni), buyuk parcalar icin sklearn
+modeli de yuklenir. Paralel modda (--isci N) parcalar N process'e dagitilir; her
+isci modelleri bir kez yukler (mmap'li diziler process'ler arasinda sayfa
+paylasimli, sklearn agaclari isci basina kopya) ve sklearn'u tek thread'le
+calistirir, boylece N isci N cekirdek kullanir. Sonuclar girdi sirasinda yazilir.
+
+Kullanim:
+    python toplu_skorla.py ilanlar.csv tahminler.csv
+    python toplu_skorla.py ilanlar.parquet tahminler.parquet --parca 100000
+    python toplu_skorla.py ilanlar.csv tahminler.csv --isci 0   # tum cekirdekler
+    python toplu_skorla.py ilanlar.csv tahminler.csv --kurallar sehir_file/fuzzy_kurallar_ayarli.json
+
+Girdi emlakverileri.csv ile ayni kolonlara sahip olmalidir. Parquet icin
+pyarrow gerekir.
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from veri_isleme import veriyi_isle, giris_matrisi, GIRISLER, VARSAYILAN_CSV
+from fuzzy_model import DURULASTIRMA_YONTEMLERI
+from ml_model import EmlakMLModel
+from model_paketi import fuzzy_yukle
+from kural_tabani import KURAL_DOSYASI
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Varsayilan parca boyutu (satir)
+PARCA_BOYUTU = 50_000
+
+# Ciktiya aynen kopyalanan kimlik kolonlari (girdide varsa)
+KIMLIK_KOLONLARI = ['İlan No', 'URL']
+
+# Isci process durumu (modeller ve paylasilan diziler, _isci_baslat doldurur)
+_ISCI = {}
+
+
+def parquet_mu(yol):
+    """Uzantiya gore Parquet dosyasi mi?"""
+    return os.path.splitext(yol)[1].lower() in ('.parquet', '.pq')
+
+
+def _pyarrow():
+    """Parquet destegi icin pyarrow (opsiyonel bagimlilik)"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet icin pyarrow gerekli: pip install pyarrow")
+    return pyarrow
+
+
+def parcalari_oku(yol, parca_boyutu=PARCA_BOYUTU):
+    """Girdiyi parca_boyutu satirlik DataFrame'ler halinde uret (tum dosya bellege alinmaz)"""
+    if parquet_mu(yol):
+        pa = _pyarrow()
+        dosya = pa.parquet.ParquetFile(yol)
+        for grup in dosya.iter_batches(batch_size=parca_boyutu):
+            yield grup.to_pandas()
+    else:
+        with pd.read_csv(yol, chunksize=parca_boyutu) as okuyucu:
+            yield from okuyucu
+
+
+class CiktiYazici:
+    """Parcalari gecici dosyaya ekler, bitince hedefin yerine koyar"""
+    
+    def __init__(self, yol):
+        self.yol = yol
+        self.gecici = yol + '.tmp'
+        self.parquet = parquet_mu(yol)
+        self._parquet_yazici = None
+        self._ilk = True
+    
+    def yaz(self, df):
+        if self.parquet:
+            pa = _pyarrow()
+            if self._parquet_yazici is None:
+                tablo = pa.Table.from_pandas(df, preserve_index=False)
+                self._parquet_yazici = pa.parquet.ParquetWriter(self.gecici, tablo.schema)
+            else:
+                tablo = pa.Table.from_pandas(df, schema=self._parquet_yazici.schema, preserve_index=False)
+            self._parquet_yazici.write_table(tablo)
+        else:
+            df.to_csv(self.gecici, mode='w' if self._ilk else 'a', header=self._ilk, index=False)
+        self._ilk = False
+    
+    def kapat(self, basarili=True):
+        if self._parquet_yazici is not None:
+            self._parquet_yazici.close()
+        if not os.path.exists(self.gecici):
+            return
+        if basarili:
+            os.replace(self.gecici, self.yol)
+        else:
+            os.remove(self.gecici)
+
+
+def modelleri_yukle(egitim_csv=VARSAYILAN_CSV, durulastirma='analitik', ml_isleri=-1,
+                    kural_dosyasi=KURAL_DOSYASI):
+    """
+    Fuzzy model (verinin istatistik ozetiyle ve kural_dosyasi'yla, API ile ayni) ve kayitli ML modeli
+    Uyumlu kayit yoksa ML modeli bir kez egitilip yazilir. ml_isleri: sklearn thread sayisi.
+    """
+    _, _, fuzzy = fuzzy_yukle(egitim_csv, durulastirma, kural_dosyasi=kural_dosyasi)
+    ml = EmlakMLModel()
+    ml.paylasimli_yukle(egitim_csv, sklearn_isleri=ml_isleri)
+    return fuzzy, ml
+
+
+def parca_skorla(parca, fuzzy, ml):
+    """Ham parcayi isle ve iki modelle skorla; eksik veya okunamayan girisli satirlarin tahmini NaN"""
+    veriyi_isle(parca)
+    X = giris_matrisi(parca)
+    gecerli = np.isfinite(X).all(axis=1)
+    
+    fuzzy_tahmin = np.full(len(X), np.nan)
+    ml_tahmin = np.full(len(X), np.nan)
+    if gecerli.any():
+        fuzzy_tahmin[gecerli] = fuzzy.predict_batch(X[gecerli])
+        ml_tahmin[gecerli] = ml.predict_batch(X[gecerli])
+    
+    sonuc = parca[[k for k in KIMLIK_KOLONLARI if k in parca.columns]].reset_index(drop=True)
+    for j, g in enumerate(GIRISLER):
+        sonuc[g] = X[:, j]
+    sonuc['gercek_fiyat'] = parca['Fiyat_Numeric'].to_numpy()
+    sonuc['fuzzy_tahmin'] = np.round(fuzzy_tahmin, 2)
+    sonuc['ml_tahmin'] = np.round(ml_tahmin, 2)
+    sonuc['ortalama_tahmin'] = np.round((fuzzy_tahmin + ml_tahmin) / 2, 2)
+    return sonuc
+
+
+def isci_sayisi_coz(isci):
+    """0 veya None -> cekirdek sayisi"""
+    return isci or os.cpu_count() or 1
+
+
+def _isci_baslat(egitim_csv, durulastirma, kural_dosyasi, girdi_yolu=None, cikti_yolu=None):
+    """Isci process'te modelleri bir kez yukle (sklearn tek thread), paylasilan dizileri ac"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        _ISCI['fuzzy'], _ISCI['ml'] = modelleri_yukle(egitim_csv, durulastirma, ml_isleri=1,
+                                                      kural_dosyasi=kural_dosyasi)
+    if girdi_yolu is not None:
+        _ISCI['girdi'] = np.load(girdi_yolu, mmap_mode='r')
+        _ISCI['cikti'] = np.load(cikti_yolu, mmap_mode='r+')
+
+
+def _isci_parca_skorla(parca):
+    return parca_skorla(parca, _ISCI['fuzzy'], _ISCI['ml'])
+
+
+def _isci_aralik_tahmin(aralik):
+    """Paylasilan girdinin [bas, son) satirlarini tahmin et, sonucu yerinde yaz"""
+    bas, son = aralik
+    X = np.asarray(_ISCI['girdi'][bas:son])
+    _ISCI['cikti'][bas:son, 0] = _ISCI['fuzzy'].predict_batch(X)
+    _ISCI['cikti'][bas:son, 1] = _ISCI['ml'].predict_batch(X)
+
+
+def _sirali_paralel(havuz, fn, ogeler, pencere):
+    """havuz.map gibi sirali sonuc, ama en fazla pencere kadar is bekletir (sabit bellek)"""
+    bekleyen = collections.deque()
+    for oge in ogeler:
+        bekleyen.append(havuz.submit(fn, oge))
+        if len(bekleyen) >= pencere:
+            yield bekleyen.popleft().result()
+    while bekleyen:
+        yield bekleyen.popleft().result()
+
+
+def paralel_tahmin(X, isci=None, parca_boyutu=PARCA_BOYUTU, egitim_csv=VARSAYILAN_CSV,
+                   durulastirma='analitik', kural_dosyasi=KURAL_DOSYASI):
+    """
+    Bellekteki girdiyi (N, 6) process'lere bolerek tahmin et, (fuzzy, ml) dondur
+    Girdi ve cikti diskte mmap'li .npy dosyalaridir; islere sadece satir araligi gider.
+    """
+    girdi = giris_matrisi(X)
+    n = len(girdi)
+    
+    with tempfile.TemporaryDirectory(prefix='skor-') as dizin:
+        girdi_yolu = os.path.join(dizin, 'girdi.npy')
+        cikti_yolu = os.path.join(dizin, 'cikti.npy')
+        np.save(girdi_yolu, girdi)
+        cikti = np.lib.format.open_memmap(cikti_yolu, mode='w+', dtype=float, shape=(n, 2))
+        
+        araliklar = [(bas, min(bas + parca_boyutu, n)) for bas in range(0, n, parca_boyutu)]
+        with ProcessPoolExecutor(isci_sayisi_coz(isci), initializer=_isci_baslat,
+                                 initargs=(egitim_csv, durulastirma, kural_dosyasi, girdi_yolu, cikti_yolu)) as havuz:
+            for _ in havuz.map(_isci_aralik_tahmin, araliklar):
+                pass
+        
+        sonuc = np.array(cikti)
+        del cikti
+    
+    return sonuc[:, 0], sonuc[:, 1]
+
+
+def skorla(girdi, cikti, fuzzy, ml, parca_boyutu=PARCA_BOYUTU, isci=1, egitim_csv=VARSAYILAN_CSV):
+    """Girdiyi parca parca skorlayip ciktiya yaz, (satir, sure) dondur"""
+    yazici = CiktiYazici(cikti)
+    satir = 0
+    bas = time.perf_counter()
+    basarili = False
+    havuz = None
+    try:
+        parcalar = parcalari_oku(girdi, parca_boyutu)
+        if isci == 1:
+            sonuclar = (parca_skorla(parca, fuzzy, ml) for parca in parcalar)
+        else:
+            isci = isci_sayisi_coz(isci)
+            havuz = ProcessPoolExecutor(isci, initializer=_isci_baslat,
+                                        initargs=(egitim_csv, fuzzy.durulastirma, fuzzy.kural_dosyasi))
+            sonuclar = _sirali_paralel(havuz, _isci_parca_skorla, parcalar, 2 * isci)
+        
+        for i, sonuc in enumerate(sonuclar):
+            yazici.yaz(sonuc)
+            satir += len(sonuc)
+            sure = time.perf_counter() - bas
+            print(f"  Parca {i + 1}: {satir:,} satir, {satir / sure:,.0f} satir/sn", flush=True)
+        basarili = True
+    finally:
+        if havuz is not None:
+            havuz.shutdown(cancel_futures=True)
+        yazici.kapat(basarili)
+    return satir, time.perf_counter() - bas
+
+
+def main():
+    """Dosyayi skorla ve hizi raporla"""
+    parser = argparse.ArgumentParser(description="Ilan dosyasini parca parca skorla")
+    parser.add_argument('girdi', help="Girdi dosyasi (.csv veya .parquet)")
+    parser.add_argument('cikti', help="Cikti dosyasi (.csv veya .parquet)")
+    parser.add_argument('--parca', type=int, default=PARCA_BOYUTU, help="Parca boyutu (satir)")
+    parser.add_argument('--egitim-verisi', default=VARSAYILAN_CSV,
+                        help="Model istatistikleri ve ML modeli icin egitim CSV'si")
+    parser.add_argument('--durulastirma', choices=DURULASTIRMA_YONTEMLERI, default='analitik',
+                        help="Fuzzy centroid yontemi")
+    parser.add_argument('--kurallar', default=KURAL_DOSYASI,
+                        help="Fuzzy kural dosyasi (API'deki FUZZY_KURALLAR ile ayni olmali)")
+    parser.add_argument('--isci', type=int, default=1,
+                        help="Isci process sayisi (1 = tek process, 0 = tum cekirdekler)")
+    args = parser.parse_args()
+    
+    if args.parca <= 0:
+        parser.error("--parca pozitif olmali")
+    if args.isci < 0:
+        parser.error("--isci negatif olamaz")
+    
+    print("Modeller yukleniyor...")
+    fuzzy, ml = modelleri_yukle(args.egitim_verisi, args.durulastirma, kural_dosyasi=args.kurallar)
+    
+    print(f"\nSkorlaniyor: {args.girdi} -> {args.cikti} (parca: {args.parca:,} satir, "
+          f"isci: {isci_sayisi_coz(args.isci)})")
+    satir, sure = skorla(args.girdi, args.cikti, fuzzy, ml, args.parca, args.isci, args.egitim_verisi)
+    
+    print(f"\nToplam: {satir:,} satir, {sure:.1f} sn, {satir / max(sure, 1e-9):,.0f} satir/sn")
+    print("Kaydedildi:", args.cikti)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,13 @@ En ucuz ilanlari goster ve temizle
 """
 
 import pandas as pd
+from veri_isleme import veri_yukle, fiyat_donustur
 
 
 def en_ucuz_ilanlari_goster(n=20):
     """En ucuz n ilani goster"""
     print("\nVeri yukleniyor...")
-    df = pd.read_csv('sehir_file/emlakverileri.csv')
-    
-    # Fiyati sayiya cevir
-    df['Fiyat_Numeric'] = df['Fiyat'].str.replace('.', '', regex=False).str.replace(' TL', '').astype(float)
+    df = veri_yukle('sehir_file/emlakverileri.csv')
     
     # En ucuz ilanlari sirala (ascending=True yaparak en düşükten en yükseğe sıralanır)
     # Bu kısım değişti: ascending=False -> ascending=True
@@ -50,7 +48,7 @@ def veriyi_temizle(ust_limit=None, alt_limit=None):
     df = pd.read_csv('sehir_file/emlakverileri.csv')
     
     # Fiyati sayiya cevir
-    df['Fiyat_Numeric'] = df['Fiyat'].str.replace('.', '', regex=False).str.replace(' TL', '').astype(float)
+    df['Fiyat_Numeric'] = fiyat_donustur(df['Fiyat'])
     
     onceki_sayi = len(df)
     
@@ -97,8 +95,7 @@ def main():
     
     if cevap in ['e', 'evet']:
         print("\nOnerilen limitler:")
-        df = pd.read_csv('sehir_file/emlakverileri.csv')
-        df['Fiyat_Numeric'] = df['Fiyat'].str.replace('.', '', regex=False).str.replace(' TL', '').astype(float)
+        df = veri_yukle('sehir_file/emlakverileri.csv')
         
         # Temizleme için alt limit önerileri (Örneğin P05 ve P10)
         p05 = df['Fiyat_Numeric'].quantile(0.05)
@@ -0,0 +1,376 @@
+"""
+Veri Isleme
+emlakverileri.csv string kolonlarini sayiya ceviren ortak (vektorel) donusumler
+ve islenmis verinin diskteki kolon bazli onbellegi.
+
+Onbellek yapisi (kaynak dosyanin sha256'sina gore):
+    sehir_file/.onbellek/emlakverileri/
+        anahtar.json                  # mtime/boyut -> sha256 (tekrar hash'lememek icin)
+        <sha256[:16]>-v<SURUM>/
+            meta.json                 # kolon adlari, turleri ve dosyalari
+            k00.npy ...               # sayisal kolonlar (tipli, mmap ile acilabilir)
+            k01.veri.npy, k01.ofset.npy   # metin kolonlari (UTF-8 bayt + ofset)
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+# Varsayilan veri dosyasi
+VARSAYILAN_CSV = 'sehir_file/emlakverileri.csv'
+
+# Isleme mantigi degisirse artirilir (eski onbellekler kullanilmaz)
+ISLEME_SURUMU = 1
+
+# Isitma tipi skorlama (0-10 arasi)
+ISITMA_SKORLARI = {
+    'Isıtma Yok': 0,
+    'Soba': 1,
+    'Doğalgaz Sobası': 2,
+    'Kat Kaloriferi': 4,
+    'Kombi': 5,
+    'Merkezi': 6,
+    'Merkezi (Pay Öl...': 6,
+    'Klima': 8,
+    'Yerden Isıtma': 9,
+    'Güneş Enerjisi': 10,
+    'Belirtilmemiş': 5
+}
+
+# Model giris degiskenleri (toplu tahminde kolon sirasi)
+GIRISLER = ['metrekare', 'oda_sayisi', 'bina_yasi', 'bulundugu_kat', 'bina_kat_sayisi', 'isitma_tipi']
+
+# Giris -> islenmis DataFrame kolonu
+GIRIS_KOLONLARI = {
+    'metrekare': 'Metrekare_Numeric',
+    'oda_sayisi': 'Oda_Numeric',
+    'bina_yasi': 'Bina_Yasi_Numeric',
+    'bulundugu_kat': 'Bulundugu_Kat_Numeric',
+    'bina_kat_sayisi': 'Kat_Sayisi_Numeric',
+    'isitma_tipi': 'Isitma_Numeric'
+}
+
+# veriyi_isle'nin okudugu ham kolonlar
+HAM_KOLONLAR = ['Fiyat', 'Oda Sayısı', 'Brüt m2', 'Kat Sayısı', 'Bulunduğu Kat', 'Bina Yaşı', 'Isınma Tipi']
+
+# veriyi_isle'nin ekledigi kolonlar
+SAYISAL_KOLONLAR = ['Fiyat_Numeric', 'Oda_Numeric', 'Metrekare_Numeric', 'Kat_Sayisi_Numeric',
+                    'Bulundugu_Kat_Numeric', 'Bina_Yasi_Numeric', 'Isitma_Numeric']
+
+
+def _sayi(s):
+    """Metin -> float (bos veya sayi olmayan degerler NaN)"""
+    return pd.to_numeric(s.astype(str).str.strip().where(s.notna()), errors='coerce')
+
+
+def _tam_sayi(s):
+    """Sayi serisi -> int; eksik deger varsa NaN'li float (satir tahminden duser, parca durmaz)"""
+    return s.astype(int) if s.notna().all() else s.astype(float)
+
+
+def fiyat_donustur(s):
+    """Fiyat: "2.500.000 TL" -> 2500000 (okunamazsa NaN)"""
+    s = s.astype(str).where(s.notna())
+    return _sayi(s.str.replace('.', '', regex=False).str.replace(' TL', '', regex=False)).astype(float)
+
+
+def oda_donustur(s):
+    """Oda sayisi: "2 + 1" -> 3 (bos veya "Stüdyo" gibi okunamayan: NaN)"""
+    parcalar = s.astype(str).where(s.notna()).str.extract(r'^\s*(\d+)\s*(?:\+\s*(\d+)\s*)?$')
+    return _tam_sayi(pd.to_numeric(parcalar[0]) + pd.to_numeric(parcalar[1]).fillna(0))
+
+
+def metrekare_donustur(s):
+    """Metrekare: "80 m2" -> 80 (okunamazsa NaN)"""
+    return _sayi(s.astype(str).where(s.notna()).str.replace(' m2', '', regex=False)).astype(float)
+
+
+def kat_sayisi_donustur(s):
+    """Kat sayisi: "6 Katlı" -> 6 (okunamazsa NaN)"""
+    return _tam_sayi(_sayi(s.astype(str).where(s.notna()).str.replace(' Katlı', '', regex=False)))
+
+
+def bulundugu_kat_donustur(s):
+    """Bulundugu kat: "3. Kat" -> 3, Bodrum/Bahce -> -1, Zemin/Giris -> 0, ... (bos: 1)"""
+    s = s.fillna('').astype(str)
+    sayi = s.str.split('.', n=1).str[0]
+    sayi = pd.to_numeric(sayi.where(sayi.str.fullmatch(r'\s*[-+]?\d+\s*')), errors='coerce')
+    
+    # Kosullarin sirasi onemli: "Yüksek Giriş" -> 0
+    kosullar = [
+        s.str.contains('Bodrum', regex=False) | s.str.contains('Bahçe', regex=False),
+        s.str.contains('Zemin', regex=False) | s.str.contains('Giriş', regex=False),
+        s.str.contains('Yüksek', regex=False),
+        s.str.contains('Ara', regex=False),
+    ]
+    sonuc = np.select(kosullar, [-1, 0, 5, 2], default=sayi.fillna(1).astype(int))
+    return pd.Series(sonuc, index=s.index, dtype=int)
+
+
+def bina_yasi_donustur(s):
+    """Bina yasi: "11 Yaşında" -> 11, Sifir -> 0, bilinmiyorsa (bos dahil) 10"""
+    s = s.fillna('').astype(str)
+    yas = pd.to_numeric(s.str.replace(' Yaşında', '', regex=False), errors='coerce')
+    kosullar = [
+        s.str.contains('Sıfır', regex=False),
+        s.str.contains('Yaşında', regex=False) & yas.notna(),
+    ]
+    sonuc = np.select(kosullar, [0, yas.fillna(10).astype(int)], default=10)
+    return pd.Series(sonuc, index=s.index, dtype=int)
+
+
+def isitma_donustur(s):
+    """Isitma tipi -> 0-10 skor (bilinmeyen: 5)"""
+    return s.map(ISITMA_SKORLARI).fillna(5)
+
+
+def veriyi_isle(df):
+    """String verileri sayiya cevir (kolonlar df'e eklenir)"""
+    df['Fiyat_Numeric'] = fiyat_donustur(df['Fiyat'])
+    df['Oda_Numeric'] = oda_donustur(df['Oda Sayısı'])
+    df['Metrekare_Numeric'] = metrekare_donustur(df['Brüt m2'])
+    df['Kat_Sayisi_Numeric'] = kat_sayisi_donustur(df['Kat Sayısı'])
+    df['Bulundugu_Kat_Numeric'] = bulundugu_kat_donustur(df['Bulunduğu Kat'])
+    df['Bina_Yasi_Numeric'] = bina_yasi_donustur(df['Bina Yaşı'])
+    df['Isitma_Numeric'] = isitma_donustur(df['Isınma Tipi'])
+    return df
+
+
+def islenmis_mi(df):
+    """Sayisal kolonlar zaten var mi?"""
+    return all(k in df.columns for k in SAYISAL_KOLONLAR)
+
+
+def giris_matrisi(X):
+    """
+    Toplu girdiyi (N, 6) float diziye cevir (GIRISLER sirasinda)
+    X: dizi, GIRISLER veya *_Numeric kolonlu DataFrame ya da ozellik dict listesi
+    """
+    if isinstance(X, (list, tuple)) and len(X) > 0 and isinstance(X[0], dict):
+        X = pd.DataFrame(list(X))
+    
+    if isinstance(X, pd.DataFrame):
+        if all(g in X.columns for g in GIRISLER):
+            kolonlar = GIRISLER
+        elif all(GIRIS_KOLONLARI[g] in X.columns for g in GIRISLER):
+            kolonlar = [GIRIS_KOLONLARI[g] for g in GIRISLER]
+        else:
+            raise KeyError("DataFrame'de giris kolonlari bulunamadi: " + ", ".join(GIRISLER))
+        return X[kolonlar].to_numpy(dtype=float)
+    
+    girdi = np.asarray(X, dtype=float)
+    if girdi.ndim == 1:
+        girdi = girdi.reshape(1, -1)
+    if girdi.ndim != 2 or girdi.shape[1] != len(GIRISLER):
+        raise ValueError(f"Girdi (N, {len(GIRISLER)}) boyutunda olmali, gelen: {girdi.shape}")
+    return girdi
+
+
+def dosya_hash(yol):
+    """Dosyanin sha256 ozeti (mtime/boyut degismediyse kayitli deger kullanilir)"""
+    bilgi = os.stat(yol)
+    anahtar_yolu = os.path.join(_onbellek_kok(yol), 'anahtar.json')
+    
+    try:
+        with open(anahtar_yolu) as f:
+            anahtar = json.load(f)
+        if anahtar['mtime_ns'] == bilgi.st_mtime_ns and anahtar['boyut'] == bilgi.st_size:
+            return anahtar['sha256']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+    
+    h = hashlib.sha256()
+    with open(yol, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    ozet = h.hexdigest()
+    
+    try:
+        os.makedirs(os.path.dirname(anahtar_yolu), exist_ok=True)
+        _atomik_yaz(anahtar_yolu, {'mtime_ns': bilgi.st_mtime_ns, 'boyut': bilgi.st_size, 'sha256': ozet})
+    except OSError:
+        pass  # salt okunur dizin: sadece hash'i dondur
+    return ozet
+
+
+def veri_yukle(csv_path=VARSAYILAN_CSV, onbellek=True):
+    """
+    CSV'yi yukle ve isle
+    Onbellek gecerliyse CSV hic ayristirilmaz, kolonlar .npy dosyalarindan okunur.
+    """
+    if not onbellek:
+        return veriyi_isle(pd.read_csv(csv_path))
+    
+    dizin = onbellek_dizini(csv_path)
+    if os.path.isfile(os.path.join(dizin, 'meta.json')):
+        try:
+            return _onbellek_oku(dizin)
+        except (OSError, ValueError, KeyError):
+            pass  # bozuk onbellek: yeniden olustur
+    
+    df = veriyi_isle(pd.read_csv(csv_path))
+    try:
+        _onbellek_yaz(df, dizin)
+    except OSError as e:
+        print("Uyari: veri onbellegi yazilamadi:", e)
+    return df
+
+
+def onbellek_dizini(csv_path=VARSAYILAN_CSV, veri_hash=None):
+    """
+    CSV'nin guncel icerigine (veya verilen hash'e) ait onbellek dizini
+    Veriden turetilen diger dosyalar (indeks, istatistik taslagi) da burada tutulur.
+    """
+    veri_hash = veri_hash or dosya_hash(csv_path)
+    return os.path.join(_onbellek_kok(csv_path), f"{veri_hash[:16]}-v{ISLEME_SURUMU}")
+
+
+def kolonlari_ac(csv_path=VARSAYILAN_CSV, kolonlar=SAYISAL_KOLONLAR):
+    """
+    Islenmis sayisal kolonlari salt okunur mmap dizileri olarak ac (DataFrame kurulmaz)
+    Ayni makinedeki process'ler ayni sayfalari paylasir. Onbellek yoksa once olusturulur,
+    yazilamiyorsa bellekteki diziler doner.
+    """
+    dizin = onbellek_dizini(csv_path)
+    if not os.path.isfile(os.path.join(dizin, 'meta.json')):
+        df = veri_yukle(csv_path)
+        if not os.path.isfile(os.path.join(dizin, 'meta.json')):
+            return {ad: df[ad].to_numpy() for ad in kolonlar}
+    
+    return onbellek_kolonlari(dizin, kolonlar)
+
+
+def onbellek_kolonlari(dizin, kolonlar=SAYISAL_KOLONLAR):
+    """Onbellek dizinindeki sayisal kolonlar (salt okunur mmap)"""
+    with open(os.path.join(dizin, 'meta.json'), encoding='utf-8') as f:
+        dosyalar = {k['ad']: k['dosya'] for k in json.load(f)['kolonlar'] if k['tur'] == 'sayi'}
+    return {ad: np.load(os.path.join(dizin, dosyalar[ad] + '.npy'), mmap_mode='r') for ad in kolonlar}
+
+
+def _onbellek_kok(csv_path):
+    """Bir CSV'nin onbellek kok dizini"""
+    kaynak_dizin, ad = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(kaynak_dizin, '.onbellek', os.path.splitext(ad)[0])
+
+
+def _atomik_yaz(yol, veri):
+    """JSON dosyasini gecici dosya + os.replace ile yaz"""
+    gecici = f"{yol}.{os.getpid()}.tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        json.dump(veri, f, ensure_ascii=False, indent=2)
+    os.replace(gecici, yol)
+
+
+def _onbellek_yaz(df, dizin):
+    """Islenmis DataFrame'i kolon kolon .npy olarak yaz"""
+    os.makedirs(os.path.dirname(dizin), exist_ok=True)
+    gecici = tempfile.mkdtemp(dir=os.path.dirname(dizin), prefix='.yaziliyor-')
+    
+    try:
+        kolonlar = []
+        for i, ad in enumerate(df.columns):
+            dosya = f"k{i:02d}"
+            seri = df[ad]
+            
+            if pd.api.types.is_numeric_dtype(seri):
+                np.save(os.path.join(gecici, dosya + '.npy'), seri.to_numpy())
+                kolonlar.append({'ad': ad, 'dosya': dosya, 'tur': 'sayi'})
+            else:
+                bos = seri.isna().to_numpy()
+                if bos.any():
+                    np.save(os.path.join(gecici, dosya + '.bos.npy'), bos)
+                baytlar = [b'' if b else str(x).encode('utf-8') for x, b in zip(seri.tolist(), bos)]
+                ofset = np.zeros(len(baytlar) + 1, dtype=np.int64)
+                np.cumsum([len(b) for b in baytlar], out=ofset[1:])
+                np.save(os.path.join(gecici, dosya + '.veri.npy'), np.frombuffer(b''.join(baytlar), dtype=np.uint8))
+                np.save(os.path.join(gecici, dosya + '.ofset.npy'), ofset)
+                kolonlar.append({'ad': ad, 'dosya': dosya, 'tur': 'metin'})
+        
+        _atomik_yaz(os.path.join(gecici, 'meta.json'),
+                    {'surum': ISLEME_SURUMU, 'satir': len(df), 'kolonlar': kolonlar})
+        
+        try:
+            os.replace(gecici, dizin)
+        except OSError:
+            # Baska bir process ayni onbellegi once yazdi
+            shutil.rmtree(gecici, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(gecici, ignore_errors=True)
+        raise
+
+
+def onbellek_ekle(eski_dizin, df, yeni_dizin):
+    """
+    Eski onbellegin kolonlarina islenmis yeni satirlari (df) ekleyerek yeni onbellek yaz
+    Eski satirlar ayristirilmaz ve DataFrame'e cevrilmez; kolon dosyalari uc uca eklenir.
+    Kolonlar ya da turleri uyusmazsa eski veri okunup birlikte yazilir.
+    """
+    with open(os.path.join(eski_dizin, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    
+    uyumlu = [k['ad'] for k in meta['kolonlar']] == list(df.columns) and all(
+        (k['tur'] == 'sayi') == pd.api.types.is_numeric_dtype(df[k['ad']]) for k in meta['kolonlar'])
+    if not uyumlu:
+        _onbellek_yaz(pd.concat([_onbellek_oku(eski_dizin), df], ignore_index=True), yeni_dizin)
+        return
+    
+    yeni = os.path.join(tempfile.mkdtemp(prefix='ek-'), 'yeni')
+    try:
+        _onbellek_yaz(df, yeni)
+        os.makedirs(os.path.dirname(yeni_dizin), exist_ok=True)
+        gecici = tempfile.mkdtemp(dir=os.path.dirname(yeni_dizin), prefix='.yaziliyor-')
+        try:
+            for kolon in meta['kolonlar']:
+                eski, ek, hedef = (os.path.join(d, kolon['dosya']) for d in (eski_dizin, yeni, gecici))
+                if kolon['tur'] == 'sayi':
+                    np.save(hedef + '.npy', np.concatenate([np.load(eski + '.npy', mmap_mode='r'),
+                                                            np.load(ek + '.npy')]))
+                    continue
+                
+                eski_ofset = np.load(eski + '.ofset.npy')
+                np.save(hedef + '.veri.npy', np.concatenate([np.load(eski + '.veri.npy', mmap_mode='r'),
+                                                             np.load(ek + '.veri.npy')]))
+                np.save(hedef + '.ofset.npy', np.concatenate([eski_ofset, np.load(ek + '.ofset.npy')[1:] + eski_ofset[-1]]))
+                bos = [np.load(d + '.bos.npy') if os.path.exists(d + '.bos.npy') else np.zeros(n, dtype=bool)
+                       for d, n in ((eski, meta['satir']), (ek, len(df)))]
+                if bos[0].any() or bos[1].any():
+                    np.save(hedef + '.bos.npy', np.concatenate(bos))
+            
+            _atomik_yaz(os.path.join(gecici, 'meta.json'), dict(meta, satir=meta['satir'] + len(df)))
+            try:
+                os.replace(gecici, yeni_dizin)
+            except OSError:
+                # Baska bir process ayni onbellegi once yazdi
+                shutil.rmtree(gecici, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(gecici, ignore_errors=True)
+            raise
+    finally:
+        shutil.rmtree(os.path.dirname(yeni), ignore_errors=True)
+
+
+def _onbellek_oku(dizin, mmap_mode=None):
+    """Onbellek dizininden DataFrame olustur"""
+    with open(os.path.join(dizin, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    
+    veri = {}
+    for kolon in meta['kolonlar']:
+        taban = os.path.join(dizin, kolon['dosya'])
+        if kolon['tur'] == 'sayi':
+            veri[kolon['ad']] = np.load(taban + '.npy', mmap_mode=mmap_mode)
+        else:
+            tampon = np.load(taban + '.veri.npy').tobytes()
+            ofset = np.load(taban + '.ofset.npy').tolist()
+            degerler = [tampon[a:b].decode('utf-8') for a, b in zip(ofset[:-1], ofset[1:])]
+            if os.path.exists(taban + '.bos.npy'):
+                for i in np.flatnonzero(np.load(taban + '.bos.npy')):
+                    degerler[i] = None
+            veri[kolon['ad']] = degerler
+    
+    return pd.DataFrame(veri)
@@ -0,0 +1,159 @@
+"""
+API Yuk Testi
+API'yi ayri bir process'te baslatir, artan eszamanlilik seviyelerinde /predict
+istekleri gonderir ve gecikme yuzdeliklerini raporlar. Ayni anda /health'e
+giden hafif istekler event loop'un tahminler yuzunden bloklanip
+bloklanmadigini gosterir.
+
+Kullanim:
+    python yuk_testi.py
+    python yuk_testi.py --seviyeler 1 4 16 64 --sure 5 --isci 2 --kuyruk 16
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+import numpy as np
+import httpx
+
+
+def bos_port():
+    """Kullanilmayan bir TCP portu"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def sunucu_baslat(port, isci, kuyruk):
+    """uvicorn'u ayri process'te baslat ve modeller hazir olana kadar bekle"""
+    ortam = dict(os.environ)
+    if isci is not None:
+        ortam['TAHMIN_ISCI_SAYISI'] = str(isci)
+    if kuyruk is not None:
+        ortam['TAHMIN_KUYRUK_LIMITI'] = str(kuyruk)
+    
+    surec = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api_server:app', '--port', str(port), '--log-level', 'warning'],
+        env=ortam, stdout=subprocess.DEVNULL
+    )
+    
+    bitis = time.time() + 300
+    while time.time() < bitis:
+        if surec.poll() is not None:
+            raise RuntimeError("API sunucusu baslatilamadi")
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/health', timeout=1).json().get('status') == 'healthy':
+                return surec
+        except (httpx.HTTPError, ValueError):
+            pass
+        time.sleep(0.5)
+    
+    surec.terminate()
+    raise RuntimeError("API sunucusu zamaninda hazir olmadi")
+
+
+def rastgele_ozellikler(rng):
+    """Gecerli aralikta rastgele bir kayit"""
+    return {
+        'metrekare': int(rng.integers(40, 351)),
+        'oda_sayisi': int(rng.integers(1, 11)),
+        'bina_yasi': int(rng.integers(0, 61)),
+        'bulundugu_kat': int(rng.integers(-1, 21)),
+        'bina_kat_sayisi': int(rng.integers(1, 26)),
+        'isitma_tipi': int(rng.integers(0, 11))
+    }
+
+
+async def seviye_calistir(url, eszamanlilik, sure, seed=0):
+    """Bir eszamanlilik seviyesinde sure boyunca yuk uygula"""
+    gecikmeler = []
+    saglik = []
+    durumlar = {}
+    bitis = time.perf_counter() + sure
+    
+    limitler = httpx.Limits(max_connections=eszamanlilik + 1, max_keepalive_connections=eszamanlilik + 1)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limitler) as istemci:
+        
+        async def isci(k):
+            rng = np.random.default_rng(seed * 1000 + k)
+            while time.perf_counter() < bitis:
+                bas = time.perf_counter()
+                yanit = await istemci.post('/predict', json=rastgele_ozellikler(rng))
+                gecen = time.perf_counter() - bas
+                durumlar[yanit.status_code] = durumlar.get(yanit.status_code, 0) + 1
+                if yanit.status_code == 200:
+                    gecikmeler.append(gecen)
+                elif yanit.status_code == 503:
+                    # Iyi davranan istemci gibi Retry-After kadar bekle
+                    await asyncio.sleep(float(yanit.headers.get('Retry-After', 1)))
+        
+        async def yoklayici():
+            while time.perf_counter() < bitis:
+                bas = time.perf_counter()
+                await istemci.get('/health')
+                saglik.append(time.perf_counter() - bas)
+                await asyncio.sleep(0.05)
+        
+        await asyncio.gather(yoklayici(), *(isci(k) for k in range(eszamanlilik)))
+    
+    return np.array(gecikmeler), np.array(saglik), durumlar
+
+
+def yuzdelik(dizi, q):
+    """Milisaniye cinsinden yuzdelik (bos dizi icin NaN)"""
+    return 1000 * np.percentile(dizi, q) if len(dizi) else float('nan')
+
+
+def main():
+    """Yuk testini calistir ve raporla"""
+    parser = argparse.ArgumentParser(description="API yuk testi")
+    parser.add_argument('--seviyeler', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32],
+                        help="Eszamanli istemci sayilari")
+    parser.add_argument('--sure', type=float, default=5.0, help="Seviye basina sure (sn)")
+    parser.add_argument('--isci', type=int, default=None, help="TAHMIN_ISCI_SAYISI")
+    parser.add_argument('--kuyruk', type=int, default=None, help="TAHMIN_KUYRUK_LIMITI")
+    parser.add_argument('--url', default=None, help="Calisan bir API'yi test et (sunucu baslatilmaz)")
+    args = parser.parse_args()
+    
+    surec = None
+    url = args.url
+    if url is None:
+        port = bos_port()
+        print("API sunucusu baslatiliyor...")
+        surec = sunucu_baslat(port, args.isci, args.kuyruk)
+        url = f'http://127.0.0.1:{port}'
+    
+    try:
+        print(f"\n{'='*84}")
+        print(" YUK TESTI - POST /predict")
+        print(f"{'='*84}")
+        print(f"{'Eszamanli':>9} {'Istek/sn':>9} {'p50 ms':>8} {'p99 ms':>8} {'503 %':>7} "
+              f"{'/health p50':>12} {'/health p99':>12}")
+        
+        for seviye in args.seviyeler:
+            gecikmeler, saglik, durumlar = asyncio.run(seviye_calistir(url, seviye, args.sure, seed=seviye))
+            toplam = sum(durumlar.values())
+            reddedilen = 100 * durumlar.get(503, 0) / max(toplam, 1)
+            print(f"{seviye:>9} {len(gecikmeler) / args.sure:>9.1f} {yuzdelik(gecikmeler, 50):>8.1f} "
+                  f"{yuzdelik(gecikmeler, 99):>8.1f} {reddedilen:>7.1f} "
+                  f"{yuzdelik(saglik, 50):>12.1f} {yuzdelik(saglik, 99):>12.1f}")
+            
+            beklenmeyen = {k: v for k, v in durumlar.items() if k not in (200, 503)}
+            if beklenmeyen:
+                print(f"         beklenmeyen durum kodlari: {beklenmeyen}")
+        
+        print(f"{'='*84}\n")
+    finally:
+        if surec is not None:
+            surec.terminate()
+            surec.wait()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())